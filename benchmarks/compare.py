@@ -0,0 +1,44 @@
+"""Compara dos informes JSON de benchmarks (p. ej. de dos commits distintos).
+
+Muestra, para cada prueba común, la mediana antes y después y el cambio en
+porcentaje. Sale con código 1 si alguna prueba empeora más que `--threshold`.
+
+Uso:
+    python benchmarks/compare.py antes.json despues.json [--threshold 10]
+"""
+import argparse
+import json
+import sys
+
+
+def load(file):
+    with open(file, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("before", help="Informe de referencia")
+    parser.add_argument("after", help="Informe nuevo")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="Empeoramiento (en %%) a partir del cual se considera una regresión")
+    args = parser.parse_args()
+
+    before, after = load(args.before), load(args.after)
+    print(f"{before.get('commit')} -> {after.get('commit')} ({after.get('benchmark')})")
+    regressions = 0
+    for name, result in after["results"].items():
+        old = before["results"].get(name)
+        if not isinstance(result, dict) or "median_ms" not in result or not old:
+            continue
+        change = (result["median_ms"] - old["median_ms"]) / old["median_ms"] * 100 if old["median_ms"] else 0.0
+        flag = ""
+        if change > args.threshold:
+            flag = "  <- regresión"
+            regressions += 1
+        print(f"{name:<32} {old['median_ms']:>12.4f} ms {result['median_ms']:>12.4f} ms {change:>+8.1f}%{flag}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""Benchmark de carga concurrente de `user-role-management` según la base de datos.
+
+Varios hilos mezclan lecturas (`GET /users/`) y escrituras (`POST /roles/`)
+contra la misma aplicación y se mide el rendimiento y la latencia de cada
+configuración:
+
+- `sqlite_rollback_journal`: SQLite sin WAL (la configuración anterior).
+- `sqlite_wal`: SQLite con WAL, `synchronous=NORMAL` y `busy_timeout`.
+- `database_url`: la base de datos de `--database-url` (p. ej. un PostgreSQL
+  local), si se indica. Sus tablas se crean y se borran en cada ejecución.
+
+El resultado se imprime en JSON.
+
+Uso:
+    python benchmarks/db_bench.py [--threads 8] [--requests 200] [--write-ratio 0.2]
+                                  [--database-url postgresql://localhost/bench] [-o result.json]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from harness import ROOT, summarize, write_report
+
+sys.path.insert(0, os.path.join(ROOT, "user-role-management"))
+
+from app import create_app, db  # noqa: E402
+from app.models import Role, User  # noqa: E402
+
+PASSWORD = "password"
+
+
+def run_load(config, users, threads, requests, write_ratio, seed):
+    """Crea la aplicación con `config`, la llena y la somete a carga concurrente."""
+    app = create_app(dict(config, TESTING=True, HASH_WORKERS=0,
+                          PASSWORD_HASH_METHOD="pbkdf2:sha256:1000"))
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        role = Role(name="user")
+        db.session.add(role)
+        password = User.hash_password(PASSWORD)
+        db.session.add_all(User(username=f"user{i}", email=f"user{i}@example.com",
+                                password=password, role=role) for i in range(users))
+        db.session.commit()
+        db.session.remove()
+
+    token = app.test_client().post("/auth/login", json={"username": "user0", "password": PASSWORD})
+    headers = {"Authorization": f"Bearer {token.get_json()['access_token']}"}
+    samples = {"read": [], "write": []}
+    errors = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads)
+
+    def worker(n):
+        client = app.test_client()
+        rng = random.Random(seed + n)
+        barrier.wait()
+        for i in range(requests):
+            kind = "write" if rng.random() < write_ratio else "read"
+            start = time.perf_counter()
+            if kind == "write":
+                response = client.post("/roles/", headers=headers, json={"name": f"role-{n}-{i}"})
+            else:
+                response = client.get(f"/users/?limit=20&after_id={rng.randrange(users)}",
+                                      headers=headers)
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                if response.status_code < 300:
+                    samples[kind].append(elapsed)
+                else:
+                    errors.append(response.status_code)
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    with app.app_context():
+        db.session.remove()
+        if not config["SQLALCHEMY_DATABASE_URI"].startswith("sqlite"):
+            db.drop_all()
+        db.engine.dispose()
+
+    result = {kind: summarize(values) for kind, values in samples.items() if values}
+    result["requests_per_sec"] = round(sum(len(v) for v in samples.values()) / wall, 1)
+    result["errors"] = len(errors)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000, help="Usuarios de prueba")
+    parser.add_argument("--threads", type=int, default=8, help="Hilos que lanzan peticiones a la vez")
+    parser.add_argument("--requests", type=int, default=200, help="Peticiones por hilo")
+    parser.add_argument("--write-ratio", type=float, default=0.2,
+                        help="Proporción de escrituras (0-1)")
+    parser.add_argument("--database-url", help="Base de datos adicional a medir (p. ej. PostgreSQL)")
+    parser.add_argument("--seed", type=int, default=1, help="Semilla de la mezcla de peticiones")
+    parser.add_argument("-o", "--output", help="Archivo donde guardar el informe JSON")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        configs = {
+            "sqlite_rollback_journal": {"SQLITE_WAL": False},
+            "sqlite_wal": {"SQLITE_WAL": True},
+        }
+        for name, config in configs.items():
+            config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + os.path.join(tmp, f"{name}.db")
+            results[name] = run_load(config, args.users, args.threads, args.requests,
+                                     args.write_ratio, args.seed)
+    if args.database_url:
+        results["database_url"] = run_load({"SQLALCHEMY_DATABASE_URI": args.database_url},
+                                           args.users, args.threads, args.requests,
+                                           args.write_ratio, args.seed)
+    write_report("database", results, args.output, users=args.users, threads=args.threads,
+                 requests=args.requests, write_ratio=args.write_ratio)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""Servidor local que imita PokeAPI para los benchmarks.
+
+Sirve las respuestas grabadas en `fixtures/pokemon.json` y, para los nombres
+`bench-N`, Pokémon sintéticos con la misma forma, de modo que las pruebas "en
+frío" pueden pedir tantos Pokémon distintos como quieran. Se puede añadir
+latencia, una proporción de errores 503 y un límite de peticiones por segundo
+que responde 429 con `Retry-After`, como la API real.
+
+Uso:
+    python benchmarks/fake_pokeapi.py [--port 8765] [--latency 0.05] [--error-rate 0.1] [--rate-limit 100]
+"""
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "pokemon.json")
+DEFAULT_MOVES = 80  # Las respuestas reales traen decenas de movimientos
+DEFAULT_SYNTHETIC = 2000
+
+
+def load_fixtures(file=FIXTURES):
+    """Respuestas grabadas, indexadas por nombre y por ID."""
+    with open(file, "r", encoding="utf-8") as f:
+        records = json.load(f)
+    fixtures = {}
+    for record in records:
+        fixtures[record["name"]] = fixtures[str(record["id"])] = record
+    return fixtures
+
+
+def synthetic_pokemon(name, template):
+    """Pokémon inventado con la forma de `template` para los nombres `bench-N`."""
+    number = int(name.split("-", 1)[1])
+    record = json.loads(json.dumps(template))
+    record["id"] = 10000 + number
+    record["name"] = name
+    record["species"]["name"] = name
+    record["weight"] = 10 + number % 1000
+    record["height"] = 1 + number % 30
+    for k, stat in enumerate(record["stats"]):
+        stat["base_stat"] = 20 + (number * (k + 7)) % 140
+    return record
+
+
+class FakePokeAPI:
+    """Servidor de PokeAPI falso que se ejecuta en un hilo en segundo plano.
+
+    Cuenta las peticiones recibidas y las respuestas de error para que los
+    benchmarks puedan informar de cuántas llegaron realmente a la "red".
+    """
+
+    def __init__(self, port=0, latency=0.0, error_rate=0.0, rate_limit=0,
+                 moves=DEFAULT_MOVES, synthetic=DEFAULT_SYNTHETIC, seed=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.moves = moves
+        self.synthetic = synthetic
+        self.fixtures = load_fixtures()
+        self.requests = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self._random = random.Random(seed)
+        self._window = (0, 0)  # (segundo, peticiones en ese segundo)
+        self._lock = threading.Lock()
+        handler = type("Handler", (FakeHandler,), {"api": self})
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        """URL base que hay que pasar al cliente (equivale a .../api/v2)."""
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}/api/v2"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self):
+        return {"requests": self.requests, "errors": self.errors,
+                "rate_limited": self.rate_limited}
+
+    def admit(self):
+        """Decide si una petición se atiende (200) o falla con 429/503."""
+        with self._lock:
+            self.requests += 1
+            if self.rate_limit:
+                second = int(time.monotonic())
+                start, count = self._window
+                count = count + 1 if start == second else 1
+                self._window = (second, count)
+                if count > self.rate_limit:
+                    self.rate_limited += 1
+                    return 429
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.errors += 1
+                return 503
+        return 200
+
+    def listing(self):
+        names = sorted({r["name"] for r in self.fixtures.values()})
+        names += [f"bench-{i}" for i in range(self.synthetic)]
+        return {"count": len(names), "results": [
+            {"name": n, "url": f"{self.url}/pokemon/{n}/"} for n in names]}
+
+    def pokemon(self, key):
+        record = self.fixtures.get(key)
+        if record is None and key.startswith("bench-") and key[6:].isdigit():
+            record = synthetic_pokemon(key, self.fixtures["pikachu"])
+        if record is None:
+            return None
+        if self.moves and "moves" not in record:
+            record = dict(record, moves=[
+                {"move": {"name": f"move-{i}", "url": f"{self.url}/move/{i}/"},
+                 "version_group_details": [{"level_learned_at": i % 50,
+                                            "move_learn_method": {"name": "level-up"}}]}
+                for i in range(self.moves)])
+        return record
+
+
+class FakeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    api = None
+
+    def do_GET(self):
+        if self.api.latency:
+            time.sleep(self.api.latency)
+        status = self.api.admit()
+        if status != 200:
+            self.reply(status, None, {"Retry-After": "1"})
+            return
+        path = self.path.split("?", 1)[0].rstrip("/")
+        parts = path.split("/")
+        if path.endswith("/pokemon"):
+            self.reply(200, self.api.listing())
+        elif len(parts) >= 2 and parts[-2] == "pokemon":
+            record = self.api.pokemon(parts[-1].lower())
+            self.reply(200 if record else 404, record)
+        else:
+            self.reply(404, None)
+
+    def reply(self, status, obj, headers=None):
+        body = json.dumps(obj).encode("utf-8") if obj is not None else b"Not Found"
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Segundos de espera por petición")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Proporción de respuestas 503")
+    parser.add_argument("--rate-limit", type=int, default=0,
+                        help="Peticiones por segundo antes de responder 429 (0 = sin límite)")
+    parser.add_argument("--moves", type=int, default=DEFAULT_MOVES,
+                        help="Movimientos sintéticos por respuesta (tamaño del cuerpo)")
+    args = parser.parse_args()
+    api = FakePokeAPI(args.port, args.latency, args.error_rate, args.rate_limit, args.moves)
+    print(f"PokeAPI falsa en {api.url} (Ctrl+C para salir)")
+    try:
+        api.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Benchmarks de los endpoints de `user-role-management`.
+
+Crea la aplicación con `create_app` sobre una base de datos SQLite temporal,
+la llena con usuarios y roles de prueba y mide cada endpoint con el cliente de
+pruebas de Flask (sin red). El resultado se imprime en JSON.
+
+Uso:
+    python benchmarks/flask_bench.py [--users 1000] [--runs 100] [--concurrency 8] [-o result.json]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from harness import ROOT, measure, summarize, write_report
+
+sys.path.insert(0, os.path.join(ROOT, "user-role-management"))
+
+from app import create_app, db  # noqa: E402
+from app.authorization import PERMISSIONS  # noqa: E402
+from app.models import Permission, Role, User  # noqa: E402
+
+ADMIN_PASSWORD = "admin-password"
+
+
+def seed(users):
+    """Crea los roles `admin` y `user`, un administrador y `users` usuarios normales."""
+    permissions = [Permission(name=name, bit=bit) for name, bit in PERMISSIONS.items()]
+    admin_role, user_role = Role(name="admin", permissions=permissions), Role(name="user")
+    db.session.add_all([admin_role, user_role])
+    db.session.add(User(username="admin", email="admin@example.com",
+                        password=User.hash_password(ADMIN_PASSWORD), role=admin_role))
+    # Un único hash para todos: calcularlo miles de veces solo alargaría la preparación
+    password = User.hash_password("password")
+    db.session.add_all(User(username=f"user{i}", email=f"user{i}@example.com",
+                            password=password, role=user_role) for i in range(users))
+    db.session.commit()
+    return user_role.id
+
+
+def concurrent_logins(app, threads, per_thread):
+    """Lanza logins desde `threads` hilos a la vez y resume la latencia de los aceptados.
+
+    Los rechazados por el pool de hashing (503) se cuentan aparte: deben
+    responderse enseguida en lugar de alargar la cola de los demás.
+    """
+    samples, rejected = [], []
+    lock = threading.Lock()
+
+    def worker():
+        client = app.test_client()
+        for _ in range(per_thread):
+            start = time.perf_counter()
+            response = client.post("/auth/login", json={"username": "admin",
+                                                        "password": ADMIN_PASSWORD})
+            elapsed = (time.perf_counter() - start) * 1000
+            assert response.status_code in (200, 503), response.get_data(as_text=True)
+            with lock:
+                (samples if response.status_code == 200 else rejected).append(elapsed)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    result = summarize(samples)
+    result["rejected"] = len(rejected)
+    result["rejected_max_ms"] = round(max(rejected), 4) if rejected else None
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000, help="Usuarios de prueba")
+    parser.add_argument("--runs", type=int, default=100, help="Repeticiones por endpoint")
+    parser.add_argument("--slow-runs", type=int, default=10,
+                        help="Repeticiones de los endpoints que calculan hashes de contraseñas")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="Hilos que inician sesión a la vez en el escenario concurrente")
+    parser.add_argument("-o", "--output", help="Archivo donde guardar el informe JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///" + os.path.join(tmp, "bench.db"),
+        })
+        with app.app_context():
+            db.create_all()
+            user_role_id = seed(args.users)
+            client = app.test_client()
+
+            def login():
+                response = client.post("/auth/login", json={"username": "admin",
+                                                            "password": ADMIN_PASSWORD})
+                assert response.status_code == 200, response.get_data(as_text=True)
+                return response.get_json()["access_token"]
+
+            headers = {"Authorization": f"Bearer {login()}"}
+
+            def call(method, url, expected=200, **kwargs):
+                def request():
+                    response = client.open(url, method=method, headers=headers, **kwargs)
+                    assert response.status_code == expected, response.get_data(as_text=True)
+                return request
+
+            created = iter(range(10 ** 9))
+
+            def create_user():
+                n = next(created)
+                call("POST", "/users/", 201, json={"username": f"new{n}", "email": f"new{n}@example.com",
+                                                   "password": "password"})()
+
+            def bulk_create_users(size=20):
+                first = next(created)
+                for _ in range(size - 1):
+                    next(created)
+                users = [{"username": f"new{n}", "email": f"new{n}@example.com", "password": "password"}
+                         for n in range(first, first + size)]
+                call("POST", "/users/bulk", json={"users": users})()
+
+            results = {
+                "login": measure(login, args.slow_runs),
+                f"login_concurrent_{args.concurrency}": concurrent_logins(
+                    app, args.concurrency, args.slow_runs),
+                "list_users": measure(call("GET", "/users/"), args.runs),
+                "list_roles": measure(call("GET", "/roles/"), args.runs),
+                "create_user": measure(create_user, args.slow_runs),
+                "bulk_create_20_users": measure(bulk_create_users, args.slow_runs),
+                "bulk_assign_role_1000": measure(call(
+                    "POST", "/roles/assign-role/bulk",
+                    json={"assignments": [{"user_id": i, "role_id": user_role_id}
+                                          for i in range(2, 1002)]}), args.runs),
+                "update_user": measure(call("PUT", "/users/2", json={"email": "user0@example.org"}),
+                                       args.runs),
+                "assign_role": measure(call("POST", "/roles/assign-role",
+                                            json={"user_id": 3, "role_id": user_role_id}),
+                                       args.runs),
+                "update_role": measure(call("PUT", f"/roles/{user_role_id}", json={"name": "user"}),
+                                       args.runs),
+            }
+            db.session.remove()
+            db.engine.dispose()
+    write_report("user-role-management", results, args.output, users=args.users,
+                 runs=args.runs, slow_runs=args.slow_runs, concurrency=args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
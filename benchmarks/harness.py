@@ -0,0 +1,75 @@
+"""Utilidades comunes de los benchmarks: medición de tiempos e informes JSON."""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager, redirect_stdout
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(fn, runs=100, warmup=0):
+    """Ejecuta `fn()` `runs` veces y resume los tiempos en milisegundos."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
+
+
+def summarize(samples):
+    """Mediana, media, mínimo, p95, p99 y operaciones por segundo de una lista de tiempos (ms)."""
+    ordered = sorted(samples)
+    total = sum(samples)
+    return {
+        "runs": len(samples),
+        "median_ms": round(statistics.median(ordered), 4),
+        "mean_ms": round(total / len(samples), 4),
+        "min_ms": round(ordered[0], 4),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+        "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))], 4),
+        "ops_per_sec": round(len(samples) / (total / 1000), 1) if total else None,
+    }
+
+
+@contextmanager
+def quiet():
+    """Descarta lo que las funciones medidas escriben en pantalla."""
+    with open(os.devnull, "w", encoding="utf-8") as devnull, redirect_stdout(devnull):
+        yield
+
+
+def git_commit():
+    """Commit actual del repositorio, para poder comparar informes entre versiones."""
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def write_report(name, results, output=None, **params):
+    """Escribe el informe JSON de un benchmark en `output` o en la salida estándar."""
+    report = {
+        "benchmark": name,
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "params": params,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False) + "\n"
+    if output and output != "-":
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        sys.__stdout__.write(text)
+    return report
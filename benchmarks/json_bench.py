@@ -0,0 +1,92 @@
+"""Benchmark de la decodificación de PokeAPI y de la codificación de los listados.
+
+- Decodificación: una respuesta de `/pokemon/{nombre}` del tamaño de las
+  reales (con movimientos, sprites e índices de juego) con `json.loads`
+  completo, como hacía `response.json()`, y con `fastjson.decode_pokemon` en
+  cada motor instalado (json, orjson, msgspec).
+- Codificación: una página de usuarios de `GET /users/` con `marshal` de
+  Flask-RESTX + `json.dumps` (el antiguo `marshal_list_with`), con `json.dumps`
+  de los diccionarios y con orjson.
+
+El resultado se imprime en JSON.
+
+Uso:
+    python benchmarks/json_bench.py [--runs 200] [--moves 100] [--rows 1000] [-o result.json]
+"""
+import argparse
+import json
+import os
+import sys
+
+from harness import ROOT, measure, write_report
+
+sys.path.insert(0, ROOT)
+
+import fastjson  # noqa: E402
+from fake_pokeapi import load_fixtures  # noqa: E402
+
+
+def realistic_payload(moves):
+    """Respuesta de PokeAPI para Pikachu con el volumen de una real."""
+    record = dict(load_fixtures()["pikachu"])
+    record["moves"] = [
+        {"move": {"name": f"move-{i}", "url": f"https://pokeapi.co/api/v2/move/{i}/"},
+         "version_group_details": [
+             {"level_learned_at": i % 50, "move_learn_method": {"name": "level-up", "url": "x"},
+              "version_group": {"name": f"group-{g}", "url": "x"}} for g in range(8)]}
+        for i in range(moves)]
+    record["game_indices"] = [{"game_index": 25, "version": {"name": f"version-{v}", "url": "x"}}
+                              for v in range(20)]
+    record["sprites"] = {f"sprite_{k}": f"https://example.com/sprites/{k}.png" for k in range(200)}
+    return json.dumps(record).encode("utf-8")
+
+
+def decode_results(raw, runs):
+    results = {"decode_full_json_loads": measure(lambda: json.loads(raw), runs)}
+    for backend in ("json", "orjson", "msgspec"):
+        if fastjson.choose_backend(backend) != backend:
+            continue  # No instalado
+        fastjson.backend = backend
+        results[f"decode_pokemon_{backend}"] = measure(lambda: fastjson.decode_pokemon(raw), runs)
+    fastjson.backend = fastjson.choose_backend()
+    return results
+
+
+def encode_results(rows, runs):
+    sys.path.insert(0, os.path.join(ROOT, "user-role-management"))
+    from flask_restx import marshal
+    from app.routes.users import user_summary_model
+
+    results = {
+        "marshal_users_restx": measure(lambda: json.dumps(marshal(rows, user_summary_model)), runs),
+        "encode_users_json": measure(lambda: json.dumps(rows), runs),
+    }
+    if fastjson.orjson is not None:
+        orjson = fastjson.orjson
+        results["encode_users_orjson"] = measure(lambda: orjson.dumps(rows), runs)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=200, help="Repeticiones por prueba")
+    parser.add_argument("--moves", type=int, default=100,
+                        help="Movimientos de la respuesta de PokeAPI (Pikachu tiene ~100)")
+    parser.add_argument("--rows", type=int, default=1000, help="Usuarios por página del listado")
+    parser.add_argument("-o", "--output", help="Archivo donde guardar el informe JSON")
+    args = parser.parse_args()
+
+    raw = realistic_payload(args.moves)
+    slim = fastjson.dumps(fastjson.decode_pokemon(raw))
+    rows = [{"id": i, "username": f"user{i}", "email": f"user{i}@example.com", "role_id": 2,
+             "role": "user"} for i in range(args.rows)]
+
+    results = decode_results(raw, args.runs)
+    results.update(encode_results(rows, args.runs))
+    results["payload_bytes"] = {"full": len(raw), "slim": len(slim)}
+    write_report("json", results, args.output, runs=args.runs, moves=args.moves, rows=args.rows,
+                 backend=fastjson.backend)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Benchmark de la memoria que ocupan los Pokémon cargados.
+
+Compara, para 1 000 y 100 000 registros, cuánto ocupan en memoria:
+
+- las respuestas de PokeAPI ya reducidas (`fastjson.slim_pokemon`) y las
+  líneas del historial como diccionarios, que es como se guardaban antes;
+- una lista de `pokemon.Pokemon` (objetos con `__slots__` y cadenas internadas);
+- una `pokemon.PokemonTable` (columnas en arreglos contiguos).
+
+Cada registro se decodifica de su propio JSON, como al leerlo de la red o del
+historial, para que las cadenas no se compartan por accidente. La memoria se
+mide con `tracemalloc` y se informa también en bytes por registro, junto con
+lo que tarda en construirse cada estructura y en encontrar el más pesado.
+
+Uso:
+    python benchmarks/memory_bench.py [--sizes 1000 100000] [-o result.json]
+"""
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+from harness import ROOT, write_report
+
+sys.path.insert(0, ROOT)
+
+from fastjson import slim_pokemon  # noqa: E402
+from pokemon import Pokemon, PokemonTable  # noqa: E402
+from snapshot import STATS  # noqa: E402
+
+TYPES = ("normal", "fire", "water", "grass", "electric", "ice", "fighting", "poison", "ground",
+         "flying", "psychic", "bug", "rock", "ghost", "dragon", "dark", "steel", "fairy")
+ABILITIES = tuple(f"ability-{i}" for i in range(300))
+
+
+def api_responses(count):
+    """`count` respuestas de PokeAPI (reducidas) codificadas en JSON, una por Pokémon."""
+    raws = []
+    for i in range(count):
+        types = [TYPES[i % len(TYPES)]] + ([TYPES[(i * 7) % len(TYPES)]] if i % 2 else [])
+        raws.append(json.dumps({
+            "id": i + 1,
+            "name": f"pokemon-{i}",
+            "types": [{"slot": s + 1, "type": {"name": t}} for s, t in enumerate(types)],
+            "abilities": [{"ability": {"name": ABILITIES[(i + a) % len(ABILITIES)]}}
+                          for a in range(2 + i % 2)],
+            "weight": 10 + i % 9000,
+            "height": 1 + i % 200,
+            "stats": [{"base_stat": 20 + (i + s) % 200, "stat": {"name": stat}}
+                      for s, stat in enumerate(STATS)],
+        }))
+    return raws
+
+
+def history_lines(raws):
+    """Las mismas búsquedas como líneas del historial."""
+    return [json.dumps(Pokemon.from_api(json.loads(raw)).to_history("2024-01-01T00:00:00"))
+            for raw in raws]
+
+
+def traced(build):
+    """Construye la estructura y devuelve (estructura, bytes retenidos, ms)."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = (time.perf_counter() - start) * 1000
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def heaviest_ms(result):
+    start = time.perf_counter()
+    if isinstance(result, PokemonTable):
+        result.heaviest()
+    elif isinstance(result[0], Pokemon):
+        max(result, key=lambda p: p.weight)
+    else:
+        max(result, key=lambda d: d["weight"])
+    return round((time.perf_counter() - start) * 1000, 4)
+
+
+def size_results(count):
+    raws = api_responses(count)
+    lines = history_lines(raws)
+    variants = {
+        "api_dicts": lambda: [slim_pokemon(json.loads(raw)) for raw in raws],
+        "api_pokemon_list": lambda: [Pokemon.from_api(json.loads(raw)) for raw in raws],
+        "api_pokemon_table": lambda: PokemonTable(json.loads(raw) for raw in raws),
+        "history_dicts": lambda: [json.loads(line) for line in lines],
+        "history_pokemon_list": lambda: [Pokemon.from_history(json.loads(line)) for line in lines],
+        "history_pokemon_table": lambda: PokemonTable.from_history(json.loads(line) for line in lines),
+    }
+    results = {}
+    for name, build in variants.items():
+        result, size, elapsed = traced(build)
+        results[name] = {
+            "bytes": size,
+            "bytes_per_record": round(size / count, 1),
+            "build_ms": round(elapsed, 2),
+            "heaviest_ms": heaviest_ms(result),
+        }
+        del result
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000],
+                        help="Cantidades de registros a medir")
+    parser.add_argument("-o", "--output", help="Archivo donde guardar el informe JSON")
+    args = parser.parse_args()
+
+    results = {str(count): size_results(count) for count in args.sizes}
+    write_report("memory", results, args.output, sizes=args.sizes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Benchmarks de las funciones principales de la Pokédex contra una PokeAPI falsa.
+
+Mide `get_pokemon_data` en frío (red) y en caliente (memoria y disco),
+`save_to_file` y `load_from_json` con historiales de distintos tamaños y
+`compare_pokemon`. Todo se ejecuta en un directorio temporal, así que no toca
+el caché ni el historial del usuario. El resultado se imprime en JSON.
+
+Uso:
+    python benchmarks/pokedex_bench.py [--latency 0.02] [--error-rate 0.05] [--sizes 10000 100000] [-o result.json]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+from fake_pokeapi import FakePokeAPI
+from harness import ROOT, measure, quiet, write_report
+
+sys.path.insert(0, ROOT)
+
+import pokedex  # noqa: E402
+from cache import PokemonCache  # noqa: E402
+from client import PokeAPIClient  # noqa: E402
+from history import close_writers  # noqa: E402
+
+HISTORY_RECORD = {"name": "pikachu", "types": ["electric"], "abilities": ["static", "lightning-rod"],
+                  "weight": 60, "height": 4, "searched_at": "2024-01-01T12:00:00"}
+
+
+def fill_history(file, size):
+    """Crea un historial de `size` búsquedas escribiéndolo de una vez."""
+    line = json.dumps(HISTORY_RECORD, ensure_ascii=False) + "\n"
+    with open(file, "w", encoding="utf-8") as f:
+        f.writelines(line for _ in range(size))
+
+
+def bench_get_pokemon_data(runs):
+    """`get_pokemon_data` en frío (cada nombre por primera vez) y en caliente."""
+    names = iter(f"bench-{i}" for i in range(runs))
+    results = {"cold": measure(lambda: pokedex.get_pokemon_data(next(names)), runs)}
+    results["warm_memory"] = measure(lambda: pokedex.get_pokemon_data("pikachu"), runs * 10, warmup=1)
+
+    # Sin LRU en memoria todas las lecturas van a SQLite
+    memory_cache, pokedex.cache = pokedex.cache, PokemonCache(max_memory_entries=0)
+    try:
+        pokedex.get_pokemon_data("pikachu")
+        results["warm_disk"] = measure(lambda: pokedex.get_pokemon_data("pikachu"), runs * 10)
+    finally:
+        pokedex.cache.close()
+        pokedex.cache = memory_cache
+    return results
+
+
+def bench_history(sizes, appends, reads):
+    """`save_to_file` y `load_from_json` según crece el historial."""
+    data = pokedex.get_pokemon_data("pikachu")
+    results = {}
+    for size in sizes:
+        file = f"history_{size}.jsonl"
+        fill_history(file, size)
+        results[f"save_to_file_{size}"] = measure(
+            lambda: pokedex.save_to_file("pikachu", data, file), appends)
+        results[f"load_from_json_{size}"] = measure(
+            lambda: pokedex.load_from_json(file), reads)
+        results[f"load_from_json_filtered_{size}"] = measure(
+            lambda: pokedex.load_from_json(file, name="char"), reads)
+        close_writers()
+        os.remove(file)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=200, help="Repeticiones de las pruebas rápidas")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000],
+                        help="Tamaños de historial a probar")
+    parser.add_argument("--appends", type=int, default=1000,
+                        help="Búsquedas añadidas al historial por tamaño")
+    parser.add_argument("--reads", type=int, default=3, help="Lecturas completas por tamaño")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Latencia de la PokeAPI falsa, en segundos")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Proporción de respuestas 503 de la PokeAPI falsa")
+    parser.add_argument("--rate-limit", type=int, default=0,
+                        help="Peticiones por segundo antes de responder 429")
+    parser.add_argument("--fsync", choices=pokedex.FSYNC_POLICIES, default=pokedex.DEFAULT_FSYNC,
+                        help="Política de fsync del historial")
+    parser.add_argument("-o", "--output", help="Archivo donde guardar el informe JSON")
+    args = parser.parse_args()
+
+    fake = FakePokeAPI(latency=args.latency, error_rate=args.error_rate,
+                       rate_limit=args.rate_limit, synthetic=args.runs)
+    cwd = os.getcwd()
+    with fake, tempfile.TemporaryDirectory() as tmp, quiet():
+        os.chdir(tmp)
+        try:
+            pokedex.client = PokeAPIClient(base_url=fake.url, rate=0, backoff=0.05)
+            pokedex.cache = PokemonCache()
+            pokedex.history_fsync = args.fsync
+            results = bench_get_pokemon_data(args.runs)
+            results.update(bench_history(args.sizes, args.appends, args.reads))
+            pokedex.get_pokemon_data("charizard")
+            results["compare_pokemon"] = measure(
+                lambda: pokedex.compare_pokemon("pikachu", "charizard"), args.runs)
+            results["fake_pokeapi"] = fake.stats()
+        finally:
+            pokedex.client.close()
+            pokedex.cache.close()
+            os.chdir(cwd)
+    write_report("pokedex", results, args.output, runs=args.runs, sizes=args.sizes,
+                 appends=args.appends, reads=args.reads, latency=args.latency,
+                 error_rate=args.error_rate, rate_limit=args.rate_limit, fsync=args.fsync)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Mide el tiempo de arranque de la CLI.
+
+Ejecuta cada comando varias veces en un proceso nuevo y compara su tiempo con
+el de un intérprete vacío (`python -c pass`). Con `-X importtime` desglosa
+además cuánto cuesta importar cada módulo. El resultado se imprime en JSON.
+
+Uso:
+    python benchmarks/startup.py [--runs 10]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+POKEDEX = os.path.join(ROOT, "pokedex.py")
+
+COMMANDS = {
+    "python": ["-c", "pass"],
+    "history": [POKEDEX, "history", "--limit", "0"],
+    "history_json": [POKEDEX, "history", "--json", "--limit", "0"],
+    "help": [POKEDEX, "--help"],
+}
+
+
+def wall_time(args, runs, cwd):
+    """Mediana y mínimo (en ms) de ejecutar `python args` `runs` veces."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=cwd, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, check=False)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": round(statistics.median(samples), 2), "min_ms": round(min(samples), 2)}
+
+
+def import_times(args, cwd, top=15):
+    """Módulos importados y su coste acumulado según `-X importtime`."""
+    result = subprocess.run([sys.executable, "-X", "importtime"] + args, cwd=cwd,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append({"module": name.rstrip(), "self_us": int(self_us),
+                        "cumulative_us": int(cumulative_us)})
+    # Los módulos importados directamente no llevan sangría en la salida
+    top_level = [m for m in modules if not m["module"].startswith("  ")]
+    for m in modules:
+        m["module"] = m["module"].strip()
+    return {
+        "modules": len(modules),
+        "heavy_modules_loaded": sorted({m["module"] for m in modules
+                                        if m["module"] in ("requests", "numpy", "urllib3",
+                                                           "sqlite3", "concurrent.futures")}),
+        "top_level": sorted(top_level, key=lambda m: -m["cumulative_us"])[:top],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="Repeticiones por comando")
+    args = parser.parse_args()
+
+    # Directorio vacío: sin historial, caché ni instantánea que alteren la medida
+    with tempfile.TemporaryDirectory() as cwd:
+        results = {name: wall_time(cmd, args.runs, cwd) for name, cmd in COMMANDS.items()}
+        baseline = results["python"]["median_ms"]
+        for name, result in results.items():
+            result["overhead_ms"] = round(result["median_ms"] - baseline, 2)
+        report = {
+            "python": sys.version.split()[0],
+            "runs": args.runs,
+            "wall_time": results,
+            "imports": {"history": import_times(COMMANDS["history"], cwd)},
+        }
+    json.dump(report, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import fastjson
+
+CACHE_FILE = "pokemon_cache.db"
+DEFAULT_TTL = 7 * 24 * 60 * 60  # Los datos de PokeAPI casi no cambian: una semana
+DEFAULT_MEMORY_ENTRIES = 256
+DEFAULT_DISK_ENTRIES = 5000
+
+
+class PokemonCache:
+    """Caché de respuestas de PokeAPI: LRU en memoria más un almacén SQLite en disco.
+
+    Cada entrada guarda su propia fecha de caducidad (TTL). Cuando se supera el
+    número máximo de entradas se descartan las usadas hace más tiempo. Varios
+    cachés pueden compartir archivo con tablas distintas (`table`): cada uno
+    tiene sus propios límites y contadores.
+    """
+
+    def __init__(self, path=CACHE_FILE, ttl=DEFAULT_TTL,
+                 max_memory_entries=DEFAULT_MEMORY_ENTRIES,
+                 max_disk_entries=DEFAULT_DISK_ENTRIES, table="entries"):
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.enabled = True   # --no-cache: ni se lee ni se escribe
+        self.refresh = False  # --refresh: se ignora lo guardado pero se actualiza
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self._memory = OrderedDict()  # clave -> (expira_en, datos)
+        self._conn = None
+        self._lock = threading.RLock()
+
+    def _connect(self):
+        """Abre (una sola vez) la base de datos SQLite del caché."""
+        if self._conn is None:
+            import sqlite3
+
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                " key TEXT PRIMARY KEY,"
+                " data TEXT NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{self.table}_accessed ON {self.table} (accessed_at)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _remember(self, key, expires_at, data):
+        """Guarda una entrada en el LRU de memoria respetando su tamaño máximo."""
+        self._memory[key] = (expires_at, data)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key, count=True):
+        """Devuelve los datos guardados para `key` o None si no hay una entrada vigente.
+
+        Con `count=False` la consulta no cuenta como acierto ni como fallo (para
+        volver a mirar una clave cuyo fallo ya se ha contado).
+        """
+        if not self.enabled or self.refresh:
+            return None
+        import sqlite3  # Se importa al usarse para no retrasar el arranque
+
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    if count:
+                        self.hits += 1
+                        self.memory_hits += 1
+                    return entry[1]
+                del self._memory[key]
+
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    f"SELECT data, expires_at FROM {self.table} WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[1] > now:
+                    conn.execute(
+                        f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key)
+                    )
+                    conn.commit()
+                    data = fastjson.loads(row[0])
+                    self._remember(key, row[1], data)
+                    if count:
+                        self.hits += 1
+                        self.disk_hits += 1
+                    return data
+                if row is not None:
+                    conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                    conn.commit()
+            except sqlite3.Error as e:
+                print(f"Error al leer el caché: {e}")
+
+            if count:
+                self.misses += 1
+            return None
+
+    def set(self, key, data, ttl=None):
+        """Guarda `data` en memoria y en disco con su propio TTL."""
+        if not self.enabled:
+            return
+        import sqlite3
+
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._remember(key, expires_at, data)
+            try:
+                conn = self._connect()
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table} (key, data, expires_at, accessed_at)"
+                    " VALUES (?, ?, ?, ?)",
+                    (key, fastjson.dumps(data).decode("utf-8"), expires_at, now),
+                )
+                self._evict(conn)
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"Error al escribir en el caché: {e}")
+
+    def _evict(self, conn):
+        """Elimina las entradas menos usadas si el disco supera su tamaño máximo."""
+        (count,) = conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        excess = count - self.max_disk_entries
+        if excess > 0:
+            conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f" SELECT key FROM {self.table} ORDER BY accessed_at LIMIT ?)",
+                (excess,),
+            )
+
+    def invalidate(self, key):
+        """Elimina una entrada concreta del caché."""
+        with self._lock:
+            self._memory.pop(key, None)
+            if os.path.exists(self.path):
+                conn = self._connect()
+                conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                conn.commit()
+
+    def clear(self):
+        """Vacía por completo el caché en memoria y en disco."""
+        with self._lock:
+            self._memory.clear()
+            if os.path.exists(self.path):
+                conn = self._connect()
+                conn.execute(f"DELETE FROM {self.table}")
+                conn.commit()
+
+    def iter_entries(self):
+        """Recorre los datos vigentes guardados en disco, uno a uno."""
+        if not os.path.exists(self.path):
+            return
+        with self._lock:
+            cursor = self._connect().execute(
+                f"SELECT key FROM {self.table} WHERE expires_at > ? ORDER BY key", (time.time(),)
+            )
+            keys = [key for (key,) in cursor]
+        for key in keys:
+            with self._lock:
+                row = self._connect().execute(
+                    f"SELECT data FROM {self.table} WHERE key = ?", (key,)
+                ).fetchone()
+            if row is not None:
+                yield fastjson.loads(row[0])
+
+    def stats(self):
+        """Devuelve los contadores de aciertos y fallos del caché."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+    def close(self):
+        """Cierra la conexión con la base de datos."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,172 @@
+import os
+import threading
+import time
+
+import fastjson
+from metrics import registry, span
+
+BASE_URL = os.environ.get("POKEAPI_BASE_URL", "https://pokeapi.co/api/v2")
+DEFAULT_TIMEOUT = (3.05, 10)  # (conexión, lectura) en segundos
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+DEFAULT_RATE = 20  # peticiones por segundo, por debajo del uso justo de PokeAPI
+DEFAULT_POOL_SIZE = 16
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class APIError(Exception):
+    """Error de red o de HTTP al hablar con PokeAPI."""
+
+
+class RateLimiter:
+    """Limitador de peticiones por "cubo de fichas", seguro entre hilos."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Espera hasta que haya una ficha disponible y la consume."""
+        if not self.rate:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity,
+                                   self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class PokeAPIClient:
+    """Cliente HTTP compartido para PokeAPI.
+
+    Reutiliza conexiones (keep-alive) mediante una sesión con pool, aplica
+    timeouts, reintenta con espera exponencial los errores transitorios
+    respetando la cabecera `Retry-After` y limita la tasa de peticiones.
+
+    `requests` solo se importa al hacer la primera petición, para que los
+    comandos que no usan la red arranquen rápido.
+    """
+
+    def __init__(self, base_url=BASE_URL, timeout=DEFAULT_TIMEOUT,
+                 retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF,
+                 rate=DEFAULT_RATE, pool_size=DEFAULT_POOL_SIZE):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.pool_size = pool_size
+        self.rate_limiter = RateLimiter(rate)
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """Sesión de `requests`, creada la primera vez que se necesita."""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry = Retry(
+            total=self.retries,
+            backoff_factor=self.backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size,
+                              max_retries=retry)
+        adapter.poolmanager.pool_classes_by_scheme = timed_pool_classes()
+        session = requests.Session()
+        session.headers["User-Agent"] = "pokedex-cli"
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def url(self, path):
+        """Construye la URL completa de un recurso de la API."""
+        if path.startswith(("http://", "https://")):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def get(self, path, **kwargs):
+        """Hace una petición GET a la API y devuelve la respuesta.
+
+        Los errores de red se convierten en `APIError`.
+        """
+        from requests.exceptions import RequestException
+
+        session = self.session
+        kwargs.setdefault("timeout", self.timeout)
+        with span("rate_limit_wait"):
+            self.rate_limiter.acquire()
+        try:
+            with span("http_request"):
+                response = session.get(self.url(path), **kwargs)
+        except RequestException as e:
+            registry.inc("pokedex_upstream_errors_total", kind=type(e).__name__)
+            raise APIError(str(e)) from e
+        # Tiempo hasta recibir las cabeceras: la parte de la latencia que es de PokeAPI
+        registry.observe("pokedex_upstream_response_seconds", response.elapsed.total_seconds())
+        registry.inc("pokedex_upstream_requests_total", status=response.status_code)
+        if response.status_code >= 400 and response.status_code != 404:
+            registry.inc("pokedex_upstream_errors_total", kind=f"http_{response.status_code}")
+        return response
+
+    def get_json(self, path, **kwargs):
+        """Hace una petición GET y devuelve el cuerpo JSON; los códigos de error lanzan `APIError`."""
+        response = self.get(path, **kwargs)
+        if response.status_code != 200:
+            raise APIError(f"{response.status_code} al pedir {self.url(path)}")
+        with span("json_decode"):
+            return fastjson.loads(response.content)
+
+    def close(self):
+        """Cierra las conexiones abiertas del pool."""
+        if self._session is not None:
+            self._session.close()
+
+
+def timed_pool_classes():
+    """Pools de urllib3 cuyas conexiones miden lo que tardan en abrirse.
+
+    Abrir una conexión incluye la resolución DNS, el saludo TCP y el de TLS; con
+    keep-alive solo ocurre la primera vez, así que el tramo "connect" muestra
+    cuánto cuesta y cuántas veces se ha tenido que pagar.
+    """
+    from urllib3.connection import HTTPConnection, HTTPSConnection
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    class TimedHTTPConnection(HTTPConnection):
+        def connect(self):
+            with span("connect"):
+                return super().connect()
+
+    class TimedHTTPSConnection(HTTPSConnection):
+        def connect(self):
+            with span("connect"):
+                return super().connect()
+
+    class TimedHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = TimedHTTPConnection
+
+    class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = TimedHTTPSConnection
+
+    return {"http": TimedHTTPConnectionPool, "https": TimedHTTPSConnectionPool}
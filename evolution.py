@@ -0,0 +1,94 @@
+import json
+import os
+import time
+from collections import deque
+
+EVOLUTION_FILE = "evolution_graph.json"
+
+
+def chain_id(url):
+    """Extrae el ID numérico de una URL de `/evolution-chain/{id}/`."""
+    return url.rstrip("/").rsplit("/", 1)[-1]
+
+
+class EvolutionGraph:
+    """Grafo de evoluciones: lista de adyacencia especie -> especies a las que evoluciona.
+
+    Muchas especies comparten la misma cadena, así que cada cadena se guarda
+    una sola vez y se recuerda a qué cadena pertenece cada especie.
+    """
+
+    def __init__(self):
+        self.children = {}  # especie -> [especies en las que evoluciona]
+        self.parent = {}    # especie -> especie de la que evoluciona
+        self.chain_of = {}  # especie -> ID de su cadena
+        self.roots = {}     # ID de cadena -> especie base
+
+    @classmethod
+    def load(cls, file=EVOLUTION_FILE):
+        """Carga el grafo guardado en disco."""
+        with open(file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        graph = cls()
+        graph.roots = data["roots"]
+        graph.chain_of = data["chain_of"]
+        graph.children = data["children"]
+        for species, children in graph.children.items():
+            for child in children:
+                graph.parent[child] = species
+        return graph
+
+    def save(self, file=EVOLUTION_FILE):
+        """Guarda el grafo para recargarlo al instante la próxima vez."""
+        tmp = f"{file}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"created_at": time.time(), "roots": self.roots,
+                       "chain_of": self.chain_of, "children": self.children}, f)
+        os.replace(tmp, file)
+
+    def __contains__(self, species):
+        return species in self.chain_of
+
+    def has_chain(self, cid):
+        """Indica si la cadena `cid` ya está cargada."""
+        return str(cid) in self.roots
+
+    def add_chain(self, cid, chain):
+        """Añade una respuesta de `/evolution-chain/{id}` al grafo."""
+        cid = str(cid)
+        self.roots[cid] = chain["chain"]["species"]["name"]
+        pending = [chain["chain"]]
+        while pending:
+            link = pending.pop()
+            species = link["species"]["name"]
+            self.chain_of[species] = cid
+            self.children[species] = [child["species"]["name"] for child in link["evolves_to"]]
+            for child in link["evolves_to"]:
+                self.parent[child["species"]["name"]] = species
+                pending.append(child)
+
+    def stages(self, species):
+        """Línea evolutiva completa de una especie, agrupada por etapas."""
+        root = self.roots[self.chain_of[species]]
+        stages = []
+        level = [root]
+        while level:
+            stages.append(level)
+            level = [child for s in level for child in self.children.get(s, ())]
+        return stages
+
+    def line(self, species):
+        """Todas las especies de la línea evolutiva, de la base a las finales."""
+        return [s for stage in self.stages(species) for s in stage]
+
+    def path(self, species):
+        """Camino desde la especie base hasta `species`."""
+        path = deque([species])
+        while path[0] in self.parent:
+            path.appendleft(self.parent[path[0]])
+        return list(path)
+
+    def finals(self, species=None):
+        """Evoluciones finales de una línea o, sin argumento, de todo el grafo."""
+        candidates = self.line(species) if species else self.children
+        return [s for s in candidates if not self.children.get(s)]
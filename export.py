@@ -0,0 +1,166 @@
+import csv
+import json
+import sys
+from itertools import islice
+
+from snapshot import STATS
+
+FORMATS = ("csv", "jsonl", "parquet")
+DEFAULT_CHUNK_SIZE = 1000
+FIELDS = ("id", "name", "types", "abilities", "weight", "height", "stats", "searched_at")
+FLAT_FIELDS = (("id", "name", "type1", "type2", "abilities", "weight", "height")
+               + STATS + ("searched_at",))
+
+
+def normalize(record):
+    """Convierte una respuesta de PokeAPI o un registro del historial a una fila común."""
+    types = record.get("types", [])
+    abilities = record.get("abilities", [])
+    stats = record.get("stats", {})
+    if types and isinstance(types[0], dict):
+        types = [t["type"]["name"] for t in sorted(types, key=lambda t: t.get("slot", 0))]
+    if abilities and isinstance(abilities[0], dict):
+        abilities = [a["ability"]["name"] for a in abilities]
+    if isinstance(stats, list):
+        stats = {s["stat"]["name"]: s["base_stat"] for s in stats}
+    return {
+        "id": record.get("id"),
+        "name": record.get("name"),
+        "types": types,
+        "abilities": abilities,
+        "weight": record.get("weight"),
+        "height": record.get("height"),
+        "stats": stats,
+        "searched_at": record.get("searched_at"),
+    }
+
+
+def flatten(row):
+    """Aplana tipos, habilidades y estadísticas en columnas simples."""
+    types = row["types"] + [None, None]
+    flat = {
+        "id": row["id"],
+        "name": row["name"],
+        "type1": types[0],
+        "type2": types[1],
+        "abilities": "|".join(row["abilities"]),
+        "weight": row["weight"],
+        "height": row["height"],
+        "searched_at": row["searched_at"],
+    }
+    for stat in STATS:
+        flat[stat] = row["stats"].get(stat)
+    return flat
+
+
+def iter_rows(records, fields=None, flat=False):
+    """Transforma perezosamente los registros en filas con los campos pedidos."""
+    fields = list(fields or (FLAT_FIELDS if flat else FIELDS))
+    for record in records:
+        row = normalize(record)
+        if flat:
+            row = flatten(row)
+        yield {field: row.get(field) for field in fields}
+
+
+def chunked(rows, size):
+    """Agrupa un iterable en listas de como mucho `size` elementos."""
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def write_csv(rows, f, fields):
+    """Escribe filas aplanadas en CSV."""
+    writer = csv.DictWriter(f, fieldnames=fields)
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_jsonl(rows, f):
+    """Escribe una fila JSON por línea."""
+    count = 0
+    for row in rows:
+        f.write(json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n")
+        count += 1
+    return count
+
+
+def parquet_schema(pa, fields, flat):
+    """Esquema Arrow fijo para los campos exportados."""
+    types = {
+        "id": pa.int64(),
+        "name": pa.string(),
+        "types": pa.list_(pa.string()),
+        "abilities": pa.string() if flat else pa.list_(pa.string()),
+        "weight": pa.int64(),
+        "height": pa.int64(),
+        "stats": pa.struct([(stat, pa.int64()) for stat in STATS]),
+        "searched_at": pa.string(),
+        "type1": pa.string(),
+        "type2": pa.string(),
+    }
+    types.update({stat: pa.int64() for stat in STATS})
+    return pa.schema([(field, types.get(field, pa.string())) for field in fields])
+
+
+def write_parquet(rows, path, fields, flat=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Escribe las filas en Parquet, un grupo de filas por bloque."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Exportar a Parquet requiere pyarrow (pip install pyarrow).")
+
+    schema = parquet_schema(pa, fields, flat)
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in chunked(rows, chunk_size):
+            writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+            count += len(chunk)
+    return count
+
+
+def export_records(records, output, fmt, fields=None, flat=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Exporta un flujo de registros a `output` ('-' para la salida estándar).
+
+    Los registros se procesan de uno en uno (o por bloques en Parquet), así que
+    la memoria usada no depende del número de registros. CSV siempre se aplana.
+    Devuelve el número de filas escritas.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato no soportado: {fmt}")
+    flat = flat or fmt == "csv"
+    fields = list(fields or (FLAT_FIELDS if flat else FIELDS))
+    rows = iter_rows(records, fields, flat)
+
+    if fmt == "parquet":
+        if output == "-":
+            raise ValueError("Parquet no se puede escribir en la salida estándar.")
+        return write_parquet(rows, output, fields, flat, chunk_size)
+
+    f = sys.stdout if output == "-" else open(output, "w", encoding="utf-8", newline="")
+    try:
+        if fmt == "csv":
+            return write_csv(rows, f, fields)
+        return write_jsonl(rows, f)
+    finally:
+        if f is not sys.stdout:
+            f.close()
+
+
+def guess_format(output):
+    """Deduce el formato de exportación por la extensión del archivo."""
+    for fmt in FORMATS:
+        if output.lower().endswith(f".{fmt}"):
+            return fmt
+    if output.lower().endswith(".json"):
+        return "jsonl"
+    return None
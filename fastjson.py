@@ -0,0 +1,131 @@
+"""Codificación y decodificación JSON con el motor más rápido disponible.
+
+Usa msgspec u orjson si están instalados y, si no, el módulo `json` estándar;
+la variable de entorno POKEDEX_JSON (`msgspec`, `orjson` o `json`) fuerza uno.
+Todas las variantes producen lo mismo: JSON compacto en UTF-8.
+"""
+import json
+import os
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # msgspec es opcional
+    msgspec = None
+
+
+def choose_backend(name=None):
+    """Devuelve el motor a usar: el pedido si está instalado o el más rápido disponible."""
+    name = (name or os.environ.get("POKEDEX_JSON", "")).lower()
+    available = {"msgspec": msgspec is not None, "orjson": orjson is not None, "json": True}
+    if available.get(name):
+        return name
+    return next(b for b in ("msgspec", "orjson", "json") if available[b])
+
+
+backend = choose_backend()
+
+# Opciones de orjson equivalentes a json.dumps: claves no textuales y tipos de NumPy
+_ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson else 0
+
+
+def loads(data):
+    """Decodifica JSON desde bytes o texto."""
+    if backend == "orjson" or (backend == "msgspec" and orjson is not None):
+        return orjson.loads(data)
+    if backend == "msgspec":
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.MsgspecError as e:
+            raise ValueError(str(e)) from e
+    return json.loads(data)
+
+
+def dumps(obj):
+    """Codifica `obj` como JSON compacto en bytes UTF-8 (sin escapar los acentos)."""
+    if orjson is not None and backend != "json":
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+        except TypeError:
+            pass  # Un tipo que orjson no conoce: se intenta con json
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def slim_pokemon(data):
+    """Reduce una respuesta de PokeAPI a los campos que usa la Pokédex.
+
+    Conserva la forma de la respuesta original (`types[].type.name`,
+    `stats[].stat.name`...), así que quien la lea no nota la diferencia, pero
+    ocupa una fracción en memoria y en el caché: los movimientos, sprites e
+    índices de juego son la mayor parte de cada respuesta.
+    """
+    return {
+        "id": data.get("id", 0),
+        "name": data["name"],
+        "types": [{"slot": t.get("slot", 0), "type": {"name": t["type"]["name"]}}
+                  for t in data["types"]],
+        "abilities": [{"ability": {"name": a["ability"]["name"]}} for a in data["abilities"]],
+        "weight": data["weight"],
+        "height": data["height"],
+        "stats": [{"base_stat": s["base_stat"], "stat": {"name": s["stat"]["name"]}}
+                  for s in data.get("stats", [])],
+    }
+
+
+_pokemon_decoder = None
+
+
+def _msgspec_decoder():
+    """Decodificador con esquema: msgspec se salta sin construirlos los campos que no declara."""
+    global _pokemon_decoder
+    if _pokemon_decoder is None:
+        from typing import List
+
+        class Named(msgspec.Struct):
+            name: str
+
+        class TypeSlot(msgspec.Struct):
+            type: Named
+            slot: int = 0
+
+        class AbilitySlot(msgspec.Struct):
+            ability: Named
+
+        class Stat(msgspec.Struct):
+            base_stat: int
+            stat: Named
+
+        class PokemonSchema(msgspec.Struct):
+            name: str
+            types: List[TypeSlot]
+            abilities: List[AbilitySlot]
+            weight: int
+            height: int
+            id: int = 0
+            stats: List[Stat] = []
+
+        _pokemon_decoder = msgspec.json.Decoder(PokemonSchema)
+    return _pokemon_decoder
+
+
+def decode_pokemon(raw):
+    """Decodifica una respuesta de /pokemon/{nombre} quedándose solo con los campos útiles."""
+    if backend != "msgspec":
+        return slim_pokemon(loads(raw))
+    try:
+        p = _msgspec_decoder().decode(raw)
+    except msgspec.MsgspecError as e:
+        raise ValueError(str(e)) from e
+    return {
+        "id": p.id,
+        "name": p.name,
+        "types": [{"slot": t.slot, "type": {"name": t.type.name}} for t in p.types],
+        "abilities": [{"ability": {"name": a.ability.name}} for a in p.abilities],
+        "weight": p.weight,
+        "height": p.height,
+        "stats": [{"base_stat": s.base_stat, "stat": {"name": s.stat.name}} for s in p.stats],
+    }
@@ -0,0 +1,178 @@
+import atexit
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+import fastjson
+
+HISTORY_FILE = "pokemon_history.jsonl"
+LEGACY_HISTORY_FILE = "pokemon_history.json"
+FSYNC_POLICIES = ("always", "interval", "never")
+DEFAULT_FSYNC = "interval"
+DEFAULT_FSYNC_INTERVAL = 1.0  # segundos entre fsync con la política "interval"
+
+
+class HistoryWriter:
+    """Escritor del historial en formato JSON Lines, solo por anexado.
+
+    Cada búsqueda es una única línea añadida al final del archivo, así que
+    guardar cuesta lo mismo sin importar el tamaño del historial y un corte a
+    mitad de escritura solo puede estropear la última línea.
+
+    Políticas de fsync:
+    - "always": fsync tras cada registro (lo más seguro, lo más lento).
+    - "interval": como mucho un fsync cada `fsync_interval` segundos.
+    - "never": se deja el volcado a disco en manos del sistema operativo.
+    """
+
+    def __init__(self, file=HISTORY_FILE, fsync=DEFAULT_FSYNC,
+                 fsync_interval=DEFAULT_FSYNC_INTERVAL):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Política de fsync no válida: {fsync}")
+        self.file = file
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self._f = None
+        self._last_sync = 0.0
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def append(self, record):
+        """Añade un registro al final del historial."""
+        line = fastjson.dumps(record) + b"\n"
+        with self._lock:
+            if self._f is None:
+                self._f = open(self.file, "ab")
+            self._f.write(line)
+            self._f.flush()
+            self._dirty = True
+            now = time.monotonic()
+            if self.fsync == "always" or (
+                    self.fsync == "interval" and now - self._last_sync >= self.fsync_interval):
+                os.fsync(self._f.fileno())
+                self._last_sync = now
+                self._dirty = False
+
+    def close(self):
+        """Vuelca los datos pendientes y cierra el archivo."""
+        with self._lock:
+            if self._f is not None:
+                if self._dirty and self.fsync != "never":
+                    os.fsync(self._f.fileno())
+                self._f.close()
+                self._f = None
+                self._dirty = False
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(file=HISTORY_FILE, fsync=DEFAULT_FSYNC):
+    """Devuelve el escritor compartido de `file`, creándolo si hace falta."""
+    with _writers_lock:
+        writer = _writers.get(file)
+        if writer is None:
+            writer = _writers[file] = HistoryWriter(file, fsync)
+        else:
+            writer.fsync = fsync
+        return writer
+
+
+@atexit.register
+def close_writers():
+    """Cierra todos los escritores abiertos."""
+    with _writers_lock:
+        for writer in _writers.values():
+            writer.close()
+        _writers.clear()
+
+
+def iter_history(file=HISTORY_FILE):
+    """Recorre el historial registro a registro sin cargarlo entero en memoria.
+
+    Las líneas dañadas (por ejemplo, la última tras un corte de luz) se omiten.
+    """
+    with open(file, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield fastjson.loads(line)
+            except ValueError:
+                continue
+
+
+def migrate_json_history(source=LEGACY_HISTORY_FILE, target=HISTORY_FILE):
+    """Convierte el historial antiguo (un arreglo JSON) al formato JSON Lines.
+
+    Los registros se añaden a `target` y el archivo antiguo se renombra a
+    `<source>.migrated` para que la migración solo ocurra una vez. Devuelve el
+    número de registros migrados. Lanza ValueError u OSError si el archivo
+    antiguo no se puede leer; en ese caso no se modifica nada.
+    """
+    if not os.path.exists(source):
+        return 0
+    if os.path.getsize(source) > 0:
+        with open(source, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        if not isinstance(records, list):
+            raise ValueError("el historial antiguo no es un arreglo JSON")
+    else:
+        records = []
+
+    with open(target, "ab") as f:
+        for record in records:
+            f.write(fastjson.dumps(record) + b"\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(source, f"{source}.migrated")
+    return len(records)
+
+
+def filter_history(records, name=None, pokemon_type=None, ability=None,
+                   since=None, until=None):
+    """Filtra perezosamente los registros del historial.
+
+    `name` busca por prefijo del nombre; `since` y `until` son fechas
+    YYYY-MM-DD (ambas inclusive) que solo casan con registros fechados.
+    """
+    name = name.lower() if name else None
+    for record in records:
+        if name and not record.get("name", "").startswith(name):
+            continue
+        if pokemon_type and pokemon_type not in record.get("types", ()):
+            continue
+        if ability and ability not in record.get("abilities", ()):
+            continue
+        if since or until:
+            day = record.get("searched_at", "")[:10]
+            if not day or (since and day < since) or (until and day > until):
+                continue
+        yield record
+
+
+def aggregate_history(records, top=10):
+    """Calcula en una sola pasada los Pokémon más buscados y las búsquedas por tipo."""
+    species = Counter()
+    types = Counter()
+    total = 0
+    first = last = None
+    for record in records:
+        total += 1
+        species[record.get("name")] += 1
+        types.update(record.get("types", ()))
+        searched_at = record.get("searched_at")
+        if searched_at:
+            first = searched_at if first is None else min(first, searched_at)
+            last = searched_at if last is None else max(last, searched_at)
+    return {
+        "total": total,
+        "unique_species": len(species),
+        "first_search": first,
+        "last_search": last,
+        "top_species": species.most_common(top),
+        "searches_per_type": types.most_common(),
+    }
@@ -0,0 +1,130 @@
+import json
+import os
+from itertools import combinations
+
+import numpy as np
+
+TYPE_CHART_FILE = "type_chart.json"
+TYPES = ("normal", "fire", "water", "electric", "grass", "ice", "fighting", "poison",
+         "ground", "flying", "psychic", "bug", "rock", "ghost", "dragon", "dark",
+         "steel", "fairy")
+
+
+class TypeChart:
+    """Tabla de efectividades precalculada.
+
+    `attack[a, d]` es el multiplicador de un ataque de tipo `a` contra un
+    Pokémon de tipo `d`. `defense[c, a]` da lo mismo para cada una de las 171
+    combinaciones de tipos defensivas (18 simples + 153 dobles), así que toda
+    consulta es una indexación directa del arreglo.
+    """
+
+    def __init__(self, attack, types=TYPES):
+        self.types = tuple(types)
+        self.type_index = {t: i for i, t in enumerate(self.types)}
+        self.attack = np.asarray(attack, dtype=np.float64)
+
+        n = len(self.types)
+        combos = [(i, i) for i in range(n)] + list(combinations(range(n), 2))
+        self.combos = combos
+        self.combo_index = {}
+        for c, (i, j) in enumerate(combos):
+            self.combo_index[(i, j)] = self.combo_index[(j, i)] = c
+        first = np.array([i for i, _ in combos])
+        second = np.array([j for _, j in combos])
+        # Un Pokémon de un solo tipo se guarda como (t, t): solo cuenta una vez
+        single = first == second
+        self.defense = (self.attack[:, first] *
+                        np.where(single, 1.0, self.attack[:, second])).T
+
+    @classmethod
+    def from_api(cls, get_json):
+        """Construye la tabla descargando cada `/type/{nombre}` una sola vez."""
+        attack = np.ones((len(TYPES), len(TYPES)))
+        index = {t: i for i, t in enumerate(TYPES)}
+        for a, name in enumerate(TYPES):
+            relations = get_json(f"type/{name}")["damage_relations"]
+            for key, multiplier in (("double_damage_to", 2.0), ("half_damage_to", 0.5),
+                                    ("no_damage_to", 0.0)):
+                for target in relations[key]:
+                    if target["name"] in index:
+                        attack[a, index[target["name"]]] = multiplier
+        return cls(attack)
+
+    @classmethod
+    def load(cls, file=TYPE_CHART_FILE):
+        """Carga la tabla guardada en disco."""
+        with open(file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["attack"], data["types"])
+
+    def save(self, file=TYPE_CHART_FILE):
+        """Guarda la tabla en disco para no volver a descargarla."""
+        tmp = f"{file}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"types": list(self.types), "attack": self.attack.tolist()}, f)
+        os.replace(tmp, file)
+
+    def combo(self, types):
+        """Índice de la combinación defensiva de una lista de uno o dos tipos."""
+        try:
+            idx = [self.type_index[t] for t in types]
+        except KeyError as e:
+            raise ValueError(f"Tipo desconocido: {e.args[0]}")
+        if not 1 <= len(idx) <= 2:
+            raise ValueError("Un Pokémon tiene uno o dos tipos.")
+        return self.combo_index[(idx[0], idx[-1])]
+
+    def multipliers(self, types):
+        """{tipo atacante: multiplicador} contra un Pokémon con `types`."""
+        row = self.defense[self.combo(types)]
+        return dict(zip(self.types, row.tolist()))
+
+    def weaknesses(self, types):
+        """Tipos atacantes súper eficaces (x2 o x4), de mayor a menor."""
+        return sorted(((t, m) for t, m in self.multipliers(types).items() if m > 1),
+                      key=lambda item: -item[1])
+
+    def resistances(self, types):
+        """Tipos atacantes poco eficaces o sin efecto, de menor a mayor."""
+        return sorted(((t, m) for t, m in self.multipliers(types).items() if m < 1),
+                      key=lambda item: item[1])
+
+    def roster_combos(self, roster_types):
+        """Convierte una lista de tipos por Pokémon en arreglos de índices de tipo."""
+        first = np.empty(len(roster_types), dtype=np.intp)
+        second = np.empty(len(roster_types), dtype=np.intp)
+        for k, types in enumerate(roster_types):
+            first[k] = self.type_index[types[0]]
+            second[k] = self.type_index[types[-1]]
+        combos = np.array([self.combo_index[(i, j)] for i, j in zip(first, second)], dtype=np.intp)
+        return first, second, combos
+
+    def counter_scores(self, target_types, first, second, combos):
+        """Puntúa a cada Pokémon de un plantel como rival de `target_types`.
+
+        La puntuación es el mejor multiplicador con el que el Pokémon ataca
+        (asumiendo ataques de sus propios tipos) dividido entre el peor que
+        recibe de los tipos del objetivo.
+        """
+        target = self.combo(target_types)
+        t1, t2 = self.combos[target]
+        offense = np.maximum(self.defense[target, first], self.defense[target, second])
+        received = np.maximum(self.defense[combos, t1], self.defense[combos, t2])
+        return offense / np.maximum(received, 0.125)
+
+    def coverage(self, team_types):
+        """Análisis de cobertura de un equipo.
+
+        Devuelve, para cada tipo defensor, el mejor multiplicador que alcanza el
+        equipo y, para cada tipo atacante, cuántos miembros son débiles y
+        cuántos lo resisten.
+        """
+        first, second, combos = self.roster_combos(team_types)
+        offense = np.maximum(self.attack[first], self.attack[second]).max(axis=0)
+        received = self.defense[combos]
+        return {
+            "offense": dict(zip(self.types, offense.tolist())),
+            "weak": dict(zip(self.types, (received > 1).sum(axis=0).tolist())),
+            "resist": dict(zip(self.types, (received < 1).sum(axis=0).tolist())),
+        }
@@ -0,0 +1,156 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+
+# Límites (en segundos) de los cubos de los histogramas de latencia
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Histograma acumulativo al estilo de Prometheus (cubos, suma y cuenta)."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # el último es +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+
+class Registry:
+    """Métricas del proceso: histogramas, contadores y valores calculados al leerlos.
+
+    Cada métrica se identifica por su nombre y sus etiquetas. Es segura entre
+    hilos y barata: medir un tramo cuesta dos lecturas del reloj y un bloqueo.
+    """
+
+    def __init__(self):
+        self.histograms = {}  # (nombre, etiquetas) -> Histogram
+        self.counters = {}    # (nombre, etiquetas) -> valor
+        self.gauges = {}      # (nombre, etiquetas) -> función sin argumentos
+        self.help = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, value, **labels):
+        """Añade una observación (en segundos) al histograma `name`."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def inc(self, name, amount=1, **labels):
+        """Incrementa el contador `name`."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def gauge(self, name, fn, description=None, **labels):
+        """Registra un valor que se calcula con `fn()` cada vez que se exporta."""
+        self.gauges[(name, tuple(sorted(labels.items())))] = fn
+        if description:
+            self.help[name] = description
+
+    @contextmanager
+    def span(self, name, metric="pokedex_span_seconds"):
+        """Mide la duración del bloque `with` como un tramo llamado `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(metric, time.perf_counter() - start, span=name)
+
+    def timed(self, name):
+        """Decorador que mide cada llamada a la función como un tramo."""
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def spans(self, metric="pokedex_span_seconds"):
+        """Resumen de los tramos medidos: llamadas, total, media y máximo (en ms)."""
+        with self._lock:
+            items = [(dict(labels)["span"], h) for (name, labels), h in self.histograms.items()
+                     if name == metric]
+        return {span: {"count": h.count, "total_ms": round(h.sum * 1000, 3),
+                       "mean_ms": round(h.sum / h.count * 1000, 3),
+                       "max_ms": round(h.max * 1000, 3)}
+                for span, h in sorted(items)}
+
+    def render(self):
+        """Exporta todas las métricas en el formato de texto de Prometheus."""
+        lines = []
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+            counters = sorted(self.counters.items())
+        gauges = sorted(self.gauges.items(), key=lambda item: item[0])
+
+        seen = set()
+
+        def header(name, kind):
+            if name not in seen:
+                seen.add(name)
+                if name in self.help:
+                    lines.append(f"# HELP {name} {self.help[name]}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), histogram in histograms:
+            header(name, "histogram")
+            cumulative = 0
+            for bound, count in zip(self.bucket_labels(histogram), histogram.counts):
+                cumulative += count
+                lines.append(f"{name}_bucket{format_labels(labels + (('le', bound),))} {cumulative}")
+            lines.append(f"{name}_sum{format_labels(labels)} {histogram.sum:.6f}")
+            lines.append(f"{name}_count{format_labels(labels)} {histogram.count}")
+        for (name, labels), value in counters:
+            header(name, "counter")
+            lines.append(f"{name}{format_labels(labels)} {value}")
+        for (name, labels), fn in gauges:
+            header(name, "gauge")
+            try:
+                value = float(fn())
+            except Exception:
+                continue
+            lines.append(f"{name}{format_labels(labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def bucket_labels(histogram):
+        return [f"{b:g}" for b in histogram.buckets] + ["+Inf"]
+
+
+def format_labels(labels):
+    """Formatea las etiquetas como `{a="1",b="2"}` (o nada si no hay)."""
+    if not labels:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+               for _, v in labels)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped)) + "}"
+
+
+# Registro compartido por la CLI, el cliente HTTP y la API
+registry = Registry()
+registry.help.update({
+    "pokedex_span_seconds": "Duración de cada tramo instrumentado",
+    "pokedex_upstream_response_seconds": "Tiempo hasta recibir las cabeceras de PokeAPI",
+    "pokedex_upstream_requests_total": "Peticiones a PokeAPI por código de estado",
+    "pokedex_upstream_errors_total": "Errores de red o HTTP al hablar con PokeAPI",
+    "pokedex_http_request_seconds": "Duración de las peticiones a la API HTTP por ruta",
+    "pokedex_http_responses_total": "Respuestas de la API HTTP por ruta y código",
+})
+span = registry.span
+timed = registry.timed
@@ -0,0 +1,98 @@
+import json
+import os
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+NAMES_FILE = "pokemon_names.json"
+
+
+def trigrams(word):
+    """Trigramas de una palabra, con relleno para dar peso al principio y al final."""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b):
+    """Distancia de Levenshtein entre dos cadenas."""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i]
+        for j, cb in enumerate(b, start=1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+class NameIndex:
+    """Índice local de nombres de Pokémon.
+
+    Las búsquedas por prefijo usan la lista ordenada de nombres con búsqueda
+    binaria y las sugerencias ("¿quisiste decir...?") un índice de trigramas
+    que reduce los candidatos antes de calcular la distancia de edición.
+    """
+
+    def __init__(self, names, ids=None):
+        self.names = sorted(set(names))
+        self._known = set(self.names)
+        self.ids = dict(ids or {})  # ID (como texto) -> nombre
+        self._grams = defaultdict(list)
+        for i, name in enumerate(self.names):
+            for gram in trigrams(name):
+                self._grams[gram].append(i)
+
+    @classmethod
+    def load(cls, file=NAMES_FILE):
+        """Carga el índice guardado en disco."""
+        with open(file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["names"], data.get("ids"))
+
+    @classmethod
+    def from_listing(cls, listing):
+        """Construye el índice a partir del listado {nombre: url} de `/pokemon`."""
+        ids = {url.rstrip("/").rsplit("/", 1)[-1]: name for name, url in listing.items()}
+        return cls(listing, ids)
+
+    def save(self, file=NAMES_FILE):
+        """Guarda la lista de nombres para cargarla al arrancar."""
+        tmp = f"{file}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"created_at": time.time(), "names": self.names, "ids": self.ids}, f)
+        os.replace(tmp, file)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._known
+
+    def name_for_id(self, pokemon_id):
+        """Nombre del Pokémon con ese ID, o None si no se conoce."""
+        return self.ids.get(str(pokemon_id))
+
+    def complete(self, prefix, limit=None):
+        """Nombres que empiezan por `prefix`, en orden alfabético."""
+        prefix = prefix.lower()
+        start = bisect_left(self.names, prefix)
+        matches = []
+        for name in self.names[start:]:
+            if not name.startswith(prefix) or (limit is not None and len(matches) >= limit):
+                break
+            matches.append(name)
+        return matches
+
+    def suggest(self, name, limit=3, max_distance=None):
+        """Nombres parecidos a `name`, del más al menos parecido."""
+        name = name.lower()
+        if max_distance is None:
+            max_distance = max(2, len(name) // 3)
+        shared = Counter()
+        for gram in trigrams(name):
+            shared.update(self._grams.get(gram, ()))
+        candidates = [self.names[i] for i, _ in shared.most_common(50)]
+        scored = sorted((edit_distance(name, c), c) for c in candidates)
+        return [c for distance, c in scored if distance <= max_distance][:limit]
@@ -1,91 +1,816 @@
-import requests
+import argparse
 import json
 import os
+import sys
+from contextlib import nullcontext, redirect_stdout
+from datetime import date, datetime
+from itertools import islice
 
-def get_pokemon_data(pokemon_name):
-    """Obtiene los datos de un Pokémon desde la API."""
-    url = f"https://pokeapi.co/api/v2/pokemon/{pokemon_name.lower()}"
+from cache import PokemonCache
+from client import APIError, PokeAPIClient, DEFAULT_RATE, DEFAULT_RETRIES
+from evolution import EvolutionGraph, EVOLUTION_FILE, chain_id
+from names import NameIndex, NAMES_FILE
+from pokemon import Pokemon, PokemonTable
+from singleflight import SingleFlight
+from metrics import registry, span, timed
+from fastjson import decode_pokemon
+from history import (HISTORY_FILE, LEGACY_HISTORY_FILE, DEFAULT_FSYNC, FSYNC_POLICIES,
+                     aggregate_history, filter_history, get_writer, iter_history,
+                     migrate_json_history)
+from snapshot import Snapshot, SNAPSHOT_FILE, write_snapshot
+
+# Caché de Pokémon compartido por todas las consultas (memoria + disco)
+cache = PokemonCache()
+# Otros recursos de la API (tipos, especies, cadenas de evolución), en su propia
+# tabla del mismo archivo: no desplazan a los Pokémon ni cuentan en sus aciertos
+resource_cache = PokemonCache(table="resources")
+registry.gauge("pokedex_cache_hit_ratio", lambda: cache.stats()["hit_ratio"],
+               "Proporción de consultas respondidas desde el caché")
+registry.gauge("pokedex_cache_hits", lambda: cache.hits, "Consultas respondidas desde el caché")
+registry.gauge("pokedex_cache_misses", lambda: cache.misses, "Consultas que no estaban en el caché")
+# Cliente HTTP compartido (pool de conexiones, reintentos y límite de tasa)
+client = PokeAPIClient()
+# Número de descargas simultáneas en las consultas por lotes
+DEFAULT_CONCURRENCY = 8
+# Instantánea local de la Pokédex (None si no se ha sincronizado)
+snapshot = None
+# Política de fsync del historial ("always", "interval" o "never")
+history_fsync = DEFAULT_FSYNC
+# Entradas del historial por página en el menú interactivo
+HISTORY_PAGE_SIZE = 20
+# Tabla de efectividades de tipos (se carga la primera vez que se usa)
+type_chart = None
+# Índice local de nombres para autocompletar y corregir erratas sin red
+name_index = None
+# Grafo de evoluciones (se carga la primera vez que se usa)
+evolution_graph = None
+# Descargas en curso: las consultas simultáneas del mismo Pokémon comparten una
+inflight = SingleFlight()
+registry.gauge("pokedex_coalesced_requests", lambda: inflight.shared,
+               "Consultas que reutilizaron una descarga ya en curso")
+# IDs aprendidos de las respuestas de la API (ID como texto -> nombre)
+id_aliases = {}
+# Flujo para la salida JSON de los subcomandos (None = salida para personas)
+json_output = None
+
+def close_snapshot():
+    """Libera la instantánea cargada, si la hay."""
+    global snapshot
+    if snapshot is not None:
+        snapshot.close()
+        snapshot = None
+
+def load_snapshot(file=SNAPSHOT_FILE):
+    """Mapea en memoria la instantánea local, si existe, para responder sin red."""
+    global snapshot
+    close_snapshot()
+    if os.path.exists(file):
+        try:
+            snapshot = Snapshot(file)
+        except (OSError, ValueError) as e:
+            print(f"Error al cargar la instantánea: {e}")
+    return snapshot
+
+def fetch_pokemon_list():
+    """Descarga el listado completo {nombre: url} de Pokémon de la API."""
+    listing = client.get_json("pokemon", params={"limit": 100000})
+    return {p["name"]: p["url"] for p in listing["results"]}
+
+def load_name_index(file=NAMES_FILE):
+    """Carga el índice de nombres desde disco, la instantánea o, si no hay otra, la API."""
+    global name_index
+    if os.path.exists(file):
+        try:
+            name_index = NameIndex.load(file)
+            return name_index
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error al leer el índice de nombres: {e}")
+    try:
+        names = (snapshot.sources or snapshot.names) if snapshot is not None else fetch_pokemon_list()
+    except APIError:
+        return None  # Sin índice: los nombres se validan contra la API
+    name_index = NameIndex.from_listing(names) if isinstance(names, dict) else NameIndex(names)
+    name_index.save(file)
+    return name_index
+
+def resolve_name(pokemon_name):
+    """Normaliza un nombre y lo valida contra el índice local antes de ir a la red.
+
+    Devuelve None (tras sugerir nombres parecidos) si el nombre no existe.
+    """
+    key = pokemon_name.strip().lower()
+    if name_index is None or key.isdigit() or key in name_index:
+        return key
+    suggestions = name_index.suggest(key)
+    if suggestions:
+        print(f"Pokémon no encontrado. ¿Quisiste decir: {', '.join(suggestions)}?")
+    else:
+        print("Pokémon no encontrado. Por favor, verifica el nombre.")
+    return None
+
+def enable_name_completion():
+    """Activa el autocompletado de nombres con Tab en el menú interactivo."""
     try:
-        response = requests.get(url)
-        if response.status_code == 200:   
-            return response.json() #Devuelve los datos como un diccionario 
-        elif response.status_code == 404:
+        import readline
+    except ImportError:  # No disponible en todas las plataformas (p. ej. Windows)
+        return
+
+    def completer(text, state):
+        matches = name_index.complete(text, limit=50) if name_index is not None else []
+        return matches[state] if state < len(matches) else None
+
+    readline.set_completer(completer)
+    readline.set_completer_delims(" \t\n,")
+    readline.parse_and_bind("tab: complete")
+
+@timed("get_pokemon_data")
+def get_pokemon_data(pokemon_name):
+    """Obtiene los datos de un Pokémon desde la instantánea local, el caché o la API."""
+    pokemon_name = resolve_name(pokemon_name)
+    if pokemon_name is None:
+        return None
+    if snapshot is not None:
+        data = snapshot.get(pokemon_name)
+        if data is None:
             print("Pokémon no encontrado. Por favor, verifica el nombre.")
-        else:
-            print(f"Error al obtener los datos. Código de estado : {response.status_code}")
-    except requests.exceptions.RequestException as e:
+        return data
+    return fetch_pokemon_data(pokemon_name)
+
+def canonical_key(pokemon_name):
+    """Clave única de un Pokémon: su nombre, aunque se pida por ID ("25" -> "pikachu")."""
+    key = pokemon_name.strip().lower()
+    if key.isdigit():
+        key = str(int(key))
+        alias = id_aliases.get(key)
+        if alias is None and name_index is not None:
+            alias = name_index.name_for_id(key)
+        return alias or key
+    return key
+
+def fetch_pokemon_data(pokemon_name):
+    """Obtiene los datos de un Pokémon desde el caché o, si no está, desde la API.
+
+    Las peticiones simultáneas del mismo Pokémon (por nombre o por ID) se agrupan
+    en una sola descarga cuyo resultado comparten todas.
+    """
+    key = canonical_key(pokemon_name)
+    data = cache.get(key)
+    if data is not None:
+        return data
+    try:
+        data, status = inflight.do(key, download_pokemon, key)
+    except APIError as e:
         print(f"Error de conexión: {e}")
-    return None
+        return None
+    if status == 404:
+        print("Pokémon no encontrado. Por favor, verifica el nombre.")
+    elif data is None:
+        print(f"Error al obtener los datos. Código de estado : {status}")
+    return data
+
+def download_pokemon(key):
+    """Descarga un Pokémon de la API y lo guarda en el caché con su nombre.
+
+    Devuelve (datos, código de estado); los datos son None si la respuesta no es 200.
+    """
+    # Otra descarga pudo terminar justo antes de empezar esta; el fallo ya se contó
+    data = cache.get(key, count=False)
+    if data is not None:
+        return data, 200
+    response = client.get(f"pokemon/{key}")
+    if response.status_code != 200:
+        return None, response.status_code
+    with span("json_decode"):
+        # Solo los campos que se usan: el resto (movimientos, sprites...) ni se guarda en el caché
+        data = decode_pokemon(response.content)
+    name = data.get("name", key)
+    if "id" in data:
+        id_aliases[str(data["id"])] = name
+    cache.set(name, data)
+    return data, 200
 
 def display_pokemon_info(data):
     """Muestra informacion del Pokémon."""
-    print(f"\n Nombre: {data['name'].capitalize()}")
-    print("Tipos:",",".join([t['type']['name']for t in data['types']]))
-    print("Habilidades:",",".join([a['ability']['name'] for a in data ['abilities']]))
-    print(f"Peso: {data['weight']} hectogramos")
-    print(f"Altura: {data['height']} decímetros")
-
-def save_to_file(pokemon_name, data, file="pokemon_history.json"):
-    """Guarda los datos del Pokémon en un archivo JSON."""
-    pokemon_info = {
-        "name": data['name'],
-        "types": [t['type']['name'] for t in data['types']],
-        "abilities": [a['ability']['name'] for a in data['abilities']],
-        "weight": data['weight'],
-        "height": data['height']
-    }
-
-    try:
-        # Verificar si el archivo existe y no está vacío
-        if os.path.exists(file) and os.path.getsize(file) > 0:
-            with open(file, "r") as f:
-                history = json.load(f)
-        else:
-            history = []  # Inicializar como lista vacía si el archivo no existe o está vacío
-
-        # Añadir el nuevo Pokémon al historial
-        history.append(pokemon_info)
+    pokemon = Pokemon.from_api(data)
+    print(f"\n Nombre: {pokemon.name.capitalize()}")
+    print("Tipos:",",".join(pokemon.types))
+    print("Habilidades:",",".join(pokemon.abilities))
+    print(f"Peso: {pokemon.weight} hectogramos")
+    print(f"Altura: {pokemon.height} decímetros")
 
-        # Guardar el historial actualizado
-        with open(file, "w") as f:
-            json.dump(history, f, indent=4)
+@timed("save_to_file")
+def save_to_file(pokemon_name, data, file=HISTORY_FILE):
+    """Añade los datos del Pokémon al historial (una línea JSON por búsqueda)."""
+    pokemon_info = Pokemon.from_api(data).to_history(datetime.now().isoformat(timespec="seconds"))
 
+    try:
+        get_writer(file, history_fsync).append(pokemon_info)
         print(f"Datos de {pokemon_name.capitalize()} guardados en '{file}'.")
     except Exception as e:
-        print(f"Error al guardar en JSON: {e}")
-def load_from_json(file="pokemon_history.json"):
-    """Carga y muestra el historial de busquedas desde un archivo JSON."""
-    try:
-        with open(file, "r") as f:
-            history = json.load(f)
-            print("\nHistorial de búsquedas:")
-            for pokemon in history:
-                print(f"- {pokemon['name'].capitalize()} (Tipos: {','.join(pokemon['types'])})")
+        print(f"Error al guardar en el historial: {e}")
+
+@timed("load_from_json")
+def load_from_json(file=HISTORY_FILE, limit=None, offset=0, page_size=None, **filters):
+    """Muestra el historial de búsquedas, leyéndolo línea a línea.
+
+    Admite los filtros de `filter_history`, paginación con `limit`/`offset` y,
+    con `page_size`, pausas interactivas entre páginas.
+    """
+    try:
+        history = filter_history(iter_history(file), **filters)
+        stop = None if limit is None else offset + limit
+        print("\nHistorial de búsquedas:")
+        shown = 0
+        for record in islice(history, offset, stop):
+            pokemon = Pokemon.from_history(record)
+            print(f"- {pokemon.name.capitalize()} (Tipos: {','.join(pokemon.types)})")
+            shown += 1
+            if page_size and shown % page_size == 0:
+                if input("Enter para ver más, 'q' para volver: ").strip().lower() == "q":
+                    break
+        if not shown:
+            print("No hay búsquedas que coincidan.")
     except FileNotFoundError:
         print("\nNo se encontró un historial. Busca un Pokémon primero.")
     except Exception as e:
         print(f"Error al leer el historial: {e}")
 
+def display_history_stats(file=HISTORY_FILE, top=10, **filters):
+    """Muestra un resumen del historial calculado en una sola pasada."""
+    try:
+        stats = aggregate_history(filter_history(iter_history(file), **filters), top)
+    except FileNotFoundError:
+        print("\nNo se encontró un historial. Busca un Pokémon primero.")
+        return
+    print(f"\nBúsquedas: {stats['total']} ({stats['unique_species']} Pokémon distintos)")
+    if stats["first_search"]:
+        print(f"Desde {stats['first_search']} hasta {stats['last_search']}")
+    print("Más buscados:")
+    for name, count in stats["top_species"]:
+        print(f"- {name.capitalize()}: {count}")
+    print("Búsquedas por tipo:")
+    for pokemon_type, count in stats["searches_per_type"]:
+        print(f"- {pokemon_type}: {count}")
+
+def iter_many_pokemon(names, max_workers=DEFAULT_CONCURRENCY, fetch=None):
+    """Descarga varios Pokémon en paralelo y los entrega según van llegando.
+
+    Produce tuplas (posición, nombre, datos) en orden de finalización; `datos`
+    es None si el Pokémon no se pudo obtener. `names` puede ser un generador:
+    solo hay unas pocas descargas en curso a la vez, así que la memoria usada
+    no depende de cuántos nombres haya.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    fetch = fetch or get_pokemon_data
+    max_workers = max(1, max_workers)
+    pending = {}
+    names = iter(enumerate(names))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for i, name in islice(names, max_workers * 2):
+            pending[executor.submit(fetch, name)] = (i, name)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                i, name = pending.pop(future)
+                for j, next_name in islice(names, 1):
+                    pending[executor.submit(fetch, next_name)] = (j, next_name)
+                yield i, name, future.result()
+
+def get_many_pokemon(names, max_workers=DEFAULT_CONCURRENCY):
+    """Descarga varios Pokémon en paralelo y devuelve sus datos en el orden de entrada."""
+    names = list(names)
+    results = [None] * len(names)
+    for i, _, data in iter_many_pokemon(names, max_workers):
+        results[i] = data
+    return results
+
 def compare_pokemon(pokemon1, pokemon2):
-    """ Compara el peso y la altura de dos Pokémon."""
-    data1 = get_pokemon_data(pokemon1)
-    data2 = get_pokemon_data(pokemon2)
+    """ Compara el peso y la altura de dos Pokémon. Devuelve False si falta alguno."""
+    data1, data2 = get_many_pokemon([pokemon1, pokemon2])
 
     if data1 and data2:
+        p1, p2 = Pokemon.from_api(data1), Pokemon.from_api(data2)
         print("\nComparación:")
-        print(f"{pokemon1.capitalize()} - Peso: {data1['weight']} hectogramos, Altura: {data1['height']} decímetros")
-        print(f"{pokemon2.capitalize()} - Peso: {data2['weight']} hectogramos, Altura: {data2['height']} decímetros")
+        print(f"{pokemon1.capitalize()} - Peso: {p1.weight} hectogramos, Altura: {p1.height} decímetros")
+        print(f"{pokemon2.capitalize()} - Peso: {p2.weight} hectogramos, Altura: {p2.height} decímetros")
 
-        heavier = pokemon1 if data['weight'] > data2['weight'] else pokemon2
-        taller = pokemon1 if data1['height'] > data2['height'] else pokemon2
+        heavier = pokemon1 if p1.weight > p2.weight else pokemon2
+        taller = pokemon1 if p1.height > p2.height else pokemon2
 
         print(f"Más pesado: {heavier.capitalize()}")
         print(f"Más alto: {taller.capitalize()}")
+        return True
+    print("No se pudieron obtener datos para uno o ambos Pokémon.")
+    return False
+
+def display_comparison(pokemon_data):
+    """Muestra el peso y la altura de varios Pokémon y cuál es el más pesado y el más alto."""
+    table = PokemonTable(pokemon_data)
+    print("\nComparación:")
+    for pokemon in table:
+        print(f"{pokemon.name.capitalize()} - Peso: {pokemon.weight} hectogramos, Altura: {pokemon.height} decímetros")
+    print(f"Más pesado: {table.heaviest().name.capitalize()}")
+    print(f"Más alto: {table.tallest().name.capitalize()}")
+
+def build_stat_matrix(names=None):
+    """Construye la matriz de estadísticas de los Pokémon indicados o de toda la instantánea."""
+    from ranking import StatMatrix  # NumPy solo se carga cuando hace falta
+
+    if not names:
+        if snapshot is None:
+            print("No hay instantánea local: indica nombres o ejecuta 'sync' primero.")
+            return None
+        return StatMatrix.from_snapshot(snapshot)
+    records = [data for data in get_many_pokemon(names) if data]
+    if not records:
+        print("No se pudieron obtener datos de ningún Pokémon.")
+        return None
+    return StatMatrix.from_records(records)
+
+def rank_pokemon(names=None, metrics=("total",), top=10, ascending=False, per_stat=0, diff=None):
+    """Clasifica varios Pokémon por una combinación de estadísticas y muestra el resultado."""
+    matrix = build_stat_matrix(names)
+    if matrix is None:
+        return False
+    try:
+        ranking = matrix.rank(metrics, ascending=ascending, top=top)
+        differences = matrix.pairwise_differences(diff) if diff else None
+    except ValueError as e:
+        print(e)
+        return False
+
+    percentiles = matrix.percentiles()
+    row = {name: i for i, name in enumerate(matrix.names)}
+    label = " + ".join(metrics)
+    print(f"\nClasificación por {label} ({len(matrix)} Pokémon):")
+    for position, (name, score) in enumerate(ranking, start=1):
+        pct = ", ".join(f"{m} p{percentiles[row[name], matrix.columns[m]]:.0f}" for m in metrics)
+        print(f"{position:>4}. {name.capitalize():<20} {score:>8.1f}  ({pct})")
+
+    if per_stat:
+        print(f"\nMejores {per_stat} por estadística:")
+        for metric, best in matrix.top_k(per_stat).items():
+            print(f"- {metric}: " + ", ".join(f"{n.capitalize()} ({v:g})" for n, v in best))
+
+    if diff:
+        shown = [name for name, _ in ranking]
+        idx = [row[name] for name in shown]
+        print(f"\nDiferencias de {diff} (fila - columna):")
+        print(" " * 14 + "".join(f"{n[:10]:>11}" for n in shown))
+        for i, name in zip(idx, shown):
+            print(f"{name[:12]:<14}" + "".join(f"{differences[i, j]:>11.1f}" for j in idx))
+    return True
+
+def load_type_chart():
+    """Devuelve la tabla de efectividades, descargándola de la API solo la primera vez."""
+    global type_chart
+    if type_chart is not None:
+        return type_chart
+    from matchup import TypeChart, TYPE_CHART_FILE
+
+    if os.path.exists(TYPE_CHART_FILE):
+        try:
+            type_chart = TypeChart.load(TYPE_CHART_FILE)
+            return type_chart
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error al leer la tabla de tipos, se volverá a descargar: {e}")
+
+    try:
+        type_chart = TypeChart.from_api(client.get_json)
+    except APIError as e:
+        print(f"Error al descargar la tabla de tipos: {e}")
+        return None
+    type_chart.save(TYPE_CHART_FILE)
+    return type_chart
+
+def pokemon_types(data):
+    """Devuelve la lista de nombres de tipo de un Pokémon."""
+    return [t['type']['name'] for t in data['types']]
+
+def format_multiplier(value):
+    """Formatea un multiplicador de daño (x4, x0.5, x0...)."""
+    return f"x{value:g}"
+
+def show_matchup(pokemon_name, roster=None, counters=5):
+    """Muestra debilidades, resistencias y mejores rivales de un Pokémon."""
+    chart = load_type_chart()
+    data = get_pokemon_data(pokemon_name)
+    if chart is None or data is None:
+        return False
+    types = pokemon_types(data)
+    print(f"\n{data['name'].capitalize()} ({', '.join(types)})")
+    weaknesses = chart.weaknesses(types)
+    resistances = chart.resistances(types)
+    print("Débil contra: " + (", ".join(f"{t} {format_multiplier(m)}" for t, m in weaknesses) or "nada"))
+    print("Resiste: " + (", ".join(f"{t} {format_multiplier(m)}" for t, m in resistances) or "nada"))
+
+    if counters:
+        if roster:
+            members = [d for d in get_many_pokemon(roster) if d]
+            names = [d['name'] for d in members]
+            roster_types = [pokemon_types(d) for d in members]
+        elif snapshot is not None:
+            names = snapshot.names
+            roster_types = [snapshot.types(i) for i in range(len(snapshot))]
+        else:
+            return True
+        known = [k for k, t in enumerate(roster_types) if all(x in chart.type_index for x in t)]
+        if not known:
+            return True
+        first, second, combos = chart.roster_combos([roster_types[k] for k in known])
+        scores = chart.counter_scores(types, first, second, combos)
+        print("Mejores rivales:")
+        for k in (-scores).argsort(kind="stable")[:counters]:
+            name = names[known[k]]
+            print(f"- {name.capitalize()} ({', '.join(roster_types[known[k]])}): {scores[k]:g}")
+    return True
+
+def show_team_coverage(team):
+    """Muestra la cobertura ofensiva y defensiva de un equipo."""
+    chart = load_type_chart()
+    members = [d for d in get_many_pokemon(team) if d]
+    if chart is None or not members:
+        return False
+    coverage = chart.coverage([pokemon_types(d) for d in members])
+    print(f"\nEquipo: {', '.join(d['name'].capitalize() for d in members)}")
+    super_effective = [t for t, m in coverage["offense"].items() if m > 1]
+    not_covered = [t for t, m in coverage["offense"].items() if m < 1]
+    print("Golpea súper eficaz a: " + (", ".join(super_effective) or "ningún tipo"))
+    print("No puede dañar bien a: " + (", ".join(not_covered) or "ningún tipo"))
+    print("Defensa (débiles / resisten):")
+    for t in chart.types:
+        weak, resist = coverage["weak"][t], coverage["resist"][t]
+        warning = "  <- punto débil" if weak > resist else ""
+        print(f"- {t:<9} {weak} / {resist}{warning}")
+    return True
+
+def fetch_resource(path):
+    """Devuelve el JSON de un recurso de la API pasando por el caché, o None si falla.
+
+    Como con los Pokémon, las peticiones simultáneas del mismo recurso se
+    agrupan en una sola descarga.
+    """
+    data = resource_cache.get(path)
+    if data is not None:
+        return data
+    try:
+        return inflight.do(path, download_resource, path)
+    except (APIError, ValueError) as e:
+        print(f"Error al obtener '{path}': {e}")
+        return None
+
+def download_resource(path):
+    """Descarga un recurso de la API y lo guarda en el caché."""
+    data = resource_cache.get(path, count=False)
+    if data is not None:
+        return data
+    data = client.get_json(path)
+    resource_cache.set(path, data)
+    return data
+
+def load_evolution_graph(file=EVOLUTION_FILE):
+    """Devuelve el grafo de evoluciones, cargándolo de disco la primera vez."""
+    global evolution_graph
+    if evolution_graph is None:
+        evolution_graph = EvolutionGraph()
+        if os.path.exists(file):
+            try:
+                evolution_graph = EvolutionGraph.load(file)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Error al leer el grafo de evoluciones: {e}")
+    return evolution_graph
+
+def fetch_chains(graph, chain_ids, max_workers=DEFAULT_CONCURRENCY):
+    """Descarga en paralelo las cadenas de evolución que falten y las añade al grafo."""
+    pending = sorted({str(cid) for cid in chain_ids if not graph.has_chain(cid)}, key=int)
+    paths = (f"evolution-chain/{cid}" for cid in pending)
+    for i, _, chain in iter_many_pokemon(paths, max_workers, fetch=fetch_resource):
+        if chain:
+            graph.add_chain(pending[i], chain)
+    if pending:
+        graph.save()
+    return len(pending)
+
+def ensure_evolutions(species_names, max_workers=DEFAULT_CONCURRENCY):
+    """Carga las cadenas de las especies indicadas, sin repetir las compartidas."""
+    graph = load_evolution_graph()
+    missing = [name.strip().lower() for name in species_names]
+    missing = [name for name in missing if name not in graph]
+    paths = (f"pokemon-species/{name}" for name in missing)
+    chain_ids = set()
+    for _, _, species in iter_many_pokemon(paths, max_workers, fetch=fetch_resource):
+        if species:
+            chain_ids.add(chain_id(species["evolution_chain"]["url"]))
+    fetch_chains(graph, chain_ids, max_workers)
+    return graph
+
+def sync_evolutions(max_workers=DEFAULT_CONCURRENCY):
+    """Descarga todas las cadenas de evolución que aún no estén en el grafo."""
+    graph = load_evolution_graph()
+    try:
+        listing = client.get_json("evolution-chain", params={"limit": 100000})
+    except APIError as e:
+        print(f"Error al obtener la lista de cadenas de evolución: {e}")
+        return False
+    fetched = fetch_chains(graph, (chain_id(c["url"]) for c in listing["results"]), max_workers)
+    print(f"{fetched} cadenas nuevas; {len(graph.roots)} cadenas en el grafo.")
+    return True
+
+def show_evolution_line(species_name, compare=False):
+    """Muestra la línea evolutiva de una especie y, si se pide, compara sus etapas."""
+    species_name = species_name.strip().lower()
+    graph = ensure_evolutions([species_name])
+    if species_name not in graph:
+        print("No se encontró la línea evolutiva de ese Pokémon.")
+        return False
+    stages = graph.stages(species_name)
+    print(f"\nLínea evolutiva de {species_name.capitalize()}:")
+    print(" -> ".join(" / ".join(s.capitalize() for s in stage) for stage in stages))
+    if compare:
+        pokemon_data = [data for data in get_many_pokemon(graph.line(species_name)) if data]
+        if pokemon_data:
+            display_comparison(pokemon_data)
+    return True
+
+def show_final_evolutions(pokemon_type=None):
+    """Muestra las evoluciones finales del grafo, opcionalmente de un tipo."""
+    graph = load_evolution_graph()
+    if not graph.roots:
+        print("El grafo de evoluciones está vacío; ejecuta 'evolution --sync' primero.")
+        return False
+    finals = sorted(graph.finals())
+    if pokemon_type:
+        finals = [data['name'] for data in get_many_pokemon(finals)
+                  if data and pokemon_type in pokemon_types(data)]
+    print(f"\nEvoluciones finales{' de tipo ' + pokemon_type if pokemon_type else ''} ({len(finals)}):")
+    for name in finals:
+        print(f"- {name.capitalize()}")
+    return True
+
+def sync_snapshot(file=SNAPSHOT_FILE, full=False, max_workers=DEFAULT_CONCURRENCY):
+    """Descarga la Pokédex completa a la instantánea local.
+
+    En una sincronización incremental solo se descargan los Pokémon que no
+    estaban en la instantánea previa (PokeAPI no indica qué datos han cambiado
+    y las URL de la lista son siempre las mismas); el resto se copia tal cual.
+    Con `full` se descargan todos de la API sin pasar por el caché, y el caché
+    se actualiza con lo descargado. Devuelve True si la instantánea quedó completa.
+    """
+    global name_index
+    try:
+        listing = fetch_pokemon_list()
+    except APIError as e:
+        print(f"Error al obtener la lista de Pokémon: {e}")
+        return False
+    name_index = NameIndex.from_listing(listing)
+    name_index.save()
+
+    previous = None if full else load_snapshot(file)
+    records = {}
+    pending = []
+    for name, url in listing.items():
+        if previous is not None and previous.sources.get(name) == url and name in previous:
+            records[name] = previous.get(name)
+        else:
+            pending.append(name)
+
+    if full:
+        print(f"Descargando de nuevo los {len(pending)} Pokémon...")
+    else:
+        print(f"Sincronizando {len(pending)} Pokémon nuevos "
+              f"({len(records)} copiados de la instantánea anterior)...")
+    refresh, cache.refresh = cache.refresh, cache.refresh or full
+    try:
+        for _, name, data in iter_many_pokemon(pending, max_workers, fetch=fetch_pokemon_data):
+            if data:
+                records[name] = data
+    finally:
+        cache.refresh = refresh
+
+    missing = [name for name in listing if name not in records]
+    ordered = [records[name] for name in listing if name in records]
+    sources = {name: listing[name] for name in listing if name in records}
+    close_snapshot()  # Suelta el mapeo anterior antes de reemplazar el archivo
+    write_snapshot(ordered, file, sources)
+    load_snapshot(file)
+    print(f"Instantánea guardada en '{file}' con {len(ordered)} Pokémon.")
+    if missing:
+        print(f"No se pudieron descargar {len(missing)} Pokémon; vuelve a ejecutar 'sync'.")
+    return not missing
+
+def iter_export_source(source, names=None, max_workers=DEFAULT_CONCURRENCY):
+    """Genera los registros a exportar desde la API, el caché, la instantánea o el historial."""
+    if source == "history":
+        yield from iter_history()
+    elif source == "cache":
+        seen = set()
+        for data in cache.iter_entries():
+            if "types" not in data:
+                continue  # Recurso guardado junto a los Pokémon por versiones anteriores
+            if data.get("name") not in seen:  # "25" y "pikachu" pueden ser la misma entrada
+                seen.add(data.get("name"))
+                yield data
+    elif source == "snapshot":
+        if snapshot is None:
+            raise ValueError("No hay instantánea local; ejecuta 'sync' primero.")
+        if names:
+            for name in names:
+                data = snapshot.get(name)
+                if data is not None:
+                    yield data
+        else:
+            yield from snapshot.records()
     else:
+        if not names:
+            names = fetch_pokemon_list()
+        for _, _, data in iter_many_pokemon(names, max_workers, fetch=fetch_pokemon_data):
+            if data:
+                yield data
+
+def read_names(source):
+    """Lee nombres de Pokémon de un archivo (o de stdin si es '-'), ignorando comentarios."""
+    f = sys.stdin if source == "-" else open(source, "r", encoding="utf-8")
+    try:
+        for line in f:
+            line = line.split("#", 1)[0]
+            for name in line.replace(",", " ").split():
+                yield name
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+def evolution_command(args):
+    """Consulta líneas evolutivas y evoluciones finales."""
+    if args.sync:
+        ok = sync_evolutions(args.concurrency)
+    elif args.finals:
+        ok = show_final_evolutions(args.type)
+    elif args.name:
+        ok = show_evolution_line(args.name, args.compare)
+    else:
+        print("Indica un Pokémon, --finals o --sync.")
+        ok = False
+    return 0 if ok else 1
+
+def print_json(obj):
+    """Escribe un objeto como una línea JSON en la salida de datos."""
+    json_output.write(json.dumps(obj, ensure_ascii=False) + "\n")
+    json_output.flush()
+
+def pokemon_summary(data):
+    """Resumen serializable de un Pokémon para la salida JSON."""
+    from export import normalize
+
+    summary = normalize(data)
+    del summary["searched_at"]
+    return summary
+
+def search_command(args):
+    """Busca uno o varios Pokémon, los muestra y los guarda en el historial."""
+    found = 0
+    for name in args.names:
+        data = get_pokemon_data(name)
+        if not data:
+            continue
+        found += 1
+        if json_output is not None:
+            print_json(pokemon_summary(data))
+        else:
+            display_pokemon_info(data)
+        if not args.no_save:
+            save_to_file(name, data)
+    return 0 if found == len(args.names) else 1
+
+def compare_command(args):
+    """Compara dos Pokémon por peso y altura."""
+    if json_output is None:
+        return 0 if compare_pokemon(args.pokemon1, args.pokemon2) else 1
+    data1, data2 = get_many_pokemon([args.pokemon1, args.pokemon2])
+    if not (data1 and data2):
         print("No se pudieron obtener datos para uno o ambos Pokémon.")
+        return 1
+    print_json({
+        "pokemon": [pokemon_summary(data1), pokemon_summary(data2)],
+        "heavier": data1["name"] if data1["weight"] > data2["weight"] else data2["name"],
+        "taller": data1["name"] if data1["height"] > data2["height"] else data2["name"],
+    })
+    return 0
 
-if __name__=="__main__":
+def fetch_command(args):
+    """Descarga por lotes los Pokémon indicados y muestra cada uno al llegar."""
+    try:
+        names = list(read_names(args.source))
+    except OSError as e:
+        print(f"Error al leer la lista de nombres: {e}")
+        return 1
+
+    found = 0
+    for _, name, data in iter_many_pokemon(names, args.concurrency):
+        if data:
+            found += 1
+            if json_output is not None:
+                print_json(pokemon_summary(data))
+            else:
+                display_pokemon_info(data)
+            if args.save:
+                save_to_file(name, data)
+    print(f"\n{found} de {len(names)} Pokémon obtenidos.")
+    return 0 if found == len(names) else 1
+
+def sync_command(args):
+    """Crea o actualiza la instantánea local de la Pokédex."""
+    ok = sync_snapshot(args.file, full=args.full, max_workers=args.concurrency)
+    if json_output is not None:
+        print_json({"ok": ok, "file": args.file, "count": len(snapshot) if snapshot else 0})
+    return 0 if ok else 1
+
+def history_command(args):
+    """Consulta el historial con filtros, paginación o estadísticas."""
+    filters = dict(name=args.name, pokemon_type=args.type, ability=args.ability,
+                   since=args.since, until=args.until)
+    if json_output is None:
+        if args.stats:
+            display_history_stats(args.file, args.top, **filters)
+        else:
+            load_from_json(args.file, args.limit, args.offset, **filters)
+        return 0
+
+    try:
+        records = filter_history(iter_history(args.file), **filters)
+        if args.stats:
+            print_json(aggregate_history(records, args.top))
+        else:
+            stop = None if args.limit is None else args.offset + args.limit
+            for record in islice(records, args.offset, stop):
+                print_json(record)
+    except FileNotFoundError:
+        print("No se encontró un historial. Busca un Pokémon primero.")
+        return 1
+    return 0
+
+def iso_date(value):
+    """Valida una fecha YYYY-MM-DD para los argumentos de la línea de comandos."""
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"fecha no válida (usa AAAA-MM-DD): {value}")
+
+def non_negative_int(value):
+    """Valida un entero mayor o igual que cero para los argumentos de la línea de comandos."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"número no válido: {value}")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"no puede ser negativo: {value}")
+    return number
+
+def rank_command(args):
+    """Clasifica Pokémon por estadísticas desde la línea de comandos."""
+    ok = rank_pokemon(args.names, args.by or ["total"], args.top, args.ascending,
+                      args.per_stat, args.diff)
+    return 0 if ok else 1
+
+def matchup_command(args):
+    """Analiza enfrentamientos de tipos desde la línea de comandos."""
+    if args.team:
+        ok = show_team_coverage(args.team)
+    elif args.name:
+        ok = show_matchup(args.name, args.roster, args.counters)
+    else:
+        print("Indica un Pokémon o un equipo con --team.")
+        ok = False
+    return 0 if ok else 1
+
+def export_command(args):
+    """Exporta Pokémon o el historial a CSV, JSON Lines o Parquet."""
+    from export import export_records, guess_format
+
+    fmt = args.format or guess_format(args.output) or "jsonl"
+    source = args.source or ("snapshot" if snapshot is not None else "api")
+    fields = args.fields.split(",") if args.fields else None
+    try:
+        records = iter_export_source(source, args.names, args.concurrency)
+        count = export_records(records, args.output, fmt, fields, args.flatten, args.chunk_size)
+    except (ValueError, RuntimeError, OSError, APIError) as e:
+        print(f"Error al exportar: {e}", file=sys.stderr)
+        return 1
+    if args.output != "-":
+        print(f"{count} registros exportados a '{args.output}'.")
+    return 0
+
+def serve_command(args):
+    """Sirve las consultas de la Pokédex como una API HTTP."""
+    from server import serve
+
+    serve(sys.modules[__name__], args.host, args.port, args.max_age, args.quiet)
+    return 0
+
+def interactive_menu():
+    """Ejecuta el menú interactivo de la Pokédex."""
     print("Bienvenido a la pokédex CLI!")
+    enable_name_completion()
     while True:
         print("\nOpciones:")
         print("1. Buscar un Pokémon")
@@ -105,14 +830,222 @@ if __name__=="__main__":
             pokemon2 = input("\nIngresa el nombre del segundo Pokémon: ").strip()
             compare_pokemon(pokemon1, pokemon2)
         elif option == "3":
-            load_from_json()
+            load_from_json(page_size=HISTORY_PAGE_SIZE)
         elif option == "4":
+            stats = cache.stats()
+            if stats["hits"] or stats["misses"]:
+                print(f"Caché: {stats['hits']} aciertos, {stats['misses']} fallos")
             print("¡Adiós!")
             break
         else:
             print("Opción no válida, intenta de nuevo.")
 
+# Subcomandos que no necesitan la instantánea ni el índice de nombres
+LOCAL_COMMANDS = ("history", "sync")
 
+COMMANDS = {
+    "search": search_command,
+    "compare": compare_command,
+    "fetch": fetch_command,
+    "batch": fetch_command,
+    "sync": sync_command,
+    "history": history_command,
+    "rank": rank_command,
+    "matchup": matchup_command,
+    "export": export_command,
+    "evolution": evolution_command,
+    "serve": serve_command,
+}
 
+def build_parser():
+    """Construye el analizador de argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Pokédex CLI")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="No usar el caché local de respuestas")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Ignorar el caché y volver a descargar los datos")
+    parser.add_argument("--no-snapshot", action="store_true",
+                        help="No responder desde la instantánea local")
+    parser.add_argument("--fsync", choices=FSYNC_POLICIES, default=DEFAULT_FSYNC,
+                        help="Cuándo forzar el volcado a disco del historial")
+    parser.add_argument("--base-url", default=client.base_url,
+                        help="URL base de la API (por defecto PokeAPI)")
+    parser.add_argument("--timeout", type=float, default=client.timeout[1],
+                        help="Tiempo máximo de espera por petición, en segundos")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES,
+                        help="Reintentos ante errores transitorios")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                        help="Máximo de peticiones por segundo (0 = sin límite)")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="Perfilar la ejecución con cProfile y guardar el resultado en FILE; "
+                             "muestra además el tiempo de cada tramo")
+    json_parent = argparse.ArgumentParser(add_help=False)
+    json_parent.add_argument("--json", action="store_true",
+                             help="Escribir el resultado como JSON (una línea por registro)")
+    subparsers = parser.add_subparsers(dest="command")
+    search_parser = subparsers.add_parser("search", parents=[json_parent],
+                                          help="Buscar uno o varios Pokémon")
+    search_parser.add_argument("names", nargs="+", help="Nombres o IDs de Pokémon")
+    search_parser.add_argument("--no-save", action="store_true",
+                               help="No guardar la búsqueda en el historial")
+    compare_parser = subparsers.add_parser("compare", parents=[json_parent],
+                                           help="Comparar dos Pokémon por peso y altura")
+    compare_parser.add_argument("pokemon1", help="Primer Pokémon")
+    compare_parser.add_argument("pokemon2", help="Segundo Pokémon")
+    fetch_parser = subparsers.add_parser("fetch", aliases=["batch"], parents=[json_parent],
+                                         help="Descargar muchos Pokémon en paralelo")
+    fetch_parser.add_argument("--from", dest="source", default="-",
+                              help="Archivo con un nombre por línea ('-' para stdin)")
+    fetch_parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                              help="Número máximo de descargas simultáneas")
+    fetch_parser.add_argument("--save", action="store_true",
+                              help="Guardar cada Pokémon obtenido en el historial")
+    sync_parser = subparsers.add_parser("sync", parents=[json_parent], help="Descargar la Pokédex completa para uso sin conexión")
+    sync_parser.add_argument("--file", default=SNAPSHOT_FILE,
+                             help="Archivo de la instantánea local")
+    sync_parser.add_argument("--full", action="store_true",
+                             help="Volver a descargar todos los Pokémon de la API (sin usar el caché); "
+                                  "sin esta opción solo se descargan los nuevos")
+    sync_parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                             help="Número máximo de descargas simultáneas")
+    history_parser = subparsers.add_parser("history", parents=[json_parent], help="Consultar el historial de búsquedas")
+    history_parser.add_argument("--file", default=HISTORY_FILE,
+                                help="Archivo del historial")
+    history_parser.add_argument("--limit", type=non_negative_int, help="Máximo de entradas a mostrar")
+    history_parser.add_argument("--offset", type=non_negative_int, default=0,
+                                help="Entradas a saltar antes de empezar")
+    history_parser.add_argument("--name", help="Filtrar por prefijo del nombre")
+    history_parser.add_argument("--type", help="Filtrar por tipo")
+    history_parser.add_argument("--ability", help="Filtrar por habilidad")
+    history_parser.add_argument("--since", type=iso_date, help="Desde la fecha AAAA-MM-DD")
+    history_parser.add_argument("--until", type=iso_date, help="Hasta la fecha AAAA-MM-DD")
+    history_parser.add_argument("--stats", action="store_true",
+                                help="Mostrar los más buscados y las búsquedas por tipo")
+    history_parser.add_argument("--top", type=non_negative_int, default=10,
+                                help="Cuántos Pokémon mostrar en --stats")
+    rank_parser = subparsers.add_parser("rank", help="Comparar y clasificar varios Pokémon por estadísticas")
+    rank_parser.add_argument("names", nargs="*",
+                             help="Pokémon a comparar (por defecto, toda la instantánea local)")
+    rank_parser.add_argument("--by", action="append",
+                             help="Estadística a sumar (repetible): hp, attack, defense, "
+                                  "special-attack, special-defense, speed, total, weight, height, bmi")
+    rank_parser.add_argument("--top", type=int, default=10, help="Cuántos Pokémon mostrar")
+    rank_parser.add_argument("--ascending", action="store_true",
+                             help="Ordenar de menor a mayor")
+    rank_parser.add_argument("--per-stat", type=int, default=0, metavar="K",
+                             help="Mostrar además los K mejores de cada estadística")
+    rank_parser.add_argument("--diff", metavar="STAT",
+                             help="Mostrar las diferencias por parejas en una estadística")
+    matchup_parser = subparsers.add_parser("matchup", help="Debilidades, rivales y cobertura de tipos")
+    matchup_parser.add_argument("name", nargs="?", help="Pokémon a analizar")
+    matchup_parser.add_argument("--roster", nargs="+",
+                                help="Pokémon entre los que buscar rivales (por defecto, la instantánea)")
+    matchup_parser.add_argument("--counters", type=int, default=5,
+                                help="Cuántos rivales mostrar (0 para ninguno)")
+    matchup_parser.add_argument("--team", nargs="+", help="Analizar la cobertura de un equipo")
+    export_parser = subparsers.add_parser("export", help="Exportar datos a CSV, JSON Lines o Parquet")
+    export_parser.add_argument("names", nargs="*",
+                               help="Pokémon a exportar (por defecto, todos los de la fuente)")
+    export_parser.add_argument("--source", choices=("api", "cache", "snapshot", "history"),
+                               help="De dónde leer (por defecto, la instantánea si existe o la API)")
+    export_parser.add_argument("--output", "-o", default="-",
+                               help="Archivo de salida ('-' para la salida estándar)")
+    export_parser.add_argument("--format", choices=("csv", "jsonl", "parquet"),
+                               help="Formato (por defecto, según la extensión del archivo)")
+    export_parser.add_argument("--fields", help="Campos a exportar, separados por comas")
+    export_parser.add_argument("--flatten", action="store_true",
+                               help="Aplanar tipos, habilidades y estadísticas en columnas")
+    export_parser.add_argument("--chunk-size", type=int, default=1000,
+                               help="Filas por bloque al escribir Parquet")
+    export_parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                               help="Descargas simultáneas con --source api")
+    evolution_parser = subparsers.add_parser("evolution", help="Líneas evolutivas")
+    evolution_parser.add_argument("name", nargs="?", help="Especie cuya línea mostrar")
+    evolution_parser.add_argument("--compare", action="store_true",
+                                  help="Comparar el peso y la altura de cada etapa")
+    evolution_parser.add_argument("--finals", action="store_true",
+                                  help="Listar las evoluciones finales")
+    evolution_parser.add_argument("--type", help="Con --finals, solo las de este tipo")
+    evolution_parser.add_argument("--sync", action="store_true",
+                                  help="Descargar todas las cadenas de evolución")
+    evolution_parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                                  help="Número máximo de descargas simultáneas")
+    serve_parser = subparsers.add_parser("serve", help="Servir las consultas como una API HTTP")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Dirección en la que escuchar")
+    serve_parser.add_argument("--port", type=int, default=8000, help="Puerto en el que escuchar")
+    serve_parser.add_argument("--max-age", type=int, default=24 * 60 * 60,
+                              help="Segundos que los clientes pueden reutilizar una respuesta")
+    serve_parser.add_argument("--quiet", action="store_true",
+                              help="No registrar cada petición")
+    return parser
 
-        
\ No newline at end of file
+def run_command(args):
+    """Ejecuta el subcomando elegido o, si no hay ninguno, el menú interactivo."""
+    if args.command is None:
+        interactive_menu()
+        return 0
+    return COMMANDS[args.command](args)
+
+def run_profiled(args):
+    """Ejecuta el comando bajo cProfile y muestra dónde se fue el tiempo.
+
+    El archivo generado es un volcado de `pstats`, que se puede abrir con
+    `python -m pstats`, snakeviz o convertir en un flamegraph con flameprof.
+    """
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(run_command, args)
+    finally:
+        profiler.dump_stats(args.profile)
+        print(f"\nPerfil guardado en '{args.profile}'.", file=sys.stderr)
+        print("Tramos (llamadas, total, media, máximo):", file=sys.stderr)
+        for name, s in registry.spans().items():
+            print(f"  {name:<18} {s['count']:>6} {s['total_ms']:>11.2f} ms {s['mean_ms']:>9.3f} ms"
+                  f" {s['max_ms']:>9.3f} ms", file=sys.stderr)
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(15)
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos. Devuelve el código de salida."""
+    global client, history_fsync, json_output
+    args = build_parser().parse_args(argv)
+    client = PokeAPIClient(base_url=args.base_url, timeout=(3.05, args.timeout),
+                           retries=args.retries, rate=args.rate)
+    for c in (cache, resource_cache):
+        c.enabled = not args.no_cache
+        c.refresh = args.refresh
+    history_fsync = args.fsync
+
+    # Con --json, stdout queda reservado a los datos y los mensajes van a stderr
+    if getattr(args, "json", False):
+        json_output = sys.stdout
+        context = redirect_stdout(sys.stderr)
+    else:
+        context = nullcontext()
+
+    with context:
+        if os.path.exists(LEGACY_HISTORY_FILE):
+            try:
+                migrated = migrate_json_history(LEGACY_HISTORY_FILE, HISTORY_FILE)
+                print(f"Historial migrado a '{HISTORY_FILE}' ({migrated} búsquedas).")
+            except (ValueError, OSError) as e:
+                # Un historial antiguo dañado no debe impedir usar la Pokédex: se aparta
+                print(f"Aviso: no se pudo migrar '{LEGACY_HISTORY_FILE}' ({e}).")
+                try:
+                    os.replace(LEGACY_HISTORY_FILE, f"{LEGACY_HISTORY_FILE}.corrupt")
+                    print(f"Se ha renombrado a '{LEGACY_HISTORY_FILE}.corrupt'.")
+                except OSError as e:
+                    print(f"No se pudo renombrar: {e}")
+
+        if args.command not in LOCAL_COMMANDS:
+            if not args.no_snapshot:
+                load_snapshot()
+            load_name_index()
+        if args.profile:
+            return run_profiled(args)
+        return run_command(args)
+
+if __name__=="__main__":
+    sys.exit(main())
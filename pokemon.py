@@ -0,0 +1,151 @@
+from array import array
+from sys import intern
+
+from snapshot import NONE, STATS
+
+
+class Pokemon:
+    """Datos de un Pokémon en un objeto compacto.
+
+    Guarda solo lo que usa la Pokédex. Usa `__slots__` en lugar de un
+    diccionario por instancia, tuplas en lugar de listas de diccionarios
+    anidados, y nombres de tipos y habilidades internados: todos los Pokémon
+    de tipo "fire" comparten la misma cadena. Las estadísticas base van en el
+    orden de `STATS` (vacías si no se conocen, como en el historial).
+    """
+
+    __slots__ = ("id", "name", "types", "abilities", "weight", "height", "stats")
+
+    def __init__(self, name, types=(), abilities=(), weight=0, height=0, id=0, stats=()):
+        self.id = id
+        self.name = intern(name)
+        self.types = tuple(intern(t) for t in types)
+        self.abilities = tuple(intern(a) for a in abilities)
+        self.weight = weight
+        self.height = height
+        self.stats = tuple(stats)
+
+    @classmethod
+    def from_api(cls, data):
+        """Crea el registro a partir de una respuesta de PokeAPI (o la devuelve si ya lo es)."""
+        if isinstance(data, cls):
+            return data
+        stats = {s["stat"]["name"]: s["base_stat"] for s in data.get("stats", ())}
+        return cls(
+            data["name"],
+            [t["type"]["name"] for t in sorted(data["types"], key=lambda t: t.get("slot", 0))],
+            [a["ability"]["name"] for a in data["abilities"]],
+            data["weight"],
+            data["height"],
+            data.get("id", 0),
+            [stats.get(stat, 0) for stat in STATS] if stats else (),
+        )
+
+    @classmethod
+    def from_history(cls, record):
+        """Crea el registro a partir de una línea del historial."""
+        return cls(record["name"], record.get("types", ()), record.get("abilities", ()),
+                   record.get("weight", 0), record.get("height", 0))
+
+    def to_history(self, searched_at):
+        """Línea del historial para esta búsqueda."""
+        return {
+            "name": self.name,
+            "types": list(self.types),
+            "abilities": list(self.abilities),
+            "weight": self.weight,
+            "height": self.height,
+            "searched_at": searched_at,
+        }
+
+    def stat(self, name):
+        """Estadística base por nombre (0 si no se conoce)."""
+        return self.stats[STATS.index(name)] if self.stats else 0
+
+    def __eq__(self, other):
+        if not isinstance(other, Pokemon):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __repr__(self):
+        return f"Pokemon({self.name!r}, types={self.types!r}, weight={self.weight}, height={self.height})"
+
+
+class PokemonTable:
+    """Colección de Pokémon guardada por columnas (struct of arrays).
+
+    En lugar de un objeto por Pokémon, cada campo es un arreglo contiguo
+    (`array`) y los tipos y habilidades son índices a una única tabla de
+    cadenas, como en la instantánea. Así 100 000 Pokémon ocupan unos pocos MB,
+    y `heaviest`/`tallest` recorren un solo arreglo de enteros.
+    """
+
+    def __init__(self, records=()):
+        self.strings = []
+        self._string_ids = {}
+        self.ids = array("i")
+        self.names = []
+        self.weights = array("i")
+        self.heights = array("i")
+        self.type1 = array("H")
+        self.type2 = array("H")
+        self.ability_offsets = array("I", [0])
+        self.ability_ids = array("H")
+        self.stats = {stat: array("H") for stat in STATS}
+        self.has_stats = array("b")
+        for record in records:
+            self.append(record)
+
+    @classmethod
+    def from_history(cls, records):
+        """Tabla con las búsquedas de un historial (ver `history.iter_history`)."""
+        return cls(Pokemon.from_history(record) for record in records)
+
+    def _intern(self, value):
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = self._string_ids[value] = len(self.strings)
+            self.strings.append(intern(value))
+        return string_id
+
+    def append(self, pokemon):
+        """Añade un Pokémon (un `Pokemon` o una respuesta de PokeAPI)."""
+        pokemon = Pokemon.from_api(pokemon)
+        types = [self._intern(t) for t in pokemon.types[:2]] + [NONE, NONE]
+        self.ids.append(pokemon.id)
+        self.names.append(pokemon.name)
+        self.weights.append(pokemon.weight)
+        self.heights.append(pokemon.height)
+        self.type1.append(types[0])
+        self.type2.append(types[1])
+        self.ability_ids.extend(self._intern(a) for a in pokemon.abilities)
+        self.ability_offsets.append(len(self.ability_ids))
+        self.has_stats.append(1 if pokemon.stats else 0)
+        for stat, value in zip(STATS, pokemon.stats or [0] * len(STATS)):
+            self.stats[stat].append(value)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, i):
+        """Reconstruye el Pokémon `i` como un `Pokemon`."""
+        if i < 0:
+            i += len(self)
+        types = [self.strings[t] for t in (self.type1[i], self.type2[i]) if t != NONE]
+        abilities = [self.strings[a] for a in
+                     self.ability_ids[self.ability_offsets[i]:self.ability_offsets[i + 1]]]
+        stats = [self.stats[stat][i] for stat in STATS] if self.has_stats[i] else ()
+        return Pokemon(self.names[i], types, abilities, self.weights[i], self.heights[i],
+                       self.ids[i], stats)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def heaviest(self):
+        """El Pokémon más pesado (el primero si hay empate)."""
+        return self[self.weights.index(max(self.weights))]
+
+    def tallest(self):
+        """El Pokémon más alto (el primero si hay empate)."""
+        return self[self.heights.index(max(self.heights))]
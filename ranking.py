@@ -0,0 +1,105 @@
+import numpy as np
+
+from snapshot import STATS
+
+# Columnas de la matriz: estadísticas base, su suma y medidas físicas
+METRICS = STATS + ("total", "weight", "height", "bmi")
+
+
+class StatMatrix:
+    """Matriz de estadísticas (una fila por Pokémon) para comparar y clasificar.
+
+    Todas las operaciones trabajan sobre la matriz completa con NumPy, así que
+    clasificar la Pokédex entera por cualquier combinación de estadísticas es
+    cuestión de milisegundos.
+    """
+
+    def __init__(self, names, values):
+        self.names = list(names)
+        self.values = np.asarray(values, dtype=np.float64).reshape(len(self.names), len(METRICS))
+        self.columns = {metric: i for i, metric in enumerate(METRICS)}
+
+    @classmethod
+    def from_records(cls, records):
+        """Construye la matriz a partir de respuestas de PokeAPI (o de la instantánea)."""
+        names = []
+        rows = []
+        for data in records:
+            stats = {s["stat"]["name"]: s["base_stat"] for s in data.get("stats", [])}
+            names.append(data["name"])
+            rows.append([stats.get(stat, 0) for stat in STATS] + [0, data["weight"], data["height"], 0])
+        values = np.array(rows, dtype=np.float64).reshape(len(names), len(METRICS))
+        return cls._with_derived(names, values)
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """Construye la matriz directamente desde las columnas de la instantánea."""
+        values = np.zeros((len(snapshot), len(METRICS)), dtype=np.float64)
+        for i, stat in enumerate(STATS):
+            values[:, i] = np.frombuffer(snapshot.column(f"stat_{stat}"), dtype=np.uint16)
+        values[:, METRICS.index("weight")] = np.frombuffer(snapshot.column("weight"), dtype=np.int32)
+        values[:, METRICS.index("height")] = np.frombuffer(snapshot.column("height"), dtype=np.int32)
+        return cls._with_derived(snapshot.names, values)
+
+    @classmethod
+    def _with_derived(cls, names, values):
+        """Rellena las columnas calculadas: total de estadísticas e IMC."""
+        values[:, METRICS.index("total")] = values[:, :len(STATS)].sum(axis=1)
+        kg = values[:, METRICS.index("weight")] / 10  # hectogramos -> kg
+        m = values[:, METRICS.index("height")] / 10   # decímetros -> m
+        values[:, METRICS.index("bmi")] = np.divide(kg, m * m, out=np.zeros_like(kg), where=m > 0)
+        return cls(names, values)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _index(self, metric):
+        """Devuelve la posición de una métrica en la matriz."""
+        if metric not in self.columns:
+            raise ValueError(f"Métrica desconocida: {metric}. Opciones: {', '.join(METRICS)}")
+        return self.columns[metric]
+
+    def column(self, metric):
+        """Devuelve la columna de una métrica."""
+        return self.values[:, self._index(metric)]
+
+    def score(self, metrics=("total",), weights=None):
+        """Puntuación de cada Pokémon como suma ponderada de varias métricas."""
+        idx = [self._index(m) for m in metrics]
+        weights = np.ones(len(idx)) if weights is None else np.asarray(weights, dtype=np.float64)
+        return self.values[:, idx] @ weights
+
+    def rank(self, metrics=("total",), weights=None, ascending=False, top=None):
+        """Devuelve [(nombre, puntuación)] ordenado por la combinación de métricas."""
+        scores = self.score(metrics, weights)
+        order = np.argsort(scores if ascending else -scores, kind="stable")
+        if top is not None:
+            order = order[:top]
+        return [(self.names[i], float(scores[i])) for i in order]
+
+    def percentiles(self):
+        """Percentil (0-100) de cada Pokémon en cada métrica; los empates comparten percentil."""
+        n = len(self.names)
+        if n < 2:
+            return np.full(self.values.shape, 100.0)
+        ordered = np.sort(self.values, axis=0)
+        result = np.empty_like(self.values)
+        for j in range(self.values.shape[1]):
+            below = np.searchsorted(ordered[:, j], self.values[:, j], side="left")
+            upto = np.searchsorted(ordered[:, j], self.values[:, j], side="right")
+            result[:, j] = (below + upto - 1) / 2
+        return result * (100.0 / (n - 1))
+
+    def top_k(self, k=5):
+        """Los `k` mejores Pokémon de cada métrica: {métrica: [(nombre, valor)]}."""
+        k = min(k, len(self.names))
+        best = np.argsort(-self.values, axis=0, kind="stable")[:k]
+        return {
+            metric: [(self.names[i], float(self.values[i, j])) for i in best[:, j]]
+            for metric, j in self.columns.items()
+        }
+
+    def pairwise_differences(self, metric="total"):
+        """Matriz N×N con la diferencia `fila - columna` en una métrica."""
+        column = self.column(metric)
+        return column[:, None] - column[None, :]
@@ -0,0 +1,406 @@
+import gzip
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import fastjson
+from metrics import registry
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional: sin él solo se comprime con gzip
+    brotli = None
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+DEFAULT_MAX_AGE = 24 * 60 * 60  # Los datos de PokeAPI casi no cambian
+DEFAULT_RESPONSE_ENTRIES = 4096
+MAX_BATCH_SIZE = 500
+MIN_COMPRESS_SIZE = 512  # Por debajo de esto comprimir no compensa
+JSON_TYPE = "application/json; charset=utf-8"
+METRICS_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def compress(body, encoding):
+    """Comprime el cuerpo de una respuesta con gzip o brotli."""
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=5)
+
+
+def choose_encoding(accept_encoding):
+    """Elige la mejor codificación que acepta el cliente ("br", "gzip" o None)."""
+    accepted = set()
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        accepted.add(name.strip().lower())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+class Response:
+    """Respuesta ya serializada (JSON, o texto si `obj` es una cadena), con su ETag
+    y sus versiones comprimidas."""
+
+    def __init__(self, obj, status=200, max_age=0, last_modified=None, content_type=JSON_TYPE):
+        self.status = status
+        self.content_type = content_type
+        if isinstance(obj, str):
+            self.body = obj.encode("utf-8")
+        else:
+            self.body = fastjson.dumps(obj)
+        self.etag = '"%s"' % hashlib.sha1(self.body).hexdigest()
+        self.last_modified = int(last_modified or time.time())
+        self.max_age = max_age
+        self.created = time.monotonic()
+        self._encoded = {}
+        self._lock = threading.Lock()
+
+    def encoded(self, encoding):
+        """Cuerpo en la codificación pedida; cada versión se comprime una sola vez."""
+        if encoding is None or len(self.body) < MIN_COMPRESS_SIZE:
+            return self.body, None
+        with self._lock:
+            if encoding not in self._encoded:
+                self._encoded[encoding] = compress(self.body, encoding)
+            return self._encoded[encoding], encoding
+
+    def not_modified(self, headers):
+        """Indica si la petición condicional del cliente sigue siendo válida."""
+        if_none_match = headers.get("If-None-Match")
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or self.etag in tags or f"W/{self.etag}" in tags
+        if_modified_since = headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                return parsedate_to_datetime(if_modified_since).timestamp() >= self.last_modified
+            except (TypeError, ValueError):
+                return False
+        return False
+
+
+class ResponseCache:
+    """LRU de respuestas ya serializadas y comprimidas, con caducidad."""
+
+    def __init__(self, max_entries=DEFAULT_RESPONSE_ENTRIES, ttl=DEFAULT_MAX_AGE):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Devuelve la respuesta guardada para `key` o None si no hay una vigente."""
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None and time.monotonic() - response.created < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return response
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+    def set(self, key, response):
+        """Guarda una respuesta, descartando las usadas hace más tiempo."""
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        """Aciertos, fallos y tamaño del caché de respuestas."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+class HTTPError(Exception):
+    """Error que se devuelve al cliente como JSON con su código HTTP."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class PokedexAPI:
+    """Endpoints de la API HTTP, apoyados en las funciones de la Pokédex.
+
+    `dex` es el módulo `pokedex` (o cualquier objeto con sus mismas funciones),
+    así que el servidor comparte con la CLI el caché, la instantánea y el cliente.
+    """
+
+    def __init__(self, dex, max_age=DEFAULT_MAX_AGE, max_entries=DEFAULT_RESPONSE_ENTRIES):
+        self.dex = dex
+        self.max_age = max_age
+        self.responses = ResponseCache(max_entries, ttl=max_age or DEFAULT_MAX_AGE)
+        self.routes = {
+            "pokemon": self.pokemon,
+            "search": self.search,
+            "compare": self.compare,
+            "matchup": self.matchup,
+            "batch": self.batch,
+            "history": self.history,
+            "metrics": self.metrics,
+        }
+        registry.gauge("pokedex_http_response_cache_hit_ratio", self.response_hit_ratio,
+                       "Proporción de respuestas servidas ya serializadas")
+
+    def handle(self, method, path, query, body=None):
+        """Resuelve una petición y devuelve un `Response`."""
+        parts = [unquote(p) for p in path.strip("/").split("/") if p]
+        if not parts or parts[0] not in self.routes:
+            raise HTTPError(404, "Ruta no encontrada.")
+        if method == "POST" and parts[0] != "batch":
+            raise HTTPError(405, "Método no permitido.")
+        return self.routes[parts[0]](parts[1:], query, body)
+
+    def cached(self, key, build):
+        """Devuelve la respuesta guardada para `key` o la construye y la guarda."""
+        response = self.responses.get(key)
+        if response is None:
+            response = build()
+            if response.status == 200:
+                self.responses.set(key, response)
+        return response
+
+    def response_hit_ratio(self):
+        stats = self.responses.stats()
+        total = stats["hits"] + stats["misses"]
+        return stats["hits"] / total if total else 0.0
+
+    def lookup(self, name):
+        """Datos resumidos de un Pokémon o HTTPError 404."""
+        data = self.dex.get_pokemon_data(name)
+        if data is None:
+            raise HTTPError(404, f"Pokémon no encontrado: {name}")
+        return data
+
+    def pokemon(self, args, query, body):
+        """GET /pokemon/{nombre}: datos de un Pokémon."""
+        if len(args) != 1:
+            raise HTTPError(404, "Ruta no encontrada.")
+        name = args[0].strip().lower()
+        return self.cached(("pokemon", name), lambda: Response(
+            self.dex.pokemon_summary(self.lookup(name)), max_age=self.max_age))
+
+    def search(self, args, query, body):
+        """GET /search?name=...: igual que /pokemon/{nombre}."""
+        name = param(query, "name")
+        if not name:
+            raise HTTPError(400, "Falta el parámetro 'name'.")
+        return self.pokemon([name], query, body)
+
+    def compare(self, args, query, body):
+        """GET /compare?a=...&b=...: compara dos Pokémon por peso y altura."""
+        a, b = param(query, "a"), param(query, "b")
+        if not (a and b):
+            raise HTTPError(400, "Faltan los parámetros 'a' y 'b'.")
+        a, b = a.strip().lower(), b.strip().lower()
+
+        def build():
+            data1, data2 = self.dex.get_many_pokemon([a, b])
+            if not (data1 and data2):
+                raise HTTPError(404, "No se pudieron obtener datos para uno o ambos Pokémon.")
+            return Response({
+                "pokemon": [self.dex.pokemon_summary(data1), self.dex.pokemon_summary(data2)],
+                "heavier": data1["name"] if data1["weight"] > data2["weight"] else data2["name"],
+                "taller": data1["name"] if data1["height"] > data2["height"] else data2["name"],
+            }, max_age=self.max_age)
+        return self.cached(("compare", a, b), build)
+
+    def matchup(self, args, query, body):
+        """GET /matchup/{nombre}: debilidades y resistencias de un Pokémon."""
+        if len(args) != 1:
+            raise HTTPError(404, "Ruta no encontrada.")
+        name = args[0].strip().lower()
+
+        def build():
+            chart = self.dex.load_type_chart()
+            if chart is None:
+                raise HTTPError(503, "La tabla de tipos no está disponible.")
+            data = self.lookup(name)
+            types = self.dex.pokemon_types(data)
+            return Response({
+                "name": data["name"],
+                "types": types,
+                "weaknesses": [[t, float(m)] for t, m in chart.weaknesses(types)],
+                "resistances": [[t, float(m)] for t, m in chart.resistances(types)],
+            }, max_age=self.max_age)
+        return self.cached(("matchup", name), build)
+
+    def batch(self, args, query, body):
+        """GET /batch?names=a,b,c o POST /batch {"names": [...]}: muchos Pokémon a la vez."""
+        if body is not None:
+            try:
+                names = fastjson.loads(body)["names"]
+            except (ValueError, KeyError, TypeError):
+                raise HTTPError(400, 'El cuerpo debe ser JSON: {"names": [...]}.')
+            if not isinstance(names, list) or not all(isinstance(n, str) for n in names):
+                raise HTTPError(400, "'names' debe ser una lista de nombres.")
+        else:
+            names = [n for value in query.get("names", ()) for n in value.split(",")]
+        names = [n.strip().lower() for n in names if n.strip()]
+        if not names:
+            raise HTTPError(400, "No se indicó ningún Pokémon.")
+        if len(names) > MAX_BATCH_SIZE:
+            raise HTTPError(400, f"Como mucho {MAX_BATCH_SIZE} Pokémon por petición.")
+
+        def build():
+            found, missing = [], []
+            for name, data in zip(names, self.dex.get_many_pokemon(names)):
+                if data:
+                    found.append(self.dex.pokemon_summary(data))
+                else:
+                    missing.append(name)
+            return Response({"pokemon": found, "missing": missing}, max_age=self.max_age)
+        return self.cached(("batch",) + tuple(names), build)
+
+    def history(self, args, query, body):
+        """GET /history: historial de búsquedas con filtros, paginación o `stats=1`."""
+        file = self.dex.HISTORY_FILE
+        try:
+            mtime = os.stat(file).st_mtime
+        except OSError:
+            raise HTTPError(404, "No hay historial de búsquedas.")
+        try:
+            limit = int(param(query, "limit", 100))
+            offset = int(param(query, "offset", 0))
+        except ValueError:
+            raise HTTPError(400, "'limit' y 'offset' deben ser números.")
+        if limit < 0 or offset < 0:
+            raise HTTPError(400, "'limit' y 'offset' no pueden ser negativos.")
+        filters = dict(name=param(query, "name"), pokemon_type=param(query, "type"),
+                       ability=param(query, "ability"), since=param(query, "since"),
+                       until=param(query, "until"))
+        stats = param(query, "stats") in ("1", "true")
+        key = ("history", mtime, limit, offset, stats) + tuple(sorted(
+            (k, v) for k, v in filters.items() if v))
+
+        def build():
+            from itertools import islice
+
+            records = self.dex.filter_history(self.dex.iter_history(file), **filters)
+            if stats:
+                obj = self.dex.aggregate_history(records, limit)
+            else:
+                obj = list(islice(records, offset, offset + limit))
+            # El historial cambia con cada búsqueda: el cliente siempre debe revalidar
+            return Response(obj, max_age=0, last_modified=mtime)
+        return self.cached(key, build)
+
+    def metrics(self, args, query, body):
+        """GET /metrics: métricas en el formato de texto de Prometheus."""
+        return Response(registry.render(), max_age=0, content_type=METRICS_TYPE)
+
+
+def param(query, name, default=None):
+    """Primer valor de un parámetro de la consulta."""
+    values = query.get(name)
+    return values[0] if values else default
+
+
+class PokedexHandler(BaseHTTPRequestHandler):
+    """Manejador HTTP/1.1 (con keep-alive) que delega en `PokedexAPI`."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "pokedex-cli"
+    disable_nagle_algorithm = True  # Sin esto, cabeceras y cuerpo esperan al ACK retardado
+    api = None
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_HEAD(self):
+        self.dispatch("HEAD")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.dispatch("POST", self.rfile.read(length))
+
+    def dispatch(self, method, body=None):
+        start = time.perf_counter()
+        url = urlsplit(self.path)
+        route = url.path.strip("/").split("/", 1)[0]
+        if route not in self.api.routes:
+            route = "other"
+        try:
+            response = self.api.handle("GET" if method == "HEAD" else method,
+                                       url.path, parse_qs(url.query), body)
+        except HTTPError as e:
+            response = Response({"error": str(e)}, status=e.status)
+        except Exception as e:
+            self.log_error("Error al atender %s: %r", self.path, e)
+            response = Response({"error": "Error interno del servidor."}, status=500)
+        self.send(response, method)
+        registry.observe("pokedex_http_request_seconds", time.perf_counter() - start, route=route)
+        registry.inc("pokedex_http_responses_total", route=route, status=response.status)
+
+    def send(self, response, method):
+        """Envía la respuesta, respondiendo 304 si el cliente ya la tiene."""
+        if response.status == 200 and response.not_modified(self.headers):
+            self.send_response(304)
+            self.send_cache_headers(response)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body, encoding = response.encoded(choose_encoding(self.headers.get("Accept-Encoding")))
+        self.send_response(response.status)
+        self.send_header("Content-Type", response.content_type)
+        if response.status == 200:
+            self.send_cache_headers(response)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if method != "HEAD":
+            self.wfile.write(body)
+
+    def send_cache_headers(self, response):
+        self.send_header("ETag", response.etag)
+        self.send_header("Last-Modified", formatdate(response.last_modified, usegmt=True))
+        if response.max_age:
+            self.send_header("Cache-Control", f"public, max-age={response.max_age}")
+        else:
+            self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            sys.stderr.write("%s - %s\n" % (self.address_string(), format % args))
+
+
+class PokedexServer(ThreadingHTTPServer):
+    """Servidor HTTP con un hilo por conexión."""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address, api, quiet=False):
+        handler = type("Handler", (PokedexHandler,), {"api": api})
+        self.quiet = quiet
+        super().__init__(address, handler)
+
+
+def serve(dex, host=DEFAULT_HOST, port=DEFAULT_PORT, max_age=DEFAULT_MAX_AGE, quiet=False):
+    """Arranca la API HTTP y atiende peticiones hasta que se interrumpe con Ctrl+C."""
+    api = PokedexAPI(dex, max_age=max_age)
+    with PokedexServer((host, port), api, quiet=quiet) as httpd:
+        print(f"Sirviendo la Pokédex en http://{host}:{httpd.server_address[1]}/ (Ctrl+C para salir)")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return api
@@ -0,0 +1,56 @@
+import threading
+
+
+class _Call:
+    """Una llamada en curso y su resultado compartido."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Agrupa llamadas simultáneas con la misma clave en una sola ejecución.
+
+    Si varios hilos piden a la vez la misma clave, solo el primero ejecuta la
+    función; el resto espera y recibe el mismo resultado (o la misma excepción).
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        """Ejecuta `fn(*args, **kwargs)` salvo que ya haya una llamada en curso para `key`."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        """Llamadas ejecutadas y llamadas que reutilizaron una en curso."""
+        return {"executed": self.executed, "shared": self.shared}
@@ -0,0 +1,218 @@
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+
+SNAPSHOT_FILE = "pokedex_snapshot.bin"
+MAGIC = b"PKDXSNP1"
+VERSION = 1
+NONE = 0xFFFF  # Índice de cadena "vacío" (p. ej. Pokémon de un solo tipo)
+STATS = ("hp", "attack", "defense", "special-attack", "special-defense", "speed")
+
+# Columnas fijas: nombre -> código de tipo de `array`
+COLUMNS = {
+    "id": "i",
+    "weight": "i",
+    "height": "i",
+    "type1": "H",
+    "type2": "H",
+    "ability_offsets": "I",
+    "ability_ids": "H",
+}
+COLUMNS.update({f"stat_{stat}": "H" for stat in STATS})
+
+
+def _extract(data):
+    """Extrae de una respuesta de PokeAPI los campos que guarda la instantánea."""
+    types = [t["type"]["name"] for t in sorted(data["types"], key=lambda t: t.get("slot", 0))]
+    stats = {s["stat"]["name"]: s["base_stat"] for s in data.get("stats", [])}
+    return {
+        "id": data.get("id", 0),
+        "name": data["name"],
+        "types": types,
+        "abilities": [a["ability"]["name"] for a in data["abilities"]],
+        "weight": data["weight"],
+        "height": data["height"],
+        "stats": stats,
+    }
+
+
+def write_snapshot(records, file=SNAPSHOT_FILE, sources=None):
+    """Escribe la instantánea columnar a partir de respuestas de PokeAPI.
+
+    Los nombres de tipos y habilidades se internan en una única tabla de
+    cadenas y cada columna se guarda como un arreglo binario contiguo.
+    `sources` asocia cada nombre con la URL de la que se obtuvo, para poder
+    detectar cambios en sincronizaciones incrementales.
+    """
+    strings = []
+    string_ids = {}
+
+    def intern(value):
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value)
+        return string_ids[value]
+
+    names = []
+    columns = {name: array(code) for name, code in COLUMNS.items()}
+    columns["ability_offsets"].append(0)
+    for data in records:
+        record = _extract(data)
+        names.append(record["name"])
+        columns["id"].append(record["id"])
+        columns["weight"].append(record["weight"])
+        columns["height"].append(record["height"])
+        types = record["types"] + [None, None]
+        columns["type1"].append(NONE if types[0] is None else intern(types[0]))
+        columns["type2"].append(NONE if types[1] is None else intern(types[1]))
+        for ability in record["abilities"]:
+            columns["ability_ids"].append(intern(ability))
+        columns["ability_offsets"].append(len(columns["ability_ids"]))
+        for stat in STATS:
+            columns[f"stat_{stat}"].append(record["stats"].get(stat, 0))
+
+    # Cada columna se alinea a 8 bytes para poder mapearla directamente
+    layout = {}
+    offset = 0
+    for name, column in columns.items():
+        offset = (offset + 7) & ~7
+        layout[name] = [offset, len(column)]
+        offset += len(column) * column.itemsize
+
+    header = json.dumps({
+        "version": VERSION,
+        "byteorder": sys.byteorder,
+        "created_at": time.time(),
+        "count": len(names),
+        "names": names,
+        "strings": strings,
+        "sources": sources or {},
+        "columns": layout,
+    }, separators=(",", ":")).encode("utf-8")
+    data_start = (len(MAGIC) + 4 + len(header) + 7) & ~7
+
+    tmp = f"{file}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        for name, column in columns.items():
+            f.write(b"\0" * (data_start + layout[name][0] - f.tell()))
+            column.tofile(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, file)  # Reemplazo atómico: nunca queda una instantánea a medias
+
+
+class Snapshot:
+    """Instantánea local de la Pokédex, mapeada en memoria y de solo lectura."""
+
+    def __init__(self, file=SNAPSHOT_FILE):
+        self.file = file
+        self._columns = {}
+        self._view = None
+        self._file = open(file, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Archivo vacío
+            self._file.close()
+            raise ValueError(f"La instantánea '{file}' está vacía.")
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"'{file}' no es una instantánea de la Pokédex.")
+
+        (header_len,) = struct.unpack_from("<I", self._mmap, len(MAGIC))
+        header_start = len(MAGIC) + 4
+        header = json.loads(self._mmap[header_start:header_start + header_len])
+        if header["version"] != VERSION:
+            self.close()
+            raise ValueError(f"Versión de instantánea no soportada: {header['version']}")
+
+        self.created_at = header["created_at"]
+        self.names = header["names"]
+        self.strings = [sys.intern(s) for s in header["strings"]]
+        self.sources = header["sources"]
+
+        data_start = (header_start + header_len + 7) & ~7
+        view = self._view = memoryview(self._mmap)
+        for name, (offset, length) in header["columns"].items():
+            code = COLUMNS[name]
+            size = array(code).itemsize
+            start = data_start + offset
+            column = view[start:start + length * size].cast(code)
+            if header["byteorder"] != sys.byteorder:
+                column = array(code, column)
+                column.byteswap()
+            self._columns[name] = column
+
+        self._index = {name: i for i, name in enumerate(self.names)}
+        self._index.update({str(pid): i for i, pid in enumerate(self._columns["id"])})
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return self.lookup(name) is not None
+
+    def lookup(self, name):
+        """Devuelve la fila de un Pokémon (por nombre o ID) o None si no está."""
+        return self._index.get(str(name).strip().lower())
+
+    def column(self, name):
+        """Devuelve una columna completa (sin copiarla) como `memoryview`."""
+        return self._columns[name]
+
+    def types(self, i):
+        """Devuelve los nombres de los tipos de la fila `i`."""
+        return [self.strings[t] for t in (self._columns["type1"][i], self._columns["type2"][i])
+                if t != NONE]
+
+    def abilities(self, i):
+        """Devuelve los nombres de las habilidades de la fila `i`."""
+        offsets = self._columns["ability_offsets"]
+        ids = self._columns["ability_ids"][offsets[i]:offsets[i + 1]]
+        return [self.strings[a] for a in ids]
+
+    def record(self, i):
+        """Reconstruye la fila `i` con la misma forma que una respuesta de PokeAPI."""
+        return {
+            "id": self._columns["id"][i],
+            "name": self.names[i],
+            "types": [{"slot": slot, "type": {"name": t}}
+                      for slot, t in enumerate(self.types(i), start=1)],
+            "abilities": [{"ability": {"name": a}} for a in self.abilities(i)],
+            "weight": self._columns["weight"][i],
+            "height": self._columns["height"][i],
+            "stats": [{"base_stat": self._columns[f"stat_{stat}"][i], "stat": {"name": stat}}
+                      for stat in STATS],
+        }
+
+    def get(self, name):
+        """Devuelve los datos de un Pokémon por nombre o ID, o None si no está."""
+        i = self.lookup(name)
+        return None if i is None else self.record(i)
+
+    def records(self):
+        """Recorre todas las filas de la instantánea."""
+        for i in range(len(self)):
+            yield self.record(i)
+
+    def close(self):
+        """Libera el mapeo de memoria y el archivo."""
+        for column in self._columns.values():
+            if isinstance(column, memoryview):
+                column.release()
+        self._columns = {}
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if not self._mmap.closed:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # Aún hay vistas en uso; se liberará al recolectarlas
+        self._file.close()
@@ -1,3 +1,5 @@
+import os
+
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
@@ -5,6 +7,8 @@ from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
 from flask_restx import Api
 
+from .database import DEFAULT_DATABASE_URL, init_database
+
 db = SQLAlchemy()
 migrate = Migrate()
 bcrypt = Bcrypt()
@@ -15,18 +19,27 @@ api = Api(
     description="API for managing users and roles"
 )
 
-def create_app():
+def create_app(test_config=None):
     app = Flask(__name__)
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///app.db'
+    # PostgreSQL en producción (DATABASE_URL=postgresql://...); SQLite por defecto
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', DEFAULT_DATABASE_URL)
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     app.config['SECRET_KEY'] = 'supersecretkey'
     app.config['JWT_SECRET_KEY'] = 'myjwtsecret'  # Asegúrate de que la clave JWT esté configurada
+    # Cualquier opción desde el entorno con el prefijo FLASK_ (p. ej. FLASK_DB_POOL_SIZE=20)
+    app.config.from_prefixed_env()
+    if test_config is not None:
+        # Configuración para pruebas y benchmarks (p. ej. otra base de datos)
+        app.config.update(test_config)
 
-    db.init_app(app)
+    init_database(app, db)
     migrate.init_app(app, db)
     bcrypt.init_app(app)
     jwt.init_app(app)
     api.init_app(app)
+    # Respuestas JSON con orjson si está instalado
+    from .serialization import output_json
+    api.representation('application/json')(output_json)
 
     # Registrar namespaces
     from .routes import user_ns, role_ns, auth_ns  # Asegúrate de importar auth_ns aquí
@@ -34,4 +47,19 @@ def create_app():
     api.add_namespace(role_ns, path='/roles')
     api.add_namespace(auth_ns, path='/auth')  # Registrar el namespace de autenticación
 
+    # Hashing de contraseñas en un pool de procesos acotado (503 si está saturado)
+    from .hashing import init_hashing
+    init_hashing(app)
+
+    # Latencia por recurso y por consulta SQL, exportada en /metrics
+    from .metrics import init_metrics
+    init_metrics(app, db)
+
+    # Con PROFILE_DIR se guarda un perfil de cProfile (.prof) por cada petición
+    profile_dir = app.config.get('PROFILE_DIR') or os.environ.get('PROFILE_DIR')
+    if profile_dir:
+        from werkzeug.middleware.profiler import ProfilerMiddleware
+        os.makedirs(profile_dir, exist_ok=True)
+        app.wsgi_app = ProfilerMiddleware(app.wsgi_app, profile_dir=profile_dir, stream=None)
+
     return app
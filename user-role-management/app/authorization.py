@@ -0,0 +1,180 @@
+import threading
+import time
+from functools import wraps
+
+from flask import abort, current_app
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event, or_
+
+from app import db
+from app.models import Permission, Role, User, role_permissions, user_roles
+
+# Segundos que se recuerda el rol de un usuario (AUTH_CACHE_TTL en la configuración).
+# Es lo que tarda como mucho un cambio de permisos en llegar a los demás procesos.
+DEFAULT_TTL = 5
+
+# Bit de cada permiso conocido; coincide con la columna permission.bit que crea la migración.
+# 'admin' implica todos los demás.
+PERMISSIONS = {
+    'admin': 0,
+    'manage_users': 1,
+    'manage_roles': 2,
+}
+ALL_PERMISSIONS = (1 << 63) - 1
+
+
+class RoleCache:
+    """Caché en memoria de usuario -> (rol, permisos) para autorizar sin consultar la base de datos.
+
+    Las entradas caducan a los pocos segundos y además se invalidan en cuanto se
+    confirma un cambio que las afecta (asignar un rol, modificar o borrar un
+    usuario, renombrar o borrar un rol). La invalidación solo llega al proceso
+    que hizo el cambio: con varios procesos (gunicorn), los demás siguen
+    usando los permisos anteriores hasta que caduca su entrada, como mucho
+    AUTH_CACHE_TTL segundos. Con AUTH_CACHE_TTL=0 no se guarda nada.
+    """
+
+    def __init__(self):
+        self._entries = {}  # user_id -> (expira_en, existe, nombre del rol, permisos)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id):
+        """Devuelve (existe, rol, permisos) o None si no hay una entrada vigente."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1:]
+            self.misses += 1
+            return None
+
+    def set(self, user_id, exists, role, permissions, ttl):
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + ttl, exists, role, permissions)
+
+    def invalidate(self, user_id):
+        """Olvida el rol y los permisos de un usuario."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        """Olvida todos los usuarios (p. ej. al renombrar un rol o cambiar sus permisos)."""
+        with self._lock:
+            self._entries.clear()
+
+
+role_cache = RoleCache()
+
+
+def user_identity(user_id):
+    """Devuelve (existe, rol principal, permisos) de un usuario, desde el caché o con una consulta.
+
+    Los permisos son un entero con un bit por permiso (ver `PERMISSIONS`),
+    reunidos de su rol principal y de sus roles adicionales. Así comprobar un
+    permiso es un AND de enteros, sin recorrer relaciones en cada petición.
+    Solo cuentan los permisos asignados en role_permissions, nunca el nombre
+    del rol: renombrar un rol a "admin" no concede nada.
+    """
+    cached = role_cache.get(user_id)
+    if cached is not None:
+        return cached
+    rows = db.session.query(User.role_id, Role.id, Role.name, Permission.bit) \
+        .outerjoin(user_roles, user_roles.c.user_id == User.id) \
+        .outerjoin(Role, or_(Role.id == User.role_id, Role.id == user_roles.c.role_id)) \
+        .outerjoin(role_permissions, role_permissions.c.role_id == Role.id) \
+        .outerjoin(Permission, Permission.id == role_permissions.c.permission_id) \
+        .filter(User.id == user_id).all()
+    exists, role, permissions = bool(rows), None, 0
+    for primary_id, role_id, role_name, bit in rows:
+        if role_id is not None and role_id == primary_id:
+            role = role_name
+        if bit is not None:
+            permissions |= 1 << bit
+    if permissions & (1 << PERMISSIONS['admin']):
+        permissions = ALL_PERMISSIONS
+    role_cache.set(user_id, exists, role, permissions,
+                   current_app.config.get('AUTH_CACHE_TTL', DEFAULT_TTL))
+    return exists, role, permissions
+
+
+def permission_mask(names):
+    """Conjunto de bits de los permisos indicados."""
+    mask = 0
+    for name in names:
+        mask |= 1 << PERMISSIONS[name]
+    return mask
+
+
+def has_permission(*names):
+    """Indica si el usuario del JWT actual tiene todos los permisos indicados."""
+    try:
+        _, _, permissions = user_identity(int(get_jwt_identity()))
+    except (TypeError, ValueError):
+        return False
+    required = permission_mask(names)
+    return permissions & required == required
+
+
+def permission_required(*names):
+    """Verifica que el usuario tenga todos los permisos indicados."""
+    required = permission_mask(names)
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            user_id = get_jwt_identity()  # Obtiene el ID del usuario desde el JWT
+
+            if not user_id:
+                abort(401, description="No se pudo obtener la identidad del usuario.")
+
+            try:
+                exists, _, permissions = user_identity(int(user_id))
+            except (TypeError, ValueError):
+                abort(401, description="No se pudo obtener la identidad del usuario.")
+
+            if not exists:
+                abort(404, description="Usuario no encontrado.")
+
+            if permissions & required != required:  # Un usuario sin rol no tiene permisos
+                abort(403, description="No tienes permiso para realizar esta acción.")
+
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Verifica que el usuario tenga el rol de administrador (o el permiso 'admin')
+admin_required = permission_required('admin')
+
+
+# Invalidación: se anotan los cambios al hacer flush y se aplican tras el commit,
+# para que ninguna petición vuelva a guardar en el caché datos sin confirmar.
+@event.listens_for(db.session, 'after_flush')
+def collect_changes(session, flush_context):
+    pending = session.info.setdefault('role_cache_invalidations', set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User):
+            pending.add(obj.id)
+        elif isinstance(obj, (Role, Permission)) and obj not in session.new:
+            pending.add(None)  # Afecta a todos los usuarios con ese rol o permiso
+
+
+@event.listens_for(db.session, 'after_commit')
+def apply_invalidations(session):
+    pending = session.info.pop('role_cache_invalidations', None)
+    if not pending:
+        return
+    if None in pending:
+        role_cache.clear()
+    else:
+        for user_id in pending:
+            role_cache.invalidate(user_id)
+
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_invalidations(session):
+    session.info.pop('role_cache_invalidations', None)
@@ -0,0 +1,161 @@
+from sqlalchemy import insert, or_, update
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.authorization import role_cache
+from app.hashing import hashing_service
+from app.models import Role, User
+
+DEFAULT_CHUNK_SIZE = 500  # Filas por transacción
+MAX_BULK_ITEMS = 5000
+
+
+def is_int(value):
+    """Entero de JSON (True y False no cuentan aunque sean `int` en Python)."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def bulk_create_users(items, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Crea muchos usuarios y devuelve el resultado de cada uno, en el orden recibido.
+
+    La unicidad de nombres y correos se comprueba con una sola consulta `IN`,
+    los hashes se calculan en paralelo en el pool de hashing y las filas se insertan por bloques, una
+    transacción por bloque. Si un bloque choca con otro alta simultánea, ese
+    bloque se reintenta fila a fila para saber qué usuarios fallaron.
+    """
+    results = [None] * len(items)
+    valid = []  # (posición, datos)
+    seen_usernames, seen_emails = set(), set()
+    for i, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[i] = {'index': i, 'status': 'error', 'error': 'Formato no válido'}
+            continue
+        username, email, password = item.get('username'), item.get('email'), item.get('password')
+        role_id = item.get('role_id')
+        if not (username and email and password):
+            error = 'Faltan username, email o password'
+        elif not all(isinstance(value, str) for value in (username, email, password)):
+            error = 'Formato no válido: username, email y password deben ser texto'
+            username = None  # No se devuelve un valor que no es texto
+        elif role_id is not None and not is_int(role_id):
+            error = 'Formato no válido: role_id debe ser un número entero'
+        elif username in seen_usernames:
+            error = 'Usuario repetido en la petición'
+        elif email in seen_emails:
+            error = 'Correo electrónico repetido en la petición'
+        else:
+            error = None
+            seen_usernames.add(username)
+            seen_emails.add(email)
+            valid.append((i, item))
+        if error:
+            results[i] = {'index': i, 'username': username, 'status': 'error', 'error': error}
+
+    if valid:
+        existing = db.session.query(User.username, User.email).filter(or_(
+            User.username.in_(seen_usernames), User.email.in_(seen_emails))).all()
+        taken_usernames = {row.username for row in existing}
+        taken_emails = {row.email for row in existing}
+        role_ids = {item['role_id'] for _, item in valid if item.get('role_id') is not None}
+        roles = {role_id for (role_id,) in db.session.query(Role.id).filter(Role.id.in_(role_ids))} \
+            if role_ids else set()
+        pending = []
+        for i, item in valid:
+            if item['username'] in taken_usernames:
+                error = 'El usuario ya existe'
+            elif item['email'] in taken_emails:
+                error = 'El correo electrónico ya está registrado'
+            elif item.get('role_id') is not None and item['role_id'] not in roles:
+                error = 'Rol no encontrado'
+            else:
+                pending.append((i, item))
+                continue
+            results[i] = {'index': i, 'username': item['username'], 'status': 'error', 'error': error}
+
+        hashes = hashing_service().hash_many([item['password'] for _, item in pending])
+        rows = [(i, {'username': item['username'], 'email': item['email'], 'password': hashed,
+                     'role_id': item.get('role_id')})
+                for (i, item), hashed in zip(pending, hashes)]
+        for chunk in chunks(rows, chunk_size):
+            insert_users(chunk, results)
+
+    return results
+
+
+def insert_users(chunk, results):
+    """Inserta un bloque de usuarios en una transacción y anota sus resultados."""
+    statement = insert(User).returning(User.id, sort_by_parameter_order=True)
+    try:
+        ids = db.session.scalars(statement, [row for _, row in chunk]).all()
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        if len(chunk) == 1:
+            i, row = chunk[0]
+            results[i] = {'index': i, 'username': row['username'], 'status': 'error',
+                          'error': 'El usuario, el correo o el rol no son válidos'}
+            return
+        for row in chunk:  # Fila a fila para saber cuál ha fallado
+            insert_users([row], results)
+        return
+    for (i, row), user_id in zip(chunk, ids):
+        role_cache.invalidate(user_id)
+        results[i] = {'index': i, 'id': user_id, 'username': row['username'], 'status': 'created'}
+
+
+def bulk_assign_roles(items, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Asigna roles a muchos usuarios y devuelve el resultado de cada asignación.
+
+    Usuarios y roles se validan con una consulta `IN` cada uno y las
+    asignaciones se aplican con un UPDATE por rol y bloque, una transacción por
+    bloque.
+    """
+    results = [None] * len(items)
+    valid = []
+    for i, item in enumerate(items):
+        user_id = item.get('user_id') if isinstance(item, dict) else None
+        role_id = item.get('role_id') if isinstance(item, dict) else None
+        if not is_int(user_id) or not is_int(role_id):
+            results[i] = {'index': i, 'status': 'error', 'error': 'Faltan user_id o role_id'}
+        else:
+            valid.append((i, user_id, role_id))
+
+    user_ids = {user_id for _, user_id, _ in valid}
+    role_ids = {role_id for _, _, role_id in valid}
+    current = dict(db.session.query(User.id, User.role_id).filter(User.id.in_(user_ids))) \
+        if user_ids else {}
+    roles = {role_id for (role_id,) in db.session.query(Role.id).filter(Role.id.in_(role_ids))} \
+        if role_ids else set()
+
+    changes = {}  # user_id -> (role_id, posición); si se repite, gana la última
+    for i, user_id, role_id in valid:
+        if user_id not in current:
+            results[i] = {'index': i, 'user_id': user_id, 'status': 'error',
+                          'error': 'Usuario no encontrado'}
+        elif role_id not in roles:
+            results[i] = {'index': i, 'user_id': user_id, 'status': 'error',
+                          'error': 'Rol no encontrado'}
+        elif current[user_id] == role_id and user_id not in changes:
+            results[i] = {'index': i, 'user_id': user_id, 'role_id': role_id, 'status': 'unchanged'}
+        else:
+            if user_id in changes:
+                previous = changes[user_id][1]
+                results[previous] = {'index': previous, 'user_id': user_id, 'status': 'superseded'}
+            changes[user_id] = (role_id, i)
+
+    for chunk in chunks(list(changes.items()), chunk_size):
+        by_role = {}
+        for user_id, (role_id, _) in chunk:
+            by_role.setdefault(role_id, []).append(user_id)
+        for role_id, ids in by_role.items():
+            db.session.execute(update(User).where(User.id.in_(ids)).values(role_id=role_id))
+        db.session.commit()
+        for user_id, (role_id, i) in chunk:
+            role_cache.invalidate(user_id)
+            results[i] = {'index': i, 'user_id': user_id, 'role_id': role_id, 'status': 'assigned'}
+    return results
@@ -0,0 +1,80 @@
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+DEFAULT_DATABASE_URL = 'sqlite:///app.db'
+
+# Pool de conexiones para PostgreSQL y otros servidores (FLASK_DB_POOL_SIZE, etc.)
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_OVERFLOW = 20
+DEFAULT_POOL_RECYCLE = 1800  # Segundos; por debajo del timeout de inactividad del servidor
+DEFAULT_POOL_TIMEOUT = 30
+# Milisegundos que SQLite espera a que se libere el bloqueo de escritura antes de fallar
+DEFAULT_SQLITE_BUSY_TIMEOUT = 5000
+
+
+def database_url(url):
+    """Normaliza la URL de la base de datos (acepta el esquema `postgres://` de Heroku y similares)."""
+    if url.startswith('postgres://'):
+        return 'postgresql://' + url[len('postgres://'):]
+    return url
+
+
+def engine_options(config):
+    """Opciones de `create_engine` según el tipo de base de datos y la configuración.
+
+    - SQLite: WAL para que las lecturas no esperen a las escrituras y
+      `busy_timeout` para que las escrituras concurrentes esperen su turno en
+      lugar de fallar con "database is locked" (ver `set_sqlite_pragmas`).
+    - PostgreSQL y demás: tamaño del pool, conexiones extra, reciclado y
+      comprobación de la conexión antes de usarla.
+    """
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    if url.get_backend_name() == 'sqlite':
+        # El timeout de sqlite3 (segundos) cubre también la apertura de la conexión
+        busy_timeout = config.get('SQLITE_BUSY_TIMEOUT', DEFAULT_SQLITE_BUSY_TIMEOUT)
+        return {'connect_args': {'timeout': busy_timeout / 1000}}
+    return {
+        'pool_size': config.get('DB_POOL_SIZE', DEFAULT_POOL_SIZE),
+        'max_overflow': config.get('DB_MAX_OVERFLOW', DEFAULT_MAX_OVERFLOW),
+        'pool_recycle': config.get('DB_POOL_RECYCLE', DEFAULT_POOL_RECYCLE),
+        'pool_timeout': config.get('DB_POOL_TIMEOUT', DEFAULT_POOL_TIMEOUT),
+        'pool_pre_ping': config.get('DB_POOL_PRE_PING', True),
+    }
+
+
+def init_database(app, db):
+    """Configura el motor de la aplicación y registra `db`.
+
+    La URL sale de DATABASE_URL (o de la configuración) y las opciones del
+    pool de FLASK_DB_POOL_SIZE, FLASK_DB_MAX_OVERFLOW, FLASK_DB_POOL_RECYCLE,
+    FLASK_DB_POOL_TIMEOUT y FLASK_DB_POOL_PRE_PING. SQLALCHEMY_ENGINE_OPTIONS,
+    si se indica, tiene prioridad.
+    """
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_url(app.config['SQLALCHEMY_DATABASE_URI'])
+    options = engine_options(app.config)
+    options.update(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+    db.init_app(app)
+
+    with app.app_context():
+        engine = db.engine
+    if engine.dialect.name == 'sqlite':
+        event.listen(engine, 'connect', sqlite_pragmas(app.config))
+
+
+def sqlite_pragmas(config):
+    """Devuelve el listener que prepara cada conexión nueva de SQLite."""
+    wal = config.get('SQLITE_WAL', True)
+    busy_timeout = int(config.get('SQLITE_BUSY_TIMEOUT', DEFAULT_SQLITE_BUSY_TIMEOUT))
+
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if wal:
+            # En una base de datos en memoria no tiene efecto (se queda en "memory")
+            cursor.execute('PRAGMA journal_mode=WAL')
+            # Con WAL, NORMAL sigue siendo seguro ante caídas de la aplicación y evita un fsync por commit
+            cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute(f'PRAGMA busy_timeout={busy_timeout}')
+        cursor.execute('PRAGMA foreign_keys=ON')  # Para los ON DELETE CASCADE de las tablas de relación
+        cursor.close()
+    return set_sqlite_pragmas
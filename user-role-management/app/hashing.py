@@ -0,0 +1,149 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import wraps
+
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+# Método y coste del KDF en el formato de werkzeug ("scrypt:N:r:p", "pbkdf2:sha256:iteraciones")
+DEFAULT_METHOD = 'scrypt:32768:8:1'
+# Cálculos de hash pendientes por proceso antes de rechazar peticiones con 503
+DEFAULT_PENDING_PER_WORKER = 4
+
+
+class HashingBusy(Exception):
+    """El servicio de hashing tiene demasiado trabajo pendiente."""
+
+
+class HashingService:
+    """Calcula y verifica hashes de contraseñas en un pool de procesos acotado.
+
+    Los KDF son lentos a propósito; ejecutarlos en procesos aparte evita que
+    una ráfaga de logins bloquee los hilos que atienden el resto de endpoints.
+    Si ya hay `max_pending` cálculos en curso o en cola, se lanza `HashingBusy`
+    al momento en lugar de hacer esperar al cliente. Con `workers=0` el hash se
+    calcula en el propio hilo (útil en pruebas).
+    """
+
+    def __init__(self, workers=None, max_pending=None, method=DEFAULT_METHOD):
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_pending = max_pending or max(1, self.workers) * DEFAULT_PENDING_PER_WORKER
+        self.method = method
+        # Prefijo que werkzeug escribe para este método, con los parámetros por
+        # defecto completados ("scrypt" -> "scrypt:32768:8:1")
+        self.prefix = generate_password_hash('', method).split('$', 1)[0]
+        self.rejected = 0
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        """Pool de procesos, creado la primera vez que se necesita."""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # "spawn" evita heredar con fork los hilos y conexiones del servidor
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+        return self._executor
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise HashingBusy('Demasiadas contraseñas pendientes de procesar')
+        try:
+            return self.executor.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        """Hash de una contraseña con el método y coste configurados."""
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, hashed, password):
+        """Comprueba una contraseña contra su hash."""
+        return self._run(check_password_hash, hashed, password)
+
+    def hash_many(self, passwords):
+        """Hashes de muchas contraseñas, en el orden recibido.
+
+        Ocupa un único hueco de la cola y nunca tiene más de `workers - 1`
+        cálculos enviados al pool a la vez. Como el pool atiende por orden de
+        llegada, un alta masiva no pone a los logins detrás de miles de
+        hashes: siempre queda un proceso libre para ellos. Con un solo proceso
+        los hashes del alta se calculan en el hilo de la petición (los KDF de
+        hashlib liberan el GIL), y el proceso queda para los logins.
+        """
+        passwords = list(passwords)
+        if not self.workers:
+            return [generate_password_hash(p, self.method) for p in passwords]
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise HashingBusy('Demasiadas contraseñas pendientes de procesar')
+        try:
+            window = self.workers - 1
+            if not window:
+                return [generate_password_hash(p, self.method) for p in passwords]
+            hashes = [None] * len(passwords)
+            in_flight = {}  # futuro -> posición
+            for i, password in enumerate(passwords):
+                if len(in_flight) >= window:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        hashes[in_flight.pop(future)] = future.result()
+                in_flight[self.executor.submit(generate_password_hash, password, self.method)] = i
+            for future, i in in_flight.items():
+                hashes[i] = future.result()
+            return hashes
+        finally:
+            self._slots.release()
+
+    def needs_rehash(self, hashed):
+        """Indica si un hash se calculó con un método o coste distinto del actual."""
+        return hashed.split('$', 1)[0] != self.prefix
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def init_hashing(app):
+    """Crea el servicio de hashing de la aplicación a partir de su configuración.
+
+    HASH_WORKERS: procesos del pool (por defecto, uno por núcleo; 0 = sin pool).
+    HASH_MAX_PENDING: cálculos en curso o en cola antes de responder 503.
+    PASSWORD_HASH_METHOD: método y coste del KDF, p. ej. "scrypt:32768:8:1".
+    """
+    service = HashingService(app.config.get('HASH_WORKERS'),
+                             app.config.get('HASH_MAX_PENDING'),
+                             app.config.get('PASSWORD_HASH_METHOD', DEFAULT_METHOD))
+    app.extensions['hashing'] = service
+    atexit.register(service.shutdown)
+    return service
+
+
+def hashing_service():
+    """Servicio de hashing de la aplicación actual."""
+    return current_app.extensions['hashing']
+
+
+def reject_when_busy(fn):
+    """Responde 503 al momento si el pool de hashing está saturado.
+
+    Se captura aquí en lugar de con un manejador de errores de la API para no
+    registrar una traza por cada petición rechazada durante un pico.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        except HashingBusy as error:
+            return {'error': str(error)}, 503, {'Retry-After': '1'}
+    return wrapper
@@ -0,0 +1,110 @@
+import threading
+import time
+from bisect import bisect_left
+
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+
+# Límites (en segundos) de los cubos de los histogramas de latencia
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# Cubos de los histogramas que no miden tiempo sino cantidades
+COUNT_BUCKETS = {'sqlalchemy_queries_per_request': (0, 1, 2, 3, 5, 10, 20, 50, 100)}
+
+HELP = {
+    'http_request_duration_seconds': 'Duración de cada petición por recurso, método y código',
+    'sqlalchemy_query_duration_seconds': 'Duración de las consultas SQL por tipo de sentencia',
+    'sqlalchemy_queries_per_request': 'Consultas SQL ejecutadas en cada petición',
+}
+
+
+class Metrics:
+    """Histogramas de latencia de los recursos de Flask-RESTX y de las consultas SQL.
+
+    Se exportan en `/metrics` con el formato de texto de Prometheus.
+    """
+
+    def __init__(self):
+        self._histograms = {}  # (nombre, etiquetas) -> [cubos..., +Inf, suma, cuenta]
+        self._lock = threading.Lock()
+
+    def observe(self, name, value, **labels):
+        """Añade una observación al histograma `name`."""
+        key = (name, tuple(sorted(labels.items())))
+        buckets = COUNT_BUCKETS.get(name, BUCKETS)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [0] * (len(buckets) + 1) + [0.0, 0]
+            histogram[bisect_left(buckets, value)] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    def render(self):
+        """Exporta los histogramas en el formato de texto de Prometheus."""
+        with self._lock:
+            histograms = sorted((key, list(h)) for key, h in self._histograms.items())
+        lines = []
+        seen = set()
+        for (name, labels), histogram in histograms:
+            if name not in seen:
+                seen.add(name)
+                lines.append(f'# HELP {name} {HELP.get(name, name)}')
+                lines.append(f'# TYPE {name} histogram')
+            cumulative = 0
+            bounds = [f'{b:g}' for b in COUNT_BUCKETS.get(name, BUCKETS)] + ['+Inf']
+            for bound, count in zip(bounds, histogram):
+                cumulative += count
+                lines.append(f'{name}_bucket{format_labels(labels + (("le", bound),))} {cumulative}')
+            lines.append(f'{name}_sum{format_labels(labels)} {histogram[-2]:.6f}')
+            lines.append(f'{name}_count{format_labels(labels)} {histogram[-1]}')
+        return '\n'.join(lines) + '\n'
+
+
+def format_labels(labels):
+    """Formatea las etiquetas como `{a="1",b="2"}`."""
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in labels) + '}'
+
+
+metrics = Metrics()
+
+
+def init_metrics(app, db):
+    """Mide cada petición y cada consulta SQL y registra el endpoint `/metrics`."""
+
+    @app.before_request
+    def start_timer():
+        g.request_started = time.perf_counter()
+        g.query_count = 0
+
+    @app.after_request
+    def record_request(response):
+        started = g.pop('request_started', None)
+        if started is not None and request.endpoint != 'metrics':
+            # request.endpoint es el recurso de Flask-RESTX (p. ej. "users_user_list")
+            metrics.observe('http_request_duration_seconds', time.perf_counter() - started,
+                            endpoint=request.endpoint or 'not_found', method=request.method,
+                            status=response.status_code)
+            metrics.observe('sqlalchemy_queries_per_request', g.pop('query_count', 0),
+                            endpoint=request.endpoint or 'not_found')
+        return response
+
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def start_query(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def record_query(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['query_started'].pop()
+        metrics.observe('sqlalchemy_query_duration_seconds', elapsed,
+                        statement=statement.lstrip().split(None, 1)[0].upper())
+        if has_request_context():
+            g.query_count = g.get('query_count', 0) + 1
+
+    @app.route('/metrics', endpoint='metrics')
+    def metrics_endpoint():
+        return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
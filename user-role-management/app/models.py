@@ -1,23 +1,50 @@
 from app import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.hashing import hashing_service
+
+# Roles adicionales de cada usuario (además del rol principal `role_id`)
+user_roles = db.Table(
+    'user_roles',
+    db.Column('user_id', db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('role_id', db.Integer, db.ForeignKey('role.id', ondelete='CASCADE'), primary_key=True,
+              index=True),
+)
+
+# Permisos que concede cada rol
+role_permissions = db.Table(
+    'role_permissions',
+    db.Column('role_id', db.Integer, db.ForeignKey('role.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('permission_id', db.Integer, db.ForeignKey('permission.id', ondelete='CASCADE'),
+              primary_key=True, index=True),
+)
+
+class Permission(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(80), nullable=False, unique=True)
+    bit = db.Column(db.Integer, nullable=False, unique=True)  # Posición en el conjunto de permisos
 
 class Role(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(80), nullable=False, unique=True)
+    permissions = db.relationship('Permission', secondary=role_permissions, backref='roles')
 
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), nullable=False, unique=True)
     email = db.Column(db.String(120), nullable=False, unique=True)
-    password = db.Column(db.String(128), nullable=False)
-    role_id = db.Column(db.Integer, db.ForeignKey('role.id'))
+    password = db.Column(db.String(255), nullable=False)
+    role_id = db.Column(db.Integer, db.ForeignKey('role.id'), index=True)
     role = db.relationship('Role', backref='users')
+    roles = db.relationship('Role', secondary=user_roles, backref='members')
 
     def verify_password(self, password):
         """Verificar si la contraseña proporcionada coincide con la almacenada"""
-        return check_password_hash(self.password, password)
+        return hashing_service().verify(self.password, password)
+
+    def needs_rehash(self):
+        """Indica si el hash almacenado usa un método o coste anterior al configurado"""
+        return hashing_service().needs_rehash(self.password)
 
     @classmethod
     def hash_password(cls, password):
         """Generar un hash de la contraseña para almacenamiento"""
-        return generate_password_hash(password)
+        return hashing_service().hash(password)
@@ -0,0 +1,55 @@
+from flask import abort
+from flask_restx import inputs, reqparse
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+
+def list_parser():
+    """Parámetros comunes de los listados paginados."""
+    parser = reqparse.RequestParser()
+    parser.add_argument('after_id', type=int, default=0, location='args',
+                        help='Devolver solo los registros con ID mayor que este (cursor)')
+    parser.add_argument('limit', type=inputs.int_range(1, MAX_LIMIT), default=DEFAULT_LIMIT,
+                        location='args', help=f'Registros por página (máximo {MAX_LIMIT})')
+    parser.add_argument('fields', location='args',
+                        help='Campos a devolver, separados por comas')
+    parser.add_argument('count', type=inputs.boolean, default=False, location='args',
+                        help='Incluir el total de registros en la cabecera X-Total-Count')
+    return parser
+
+
+def select_fields(requested, columns, default):
+    """Valida los campos pedidos (`?fields=a,b`) y devuelve sus nombres."""
+    if not requested:
+        return list(default)
+    names = [name.strip() for name in requested.split(',') if name.strip()]
+    unknown = [name for name in names if name not in columns]
+    if unknown or not names:
+        abort(400, description=f"Campos no válidos: {', '.join(unknown) or requested}. "
+                               f"Disponibles: {', '.join(columns)}")
+    return names
+
+
+def keyset_page(query, id_column, columns, names, after_id, limit, count=False):
+    """Devuelve una página de `query` ordenada por ID a partir de `after_id`.
+
+    En lugar de OFFSET se filtra por `id > after_id`, que usa la clave primaria:
+    cada página cuesta lo mismo sin importar cuántas filas haya antes. Solo se
+    leen las columnas pedidas, sin construir objetos del ORM. El total (una
+    consulta COUNT sobre todos los registros filtrados) solo se calcula si se pide.
+
+    Devuelve (filas como diccionarios, cabeceras de paginación).
+    """
+    headers = {}
+    if count:
+        headers['X-Total-Count'] = str(query.order_by(None).count())
+
+    selected = list(names) if 'id' in names else list(names) + ['id']
+    rows = query.with_entities(*(columns[name] for name in selected)) \
+        .filter(id_column > after_id).order_by(id_column).limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        headers['X-Next-After-Id'] = str(rows[-1][selected.index('id')])
+    items = [{name: row[i] for i, name in enumerate(selected) if name in names} for row in rows]
+    return items, headers
@@ -1,6 +1,8 @@
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import create_access_token
 from flask import request
+from app import db
+from app.hashing import HashingBusy, reject_when_busy
 from app.models import User  # Asegúrate de que el modelo User esté importado
 
 auth_ns = Namespace('auth', description='Autenticación')
@@ -15,6 +17,7 @@ from flask_jwt_extended import create_access_token
 @auth_ns.route('/login')
 class Login(Resource):
     @auth_ns.expect(login_model)
+    @reject_when_busy  # 503 si hay demasiadas contraseñas pendientes de verificar
     def post(self):
         """Autenticar usuario"""
         data = request.json
@@ -24,6 +27,15 @@ class Login(Resource):
         # Verificar si el usuario existe y si la contraseña es correcta
         user = User.query.filter_by(username=username).first()
         if user and user.verify_password(password):  # Asumiendo que tienes un método `verify_password`
+            # Si el hash se calculó con un coste anterior, se recalcula con el actual
+            # aprovechando que ahora tenemos la contraseña en claro. Es opcional:
+            # si el pool está saturado se deja para otro login en lugar de responder 503
+            if user.needs_rehash():
+                try:
+                    user.password = User.hash_password(password)
+                    db.session.commit()
+                except HashingBusy:
+                    pass
             # Crear el token, pasando el id del usuario como 'identity'
             token = create_access_token(identity=str(user.id))  # Convertimos user.id a string
             return {'access_token': token}, 200
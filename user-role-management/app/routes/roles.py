@@ -1,29 +1,13 @@
+from flask import abort
 from flask_restx import Namespace, Resource, fields
-from app.models import Role, User
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from app.models import Permission, Role, User
+from app.authorization import admin_required, permission_required, role_cache
+from app.pagination import keyset_page, list_parser, select_fields
+from app.bulk import MAX_BULK_ITEMS, bulk_assign_roles
 from app import db
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from flask import abort
-
-# Lógica de autorización para solo administradores
-def admin_required(fn):
-    """Verifica que el usuario tenga el rol de administrador."""
-    def wrapper(*args, **kwargs):
-        user_id = get_jwt_identity()  # Obtiene el ID del usuario desde el JWT
-        
-        if not user_id:
-            abort(401, description="No se pudo obtener la identidad del usuario.")
-        
-        user = User.query.get(user_id)  # Busca al usuario en la base de datos
-        
-        if not user:
-            abort(404, description="Usuario no encontrado.")
-        
-        if user.role and user.role.name != 'admin':  # Verifica si el usuario tiene rol 'admin'
-            abort(403, description="No tienes permiso para realizar esta acción.")
-        
-        return fn(*args, **kwargs)  # Ejecuta la función si el usuario es admin
-    return wrapper
-
+from flask_jwt_extended import jwt_required
 
 # Definir el namespace
 role_ns = Namespace('roles', description='Operaciones relacionadas con roles')
@@ -34,6 +18,13 @@ role_model = role_ns.model('Role', {
     'name': fields.String(required=True, description='Nombre del rol')
 })
 
+# Parámetros del listado: paginación por cursor y campos
+role_list_parser = list_parser()
+role_list_parser.add_argument('name', location='args', help='Filtrar por prefijo del nombre')
+
+# Columnas que se pueden pedir con ?fields=
+ROLE_COLUMNS = {'id': Role.id, 'name': Role.name}
+
 assign_role_model = role_ns.model('AssignRole', {
     'user_id': fields.Integer(required=True, description='ID del usuario'),
     'role_id': fields.Integer(required=True, description='ID del rol')
@@ -42,11 +33,18 @@ assign_role_model = role_ns.model('AssignRole', {
 @role_ns.route('/')
 class RoleList(Resource):
     @jwt_required()  # Solo usuarios autenticados pueden listar roles
-    @role_ns.marshal_list_with(role_model)
+    @role_ns.expect(role_list_parser)
+    @role_ns.response(200, 'Página de roles', [role_model])
     def get(self):
-        """Obtener todos los roles"""
-        roles = Role.query.all()
-        return roles
+        """Obtener los roles, por páginas (ver X-Next-After-Id)"""
+        args = role_list_parser.parse_args()
+        names = select_fields(args['fields'], ROLE_COLUMNS, ROLE_COLUMNS)
+        query = Role.query
+        if args['name']:
+            query = query.filter(Role.name.startswith(args['name'], autoescape=True))
+        roles, headers = keyset_page(query, Role.id, ROLE_COLUMNS, names,
+                                     args['after_id'], args['limit'], args['count'])
+        return roles, 200, headers
 
     @jwt_required()  # Solo usuarios autenticados pueden crear roles
     @role_ns.expect(role_model)
@@ -55,19 +53,21 @@ class RoleList(Resource):
         data = role_ns.payload
         name = data.get('name')
 
-        if Role.query.filter_by(name=name).first():
-            return {'error': 'El rol ya existe'}, 400
-
+        # La restricción UNIQUE del nombre evita duplicados sin consultar antes
         new_role = Role(name=name)
         db.session.add(new_role)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return {'error': 'El rol ya existe'}, 400
         return {'message': f'Rol {name} creado con éxito'}, 201
 
 @role_ns.route('/<int:role_id>')
 @role_ns.param('role_id', 'El ID del rol')
 class RoleDetail(Resource):
     @jwt_required()  # Solo usuarios autenticados pueden eliminar o actualizar
-    @admin_required  # Solo administradores pueden eliminar o actualizar roles
+    @permission_required('manage_roles')  # Administradores o usuarios con el permiso manage_roles
     def delete(self, role_id):
         """Eliminar un rol por ID"""
         role = Role.query.get_or_404(role_id)
@@ -76,42 +76,137 @@ class RoleDetail(Resource):
         return {'message': f'Rol {role.name} eliminado con éxito'}, 200
 
     @jwt_required()  # Solo usuarios autenticados pueden eliminar o actualizar
-    @admin_required  # Solo administradores pueden eliminar o actualizar roles
+    @permission_required('manage_roles')  # Administradores o usuarios con el permiso manage_roles
     @role_ns.expect(role_model)
     def put(self, role_id):
         """Actualizar un rol por ID"""
-        data = role_ns.payload
+        data = role_ns.payload or {}
+        if not data.get('name'):
+            role = Role.query.get_or_404(role_id)
+            return {'message': f'Rol {role.name} actualizado con éxito'}, 200
+
+        # Un solo UPDATE; si no afecta a ninguna fila el rol no existe
+        try:
+            name = db.session.execute(update(Role).where(Role.id == role_id)
+                                      .values(name=data['name']).returning(Role.name)).scalar()
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return {'error': 'El rol ya existe'}, 400
+        if name is None:
+            abort(404)
+        role_cache.clear()  # El UPDATE no pasa por la sesión: el nombre del rol está en el caché
+        return {'message': f'Rol {name} actualizado con éxito'}, 200
+
+permission_model = role_ns.model('Permission', {
+    'id': fields.Integer(readOnly=True, description='ID del permiso'),
+    'name': fields.String(required=True, description='Nombre del permiso'),
+    'bit': fields.Integer(readOnly=True, description='Bit del permiso en el conjunto de permisos')
+})
+
+role_permissions_model = role_ns.model('RolePermissions', {
+    'permissions': fields.List(fields.String, required=True,
+                               description='Nombres de los permisos que concede el rol')
+})
+
+@role_ns.route('/permissions')
+class PermissionList(Resource):
+    @jwt_required()  # Solo usuarios autenticados pueden listar permisos
+    @role_ns.marshal_list_with(permission_model)
+    def get(self):
+        """Obtener los permisos disponibles"""
+        return Permission.query.order_by(Permission.bit).all()
+
+@role_ns.route('/<int:role_id>/permissions')
+@role_ns.param('role_id', 'El ID del rol')
+class RolePermissions(Resource):
+    @jwt_required()  # Solo usuarios autenticados pueden ver los permisos de un rol
+    def get(self, role_id):
+        """Obtener los permisos de un rol"""
+        role = Role.query.get_or_404(role_id)
+        return {'permissions': sorted(p.name for p in role.permissions)}, 200
+
+    @jwt_required()  # Solo usuarios autenticados pueden cambiar permisos
+    @admin_required  # Solo administradores pueden cambiar los permisos de un rol
+    @role_ns.expect(role_permissions_model)
+    def put(self, role_id):
+        """Reemplazar los permisos de un rol"""
+        names = (role_ns.payload or {}).get('permissions')
+        if not isinstance(names, list):
+            return {'error': 'Se esperaba una lista de permisos en "permissions"'}, 400
         role = Role.query.get_or_404(role_id)
 
-        role.name = data.get('name', role.name)
+        permissions = Permission.query.filter(Permission.name.in_(names)).all() if names else []
+        unknown = set(names) - {p.name for p in permissions}
+        if unknown:
+            return {'error': f"Permisos no encontrados: {', '.join(sorted(unknown))}"}, 400
+
+        role.permissions = permissions
         db.session.commit()
-        return {'message': f'Rol {role.name} actualizado con éxito'}, 200
+        return {'message': f'Permisos del rol {role.name} actualizados con éxito',
+                'permissions': sorted(p.name for p in permissions)}, 200
 
 @role_ns.route('/assign-role')
 class AssignRole(Resource):
     @jwt_required()  # Solo usuarios autenticados pueden asignar roles
+    @admin_required  # Solo administradores pueden conceder roles
     @role_ns.expect(assign_role_model)  # Espera los parámetros user_id y role_id en el cuerpo de la solicitud
     def post(self):
-        """Asignar un rol a un usuario"""
+        """Asignar el rol principal de un usuario (solo administradores)"""
         data = role_ns.payload
         user_id = data.get('user_id')  # ID del usuario al que se asignará el rol
         role_id = data.get('role_id')  # ID del rol que se asignará
 
-        # Obtener el usuario y el rol de la base de datos
-        user = User.query.get(user_id)
-        role = Role.query.get(role_id)
-
-        if not user:
-            return {'error': 'Usuario no encontrado'}, 404
-        if not role:
+        # Un solo UPDATE que solo cambia la fila si el rol es distinto. La clave
+        # foránea rechaza un rol inexistente y RETURNING trae los nombres para el mensaje.
+        statement = update(User) \
+            .where(User.id == user_id, User.role_id.is_distinct_from(role_id)) \
+            .values(role_id=role_id) \
+            .returning(User.username, select(Role.name).where(Role.id == role_id).scalar_subquery())
+        try:
+            row = db.session.execute(statement).first()
+            if row is not None and row[1] is None:
+                # Sin claves foráneas activas (SQLite sin PRAGMA) el UPDATE no falla:
+                # el usuario existe pero el rol no, así que se deshace el cambio
+                db.session.rollback()
+                return {'error': 'Rol no encontrado'}, 404
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            if not db.session.query(User.id).filter_by(id=user_id).first():
+                return {'error': 'Usuario no encontrado'}, 404
             return {'error': 'Rol no encontrado'}, 404
 
-        # Verificar si el usuario ya tiene el rol asignado
-        if user.role and user.role.id == role.id:  # Se asegura de que user.role no sea None
+        if row is None:
+            # Ninguna fila cambiada: el usuario no existe o ya tenía el rol
+            current = db.session.query(User.role_id).filter_by(id=user_id).first()
+            if current is None:
+                return {'error': 'Usuario no encontrado'}, 404
             return {'message': 'El usuario ya tiene este rol asignado'}, 200
 
-        # Asignar el rol al usuario
-        user.role = role
-        db.session.commit()
+        role_cache.invalidate(user_id)  # El UPDATE no pasa por la sesión
+        username, role_name = row
+        return {'message': f'Rol {role_name} asignado al usuario {username} con éxito'}, 200
 
-        return {'message': f'Rol {role.name} asignado al usuario {user.username} con éxito'}, 200
+bulk_assign_model = role_ns.model('BulkAssignRoles', {
+    'assignments': fields.List(fields.Nested(assign_role_model), required=True,
+                               description=f'Asignaciones a aplicar (máximo {MAX_BULK_ITEMS})')
+})
+
+@role_ns.route('/assign-role/bulk')
+class BulkAssignRole(Resource):
+    @jwt_required()  # Solo usuarios autenticados pueden asignar roles
+    @admin_required  # Solo administradores pueden conceder roles
+    @role_ns.expect(bulk_assign_model)
+    def post(self):
+        """Asignar roles a muchos usuarios a la vez, con un resultado por asignación"""
+        assignments = (role_ns.payload or {}).get('assignments')
+        if not isinstance(assignments, list) or not assignments:
+            return {'error': 'Se esperaba una lista de asignaciones en "assignments"'}, 400
+        if len(assignments) > MAX_BULK_ITEMS:
+            return {'error': f'Como mucho {MAX_BULK_ITEMS} asignaciones por petición'}, 400
+
+        results = bulk_assign_roles(assignments)
+        assigned = sum(1 for r in results if r['status'] == 'assigned')
+        failed = sum(1 for r in results if r['status'] == 'error')
+        return {'assigned': assigned, 'failed': failed, 'results': results}, 200
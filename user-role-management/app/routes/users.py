@@ -1,30 +1,14 @@
+from flask import abort
 from flask_restx import Namespace, Resource, fields
-from werkzeug.security import generate_password_hash
-from app.models import User
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from app.models import Role, User
+from app.authorization import admin_required, has_permission, permission_required
+from app.pagination import keyset_page, list_parser, select_fields
+from app.bulk import MAX_BULK_ITEMS, bulk_create_users
+from app.hashing import reject_when_busy
 from app import db
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from flask import abort
-
-# Lógica de autorización para solo administradores
-def admin_required(fn):
-    """Verifica que el usuario tenga el rol de administrador."""
-    def wrapper(self, *args, **kwargs):  # Asegúrate de pasar "self" como primer argumento
-        user_id = get_jwt_identity()  # Obtiene el ID del usuario desde el JWT
-        
-        if not user_id:
-            abort(401, description="No se pudo obtener la identidad del usuario.")
-        
-        user = User.query.get(user_id)  # Busca al usuario en la base de datos
-        
-        if not user:
-            abort(404, description="Usuario no encontrado.")
-        
-        if user.role and user.role.name != 'admin':  # Verifica si el usuario tiene rol 'admin'
-            abort(403, description="No tienes permiso para realizar esta acción.")
-        
-        return fn(self, *args, **kwargs)  # Ejecuta la función si el usuario es admin
-    return wrapper
-
+from flask_jwt_extended import jwt_required
 
 # Definir el namespace
 user_ns = Namespace('users', description='Operaciones relacionadas con usuarios')
@@ -34,23 +18,63 @@ user_model = user_ns.model('User', {
     'id': fields.Integer(readOnly=True, description='ID del usuario'),
     'username': fields.String(required=True, description='Nombre del usuario'),
     'email': fields.String(required=True, description='Correo electrónico del usuario'),
-    'password': fields.String(required=True, description='Contraseña del usuario')
+    'password': fields.String(required=True, description='Contraseña del usuario'),
+    'role_id': fields.Integer(readOnly=True, description='ID del rol del usuario'),
+    'role': fields.String(readOnly=True, description='Nombre del rol del usuario')
 })
 
+# Respuesta del listado: los mismos campos salvo la contraseña
+user_summary_model = user_ns.model('UserSummary', {
+    name: field for name, field in user_model.items() if name != 'password'})
+
+# Parámetros del listado: paginación por cursor, campos y filtros
+user_list_parser = list_parser()
+user_list_parser.add_argument('role', location='args',
+                              help='Filtrar por rol (nombre o ID)')
+user_list_parser.add_argument('username', location='args',
+                              help='Filtrar por prefijo del nombre de usuario')
+
+# Columnas que se pueden pedir con ?fields= (nunca el hash de la contraseña)
+USER_COLUMNS = {
+    'id': User.id,
+    'username': User.username,
+    'email': User.email,
+    'role_id': User.role_id,
+    'role': Role.name,
+}
+DEFAULT_USER_FIELDS = ('id', 'username', 'email')
+
 @user_ns.route('/')
 class UserList(Resource):
     @jwt_required()  # Solo usuarios autenticados pueden listar usuarios
-    @user_ns.marshal_list_with(user_model)
+    @user_ns.expect(user_list_parser)
+    @user_ns.response(200, 'Página de usuarios', [user_summary_model])
     def get(self):
         """
-        Obtener todos los usuarios.
-        Este método devuelve una lista de todos los usuarios registrados en el sistema.
+        Obtener los usuarios, por páginas.
+        Devuelve hasta `limit` usuarios con ID mayor que `after_id`, ordenados por ID.
+        Si hay más, la cabecera X-Next-After-Id trae el `after_id` de la siguiente página.
         """
-        users = User.query.all()
-        return users
+        args = user_list_parser.parse_args()
+        names = select_fields(args['fields'], USER_COLUMNS, DEFAULT_USER_FIELDS)
+
+        query = User.query
+        role = args['role']
+        if 'role' in names or (role and not role.isdigit()):
+            # El rol se trae en la misma consulta, sin una consulta extra por usuario
+            query = query.outerjoin(Role, User.role_id == Role.id)
+        if role:
+            query = query.filter(User.role_id == int(role) if role.isdigit() else Role.name == role)
+        if args['username']:
+            query = query.filter(User.username.startswith(args['username'], autoescape=True))
+
+        users, headers = keyset_page(query, User.id, USER_COLUMNS, names,
+                                     args['after_id'], args['limit'], args['count'])
+        return users, 200, headers
 
     @jwt_required()  # Solo usuarios autenticados pueden crear usuarios
     @user_ns.expect(user_model)
+    @reject_when_busy  # 503 si hay demasiadas contraseñas pendientes de hashear
     def post(self):
         """
         Crear un nuevo usuario.
@@ -62,32 +86,78 @@ class UserList(Resource):
         email = data.get('email')
         password = data.get('password')
 
-        # Validar si el usuario o el email ya existen
-        if User.query.filter_by(username=username).first():
-            return {'error': 'El usuario ya existe'}, 400
-
-        if User.query.filter_by(email=email).first():
-            return {'error': 'El correo electrónico ya está registrado'}, 400
-
         # Hash de la contraseña
-        hashed_password = generate_password_hash(password)
+        hashed_password = User.hash_password(password)
 
-        # Crear nuevo usuario con los datos proporcionados
+        # Crear nuevo usuario con los datos proporcionados. La unicidad de
+        # nombre y correo la garantizan las restricciones UNIQUE: se inserta
+        # directamente y solo si falla se averigua qué dato estaba repetido.
         new_user = User(username=username, email=email, password=hashed_password)
         db.session.add(new_user)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return {'error': user_conflict(username, email)}, 400
 
         return {'message': f'Usuario {username} creado con éxito'}, 201
 
+bulk_user_model = user_ns.model('BulkUsers', {
+    'users': fields.List(fields.Nested(user_ns.model('NewUser', {
+        'username': fields.String(required=True, description='Nombre del usuario'),
+        'email': fields.String(required=True, description='Correo electrónico del usuario'),
+        'password': fields.String(required=True, description='Contraseña del usuario'),
+        'role_id': fields.Integer(description='ID del rol (opcional)')
+    })), required=True, description=f'Usuarios a crear (máximo {MAX_BULK_ITEMS})')
+})
+
+def user_conflict(username, email, exclude_id=None):
+    """Mensaje de error de un alta o cambio que ha chocado con un usuario existente."""
+    query = User.query.with_entities(User.username)
+    if exclude_id is not None:
+        query = query.filter(User.id != exclude_id)
+    if username and query.filter(User.username == username).first():
+        return 'El usuario ya existe'
+    if email and query.filter(User.email == email).first():
+        return 'El correo electrónico ya está registrado'
+    return 'El usuario no es válido'
+
+@user_ns.route('/bulk')
+class UserBulk(Resource):
+    @jwt_required()  # Solo usuarios autenticados pueden crear usuarios
+    @permission_required('manage_users')  # Administradores o usuarios con el permiso manage_users
+    @user_ns.expect(bulk_user_model)
+    @reject_when_busy  # 503 si hay demasiadas contraseñas pendientes de hashear
+    def post(self):
+        """
+        Crear muchos usuarios a la vez.
+        Devuelve el resultado de cada usuario en el mismo orden en que se enviaron:
+        los que fallan (repetidos, ya existentes...) no impiden crear el resto.
+        Requiere el permiso manage_users; indicar `role_id` solo lo pueden hacer los administradores.
+        """
+        users = (user_ns.payload or {}).get('users')
+        if not isinstance(users, list) or not users:
+            return {'error': 'Se esperaba una lista de usuarios en "users"'}, 400
+        if len(users) > MAX_BULK_ITEMS:
+            return {'error': f'Como mucho {MAX_BULK_ITEMS} usuarios por petición'}, 400
+        if any(isinstance(u, dict) and u.get('role_id') is not None for u in users) \
+                and not has_permission('admin'):
+            # Asignar un rol al crear equivale a concederlo: solo los administradores
+            return {'error': 'Solo los administradores pueden asignar roles (role_id)'}, 403
+
+        results = bulk_create_users(users)
+        created = sum(1 for r in results if r['status'] == 'created')
+        return {'created': created, 'failed': len(results) - created, 'results': results}, 200
+
 @user_ns.route('/<int:user_id>')
 @user_ns.param('user_id', 'El ID del usuario')
 class UserDetail(Resource):
     @jwt_required()  # Solo usuarios autenticados pueden eliminar o actualizar
-    @admin_required  # Solo administradores pueden eliminar o actualizar usuarios
+    @permission_required('manage_users')  # Administradores o usuarios con el permiso manage_users
     def delete(self, user_id):
         """
         Eliminar un usuario por ID.
-        Este método elimina un usuario del sistema dado su ID. Solo un administrador puede realizar esta acción.
+        Este método elimina un usuario del sistema dado su ID. Requiere el permiso manage_users (los administradores lo tienen).
         """
         user = User.query.get_or_404(user_id)
         db.session.delete(user)
@@ -95,24 +165,70 @@ class UserDetail(Resource):
         return {'message': f'Usuario {user.username} eliminado con éxito'}, 200
 
     @jwt_required()  # Solo usuarios autenticados pueden eliminar o actualizar
-    @admin_required  # Solo administradores pueden eliminar o actualizar usuarios
+    @permission_required('manage_users')  # Administradores o usuarios con el permiso manage_users
     @user_ns.expect(user_model)
+    @reject_when_busy  # 503 si hay demasiadas contraseñas pendientes de hashear
     def put(self, user_id):
         """
         Actualizar un usuario por ID.
-        Este método permite actualizar los datos de un usuario dado su ID. Solo un administrador puede realizar esta acción.
+        Este método permite actualizar los datos de un usuario dado su ID. Requiere el permiso manage_users (los administradores lo tienen).
         """
-        data = user_ns.payload
-        user = User.query.get_or_404(user_id)
-
-        user.username = data.get('username', user.username)
-        user.email = data.get('email', user.email)
+        data = user_ns.payload or {}
+        values = {key: data[key] for key in ('username', 'email') if data.get(key)}
 
         password = data.get('password')
         if password:
             # Si se proporciona una nueva contraseña, la actualizamos
-            hashed_password = generate_password_hash(password)
-            user.password = hashed_password
+            hashed_password = User.hash_password(password)
+            values['password'] = hashed_password
+
+        if not values:
+            user = User.query.get_or_404(user_id)
+            return {'message': f'Usuario {user.username} actualizado con éxito'}, 200
+
+        # Un solo UPDATE; si no afecta a ninguna fila el usuario no existe
+        try:
+            username = db.session.execute(update(User).where(User.id == user_id).values(**values)
+                                          .returning(User.username)).scalar()
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return {'error': user_conflict(values.get('username'), values.get('email'), user_id)}, 400
+        if username is None:
+            abort(404)
+        return {'message': f'Usuario {username} actualizado con éxito'}, 200
+
+user_roles_model = user_ns.model('UserRoles', {
+    'roles': fields.List(fields.Integer, required=True,
+                         description='IDs de los roles adicionales del usuario')
+})
+
+@user_ns.route('/<int:user_id>/roles')
+@user_ns.param('user_id', 'El ID del usuario')
+class UserRoles(Resource):
+    @jwt_required()  # Solo usuarios autenticados pueden ver los roles de un usuario
+    def get(self, user_id):
+        """Obtener el rol principal y los roles adicionales de un usuario"""
+        user = User.query.get_or_404(user_id)
+        return {'role': user.role.name if user.role else None,
+                'roles': [{'id': r.id, 'name': r.name} for r in sorted(user.roles, key=lambda r: r.id)]}, 200
+
+    @jwt_required()  # Solo usuarios autenticados pueden asignar roles
+    @admin_required  # Solo administradores pueden conceder roles adicionales
+    @user_ns.expect(user_roles_model)
+    def put(self, user_id):
+        """Reemplazar los roles adicionales de un usuario"""
+        role_ids = (user_ns.payload or {}).get('roles')
+        if not isinstance(role_ids, list) or not all(isinstance(i, int) for i in role_ids):
+            return {'error': 'Se esperaba una lista de IDs de rol en "roles"'}, 400
+        user = User.query.get_or_404(user_id)
+
+        roles = Role.query.filter(Role.id.in_(role_ids)).all() if role_ids else []
+        missing = set(role_ids) - {r.id for r in roles}
+        if missing:
+            return {'error': f"Roles no encontrados: {', '.join(map(str, sorted(missing)))}"}, 404
 
+        user.roles = roles
         db.session.commit()
-        return {'message': f'Usuario {user.username} actualizado con éxito'}, 200
+        return {'message': f'Roles del usuario {user.username} actualizados con éxito',
+                'roles': sorted(r.id for r in roles)}, 200
@@ -0,0 +1,26 @@
+from flask import current_app, make_response
+from flask_restx.representations import output_json as default_output_json
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: sin él se usa el codificador de Flask-RESTX
+    orjson = None
+
+
+def output_json(data, code, headers=None):
+    """Serializa las respuestas de la API con orjson.
+
+    Los listados paginados ya son listas de diccionarios con tipos básicos, así
+    que orjson los codifica de una vez, en C, varias veces más rápido que
+    `json.dumps`. En modo debug o con RESTX_JSON (p. ej. para indentar) se usa
+    el codificador de Flask-RESTX.
+    """
+    if orjson is None or current_app.debug or current_app.config.get('RESTX_JSON'):
+        return default_output_json(data, code, headers)
+    try:
+        body = orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    except TypeError:  # Un tipo que orjson no sabe serializar
+        return default_output_json(data, code, headers)
+    response = make_response(body, code)
+    response.headers.extend(headers or {})
+    return response
@@ -0,0 +1,37 @@
+"""Configuración de gunicorn para `wsgi:app`.
+
+Todas las opciones se pueden cambiar con variables de entorno:
+GUNICORN_BIND, WEB_CONCURRENCY (procesos), GUNICORN_THREADS (hilos por
+proceso), GUNICORN_TIMEOUT y GUNICORN_MAX_REQUESTS.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+# Varios procesos para repartir el trabajo de Python entre núcleos y unos pocos
+# hilos por proceso para solapar la espera de la base de datos. Cada proceso
+# tiene su propio pool de conexiones (FLASK_DB_POOL_SIZE), que debe cubrir sus
+# hilos, y su propio pool de hashing (FLASK_HASH_WORKERS).
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+
+# Sin esto cada proceso crearía un pool de hashing con un proceso por núcleo:
+# con 2n+1 procesos serían unos 2n² procesos de hashing. Se reparten los núcleos.
+os.environ.setdefault('FLASK_HASH_WORKERS', str(max(1, multiprocessing.cpu_count() // workers)))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = 5
+
+# Reinicia cada proceso tras N peticiones (con algo de azar) para acotar fugas de memoria
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 10000))
+max_requests_jitter = max_requests // 10
+
+# Cada proceso crea la aplicación (y su pool de conexiones) después del fork:
+# las conexiones abiertas no deben compartirse entre procesos.
+preload_app = False
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
@@ -0,0 +1,33 @@
+"""Ampliar la columna password
+
+Revision ID: 3f7d2c8e5a10
+Revises: 8c3e1f2a9b47
+Create Date: 2026-10-18 21:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f7d2c8e5a10'
+down_revision = '8c3e1f2a9b47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Los hashes scrypt:32768:8:1 ocupan 162 caracteres: no caben en 128 con PostgreSQL
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.alter_column('password',
+               existing_type=sa.String(length=128),
+               type_=sa.String(length=255),
+               existing_nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.alter_column('password',
+               existing_type=sa.String(length=255),
+               type_=sa.String(length=128),
+               existing_nullable=False)
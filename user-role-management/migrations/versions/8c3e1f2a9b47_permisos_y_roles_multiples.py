@@ -0,0 +1,69 @@
+"""Permisos y roles múltiples
+
+Revision ID: 8c3e1f2a9b47
+Revises: 2db7a6f29661
+Create Date: 2026-10-18 18:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c3e1f2a9b47'
+down_revision = '2db7a6f29661'
+branch_labels = None
+depends_on = None
+
+# Permisos iniciales; los bits coinciden con app.authorization.PERMISSIONS
+PERMISSIONS = [
+    {'id': 1, 'name': 'admin', 'bit': 0},
+    {'id': 2, 'name': 'manage_users', 'bit': 1},
+    {'id': 3, 'name': 'manage_roles', 'bit': 2},
+]
+
+
+def upgrade():
+    permission = op.create_table('permission',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=80), nullable=False),
+    sa.Column('bit', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('bit'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_table('user_roles',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('role_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['role_id'], ['role.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'role_id')
+    )
+    op.create_index(op.f('ix_user_roles_role_id'), 'user_roles', ['role_id'], unique=False)
+    op.create_table('role_permissions',
+    sa.Column('role_id', sa.Integer(), nullable=False),
+    sa.Column('permission_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['permission_id'], ['permission.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['role_id'], ['role.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('role_id', 'permission_id')
+    )
+    op.create_index(op.f('ix_role_permissions_permission_id'), 'role_permissions', ['permission_id'], unique=False)
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_user_role_id'), ['role_id'], unique=False)
+
+    # El rol "admin" existente recibe todos los permisos
+    op.bulk_insert(permission, PERMISSIONS)
+    op.execute(
+        "INSERT INTO role_permissions (role_id, permission_id) "
+        "SELECT role.id, permission.id FROM role, permission WHERE role.name = 'admin'"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_user_role_id'))
+    op.drop_index(op.f('ix_role_permissions_permission_id'), table_name='role_permissions')
+    op.drop_table('role_permissions')
+    op.drop_index(op.f('ix_user_roles_role_id'), table_name='user_roles')
+    op.drop_table('user_roles')
+    op.drop_table('permission')
@@ -0,0 +1,58 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db  # noqa: E402
+from app.authorization import PERMISSIONS, role_cache  # noqa: E402
+from app.models import Permission, Role, User  # noqa: E402
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Aplicación con una base de datos SQLite nueva y los roles admin (1) y user (2)."""
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}",
+        'HASH_WORKERS': 0,  # Hash en el propio hilo
+        'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',  # Rápido para las pruebas
+    })
+    with app.app_context():
+        db.create_all()
+        db.session.add_all(Permission(name=name, bit=bit) for name, bit in PERMISSIONS.items())
+        # Como en la migración, el rol admin tiene todos los permisos
+        db.session.add_all([Role(id=1, name='admin', permissions=Permission.query.all()),
+                            Role(id=2, name='user')])
+        db.session.commit()
+        role_cache.clear()
+        yield app
+        db.session.remove()
+    role_cache.clear()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user(app):
+    """Crea un usuario con la contraseña 'secret' y devuelve su ID."""
+    def make_user(username, role_id=None):
+        user = User(username=username, email=f'{username}@example.com',
+                    password=User.hash_password('secret'), role_id=role_id)
+        db.session.add(user)
+        db.session.commit()
+        return user.id
+    return make_user
+
+
+@pytest.fixture
+def login(client):
+    """Cabeceras con el token JWT de un usuario."""
+    def login(username):
+        response = client.post('/auth/login', json={'username': username, 'password': 'secret'})
+        return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+    return login
@@ -0,0 +1,151 @@
+from app import db
+from app.authorization import ALL_PERMISSIONS, PERMISSIONS, role_cache, user_identity
+from app.models import Permission, Role, User
+
+
+def bits(*names):
+    mask = 0
+    for name in names:
+        mask |= 1 << PERMISSIONS[name]
+    return mask
+
+
+def grant(role_id, *names):
+    role = db.session.get(Role, role_id)
+    role.permissions = Permission.query.filter(Permission.name.in_(names)).all()
+    db.session.commit()
+
+
+def test_identity_of_unknown_user(app):
+    assert user_identity(999) == (False, None, 0)
+
+
+def test_user_without_role_has_no_permissions(make_user):
+    user_id = make_user('ana')
+    assert user_identity(user_id) == (True, None, 0)
+
+
+def test_admin_role_has_all_permissions(make_user):
+    user_id = make_user('root', role_id=1)
+    assert user_identity(user_id) == (True, 'admin', ALL_PERMISSIONS)
+
+
+def test_permissions_combine_primary_and_additional_roles(make_user):
+    editor = Role(name='editor')
+    db.session.add(editor)
+    db.session.commit()
+    grant(2, 'manage_users')
+    grant(editor.id, 'manage_roles')
+    user_id = make_user('ana', role_id=2)
+    db.session.get(User, user_id).roles = [editor]
+    db.session.commit()
+
+    assert user_identity(user_id) == (True, 'user', bits('manage_users', 'manage_roles'))
+
+
+def test_additional_admin_role_grants_everything(make_user):
+    user_id = make_user('ana', role_id=2)
+    db.session.get(User, user_id).roles = [db.session.get(Role, 1)]
+    db.session.commit()
+
+    exists, role, permissions = user_identity(user_id)
+    assert (role, permissions) == ('user', ALL_PERMISSIONS)
+
+
+def test_identity_is_cached(make_user):
+    user_id = make_user('ana', role_id=2)
+    user_identity(user_id)
+    hits = role_cache.hits
+    user_identity(user_id)
+    assert role_cache.hits == hits + 1
+
+
+def test_commit_invalidates_changed_user(make_user):
+    user_id = make_user('ana', role_id=2)
+    assert user_identity(user_id)[1] == 'user'
+
+    db.session.get(User, user_id).role_id = 1
+    db.session.commit()
+
+    assert user_identity(user_id) == (True, 'admin', ALL_PERMISSIONS)
+
+
+def test_role_permission_change_clears_cache(make_user):
+    user_id = make_user('ana', role_id=2)
+    assert user_identity(user_id)[2] == 0
+
+    grant(2, 'manage_roles')
+
+    assert user_identity(user_id)[2] == bits('manage_roles')
+
+
+def test_rollback_keeps_cache(make_user):
+    user_id = make_user('ana', role_id=2)
+    user_identity(user_id)
+
+    db.session.get(User, user_id).role_id = 1
+    db.session.flush()
+    db.session.rollback()
+
+    assert role_cache.get(user_id) == (True, 'user', 0)
+
+
+def test_non_admin_cannot_assign_roles(client, make_user, login):
+    admin_id = make_user('root', role_id=1)
+    user_id = make_user('ana', role_id=2)
+    headers = login('ana')
+
+    response = client.post('/roles/assign-role', json={'user_id': user_id, 'role_id': 1},
+                           headers=headers)
+    assert response.status_code == 403
+    response = client.post('/roles/assign-role/bulk',
+                           json={'assignments': [{'user_id': admin_id, 'role_id': 2}]},
+                           headers=headers)
+    assert response.status_code == 403
+    assert user_identity(user_id)[1] == 'user'
+    assert user_identity(admin_id)[1] == 'admin'
+
+
+def test_admin_assigns_role_and_permissions_apply(client, make_user, login):
+    make_user('root', role_id=1)
+    user_id = make_user('ana', role_id=2)
+    headers = login('ana')
+    assert client.put('/roles/2', json={'name': 'member'}, headers=headers).status_code == 403
+
+    response = client.post('/roles/assign-role', json={'user_id': user_id, 'role_id': 1},
+                           headers=login('root'))
+    assert response.status_code == 200
+
+    assert client.put('/roles/2', json={'name': 'member'}, headers=headers).status_code == 200
+
+
+def test_renaming_a_role_to_admin_grants_nothing(client, make_user, login):
+    make_user('root', role_id=1)
+    grant(2, 'manage_roles')
+    user_id = make_user('ana', role_id=2)
+    headers = login('ana')
+
+    assert client.put('/roles/1', json={'name': 'old-admin'}, headers=headers).status_code == 200
+    assert client.put('/roles/2', json={'name': 'admin'}, headers=headers).status_code == 200
+
+    assert user_identity(user_id) == (True, 'admin', bits('manage_roles'))
+    response = client.post('/roles/assign-role', json={'user_id': user_id, 'role_id': 1},
+                           headers=headers)
+    assert response.status_code == 403
+
+
+def test_login_skips_rehash_when_hashing_is_busy(app, client, make_user, monkeypatch):
+    from app.hashing import HashingBusy, hashing_service
+
+    user_id = make_user('ana')
+    old_hash = db.session.get(User, user_id).password
+    service = hashing_service()
+    monkeypatch.setattr(service, 'needs_rehash', lambda hashed: True)
+
+    def busy(password):
+        raise HashingBusy('Demasiadas contraseñas pendientes de procesar')
+    monkeypatch.setattr(service, 'hash', busy)
+
+    response = client.post('/auth/login', json={'username': 'ana', 'password': 'secret'})
+    assert response.status_code == 200
+    assert db.session.get(User, user_id).password == old_hash
@@ -0,0 +1,95 @@
+from app import db
+from app.models import User
+
+
+def bulk_users(client, headers, users):
+    return client.post('/users/bulk', json={'users': users}, headers=headers)
+
+
+def new_user(name, **extra):
+    return dict(username=name, email=f'{name}@example.com', password='secret', **extra)
+
+
+def test_bulk_create_reports_each_item(client, make_user, login):
+    make_user('root', role_id=1)
+    make_user('taken')
+
+    response = bulk_users(client, login('root'), [
+        new_user('ana', role_id=2),
+        new_user('taken'),
+        new_user('ana'),
+        new_user('bea', role_id=99),
+        {'username': 'carla'},
+        'no es un objeto',
+    ])
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert (body['created'], body['failed']) == (1, 5)
+    assert [r['status'] for r in body['results']] == ['created'] + ['error'] * 5
+    assert [r.get('error') for r in body['results'][1:4]] == [
+        'El usuario ya existe', 'Usuario repetido en la petición', 'Rol no encontrado']
+    assert db.session.query(User.role_id).filter_by(username='ana').scalar() == 2
+
+
+def test_bulk_create_rejects_wrong_types_per_item(client, make_user, login):
+    make_user('root', role_id=1)
+
+    response = bulk_users(client, login('root'), [
+        {'username': ['ana'], 'email': 'ana@example.com', 'password': 'secret'},
+        {'username': 'bea', 'email': {'a': 1}, 'password': 'secret'},
+        {'username': 'carla', 'email': 'carla@example.com', 'password': 12345},
+        new_user('dani', role_id='1'),
+        new_user('eva', role_id=True),
+        new_user('fede'),
+    ])
+
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    assert [r['status'] for r in results] == ['error'] * 5 + ['created']
+    assert all(r['error'].startswith('Formato no válido') for r in results[:5])
+
+
+def test_bulk_create_requires_permissions(client, make_user, login):
+    make_user('ana', role_id=2)
+    assert bulk_users(client, login('ana'), [new_user('bea')]).status_code == 403
+
+
+def test_bulk_create_role_id_requires_admin(client, make_user, login):
+    make_user('root', role_id=1)
+    make_user('ana', role_id=2)
+    client.put('/roles/2/permissions', json={'permissions': ['manage_users']},
+               headers=login('root'))
+    headers = login('ana')
+
+    assert bulk_users(client, headers, [new_user('bea', role_id=1)]).status_code == 403
+    assert bulk_users(client, headers, [new_user('bea')]).get_json()['created'] == 1
+
+
+def test_bulk_assign_roles(client, make_user, login):
+    make_user('root', role_id=1)
+    ana = make_user('ana', role_id=2)
+    bea = make_user('bea')
+
+    response = client.post('/roles/assign-role/bulk', json={'assignments': [
+        {'user_id': ana, 'role_id': 2},
+        {'user_id': bea, 'role_id': 2},
+        {'user_id': 999, 'role_id': 2},
+        {'user_id': ana, 'role_id': 99},
+        {'user_id': True, 'role_id': 2},
+        {'user_id': bea, 'role_id': '2'},
+    ]}, headers=login('root'))
+
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    assert [r['status'] for r in results] == ['unchanged', 'assigned'] + ['error'] * 4
+    assert db.session.get(User, bea).role_id == 2
+
+
+def test_bulk_assign_requires_admin(client, make_user, login):
+    root = make_user('root', role_id=1)
+    make_user('ana', role_id=2)
+    response = client.post('/roles/assign-role/bulk',
+                           json={'assignments': [{'user_id': root, 'role_id': 2}]},
+                           headers=login('ana'))
+    assert response.status_code == 403
@@ -0,0 +1,9 @@
+"""Punto de entrada WSGI para producción.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+`app.py` sigue siendo el servidor de desarrollo (`app.run(debug=True)`).
+"""
+from app import create_app
+
+app = create_app()